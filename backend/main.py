@@ -16,14 +16,17 @@ app.add_middleware(
 
 # Ensure storage dirs
 Path("backend/storage/uploads").mkdir(parents=True, exist_ok=True)
+Path("backend/storage/datasets").mkdir(parents=True, exist_ok=True)
 Path("backend/storage/runs").mkdir(parents=True, exist_ok=True)
 Path("backend/storage/demo").mkdir(parents=True, exist_ok=True)
 
 # Routers
-from backend.routers import parse, recommend, run, chat  # noqa
+from backend.routers import parse, recommend, run, chat, datasets, figures  # noqa
 app.include_router(parse.router, prefix="/api")
+app.include_router(datasets.router, prefix="/api")
 app.include_router(recommend.router, prefix="/api")
 app.include_router(run.router, prefix="/api")
+app.include_router(figures.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
 
 @app.get("/api/health")
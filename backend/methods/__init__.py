@@ -9,9 +9,17 @@ Each method is organized as a self-contained module with:
 """
 
 # Import all method modules to trigger @register decorator
+from backend.methods import bayesian_linreg
 from backend.methods import dr_ate_cbps
+from backend.methods import lasso_enet
 from backend.methods import logistic_regression
+from backend.methods import nn_matching
 from backend.methods import oga_hdic
+from backend.methods import pca
+from backend.methods import spatial
+from backend.methods import survival
+from backend.methods import time_series
+from backend.methods import twfe_did
 
 # Export base module contents for external use
 from backend.methods.base import BaseMethod, METHODS_REGISTRY, register
@@ -20,7 +28,15 @@ __all__ = [
     'BaseMethod',
     'METHODS_REGISTRY',
     'register',
+    'bayesian_linreg',
     'dr_ate_cbps',
+    'lasso_enet',
     'logistic_regression',
+    'nn_matching',
     'oga_hdic',
+    'pca',
+    'spatial',
+    'survival',
+    'time_series',
+    'twfe_did',
 ]
@@ -1,4 +1,10 @@
-from typing import Dict, Any, List, Type
+import os
+import tempfile
+import threading
+import uuid
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Type
 
 class BaseMethod:
     id: str = "base"
@@ -8,9 +14,121 @@ class BaseMethod:
     def run(self, df, roles: dict, params: dict, out_dir: str) -> Dict[str, Any]:
         raise NotImplementedError
 
+    def required_columns(self, available: List[str], roles: dict, params: dict) -> Optional[List[str]]:
+        """
+        Columns run() will read, given the dataset's column names, so the
+        runner can load only those; None (the default) loads every column.
+        """
+        return None
+
 # Registry
 METHODS_REGISTRY: Dict[str, Type[BaseMethod]] = {}
 
 def register(cls: Type[BaseMethod]):
     METHODS_REGISTRY[cls.id] = cls
     return cls
+
+# Per-key locking
+class KeyedLocks:
+    """
+    One lock per key, created on first use and dropped once no thread holds
+    or waits for it, so the registry stays as small as the set of keys in use.
+
+    Usage: `locks = KeyedLocks()`, then `with locks(key): ...`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}
+
+    @contextmanager
+    def __call__(self, key):
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    def __len__(self):
+        return len(self._locks)
+
+# Cooperative cancellation
+class RunCancelled(Exception):
+    """Raised at a checkpoint once the surrounding run has been cancelled."""
+
+class CancelEvent:
+    """
+    Cancellation flag of one run that joblib worker processes can observe.
+
+    Behaves like threading.Event for set() / is_set(); set() also creates a
+    marker file, and a pickled copy (as sent to a worker process) checks
+    only that file.
+    """
+
+    def __init__(self):
+        self.path = os.path.join(tempfile.gettempdir(), f"run-cancel-{uuid.uuid4().hex}")
+        self._event = threading.Event()
+        self._cleanup = weakref.finalize(self, _remove_marker, self.path)
+
+    def set(self):
+        self._event.set()
+        open(self.path, "a").close()
+
+    def is_set(self) -> bool:
+        if self._event is None:
+            return os.path.exists(self.path)
+        return self._event.is_set()
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.path = state["path"]
+        self._event = None
+
+def _remove_marker(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+_run_state = threading.local()
+
+@contextmanager
+def cancellation_scope(event):
+    """
+    Make checkpoint() in this thread observe `event` (anything with
+    is_set(), or None) for the duration of the block.
+    """
+    previous = getattr(_run_state, "cancel_event", None)
+    _run_state.cancel_event = event
+    try:
+        yield
+    finally:
+        _run_state.cancel_event = previous
+
+def current_cancel_event():
+    """
+    The event checkpoint() observes in this thread, or None outside a job.
+    Pass it to joblib workers, which re-enter cancellation_scope() with it.
+    """
+    return getattr(_run_state, "cancel_event", None)
+
+def checkpoint():
+    """
+    Cancellation point for long method loops.
+
+    A no-op outside a job; inside one, raises RunCancelled once the job has
+    been cancelled. Only threads inside cancellation_scope() are observed,
+    so functions run by joblib workers (threads or processes) take the
+    caller's current_cancel_event() and re-enter the scope themselves.
+    """
+    event = getattr(_run_state, "cancel_event", None)
+    if event is not None and event.is_set():
+        raise RunCancelled()
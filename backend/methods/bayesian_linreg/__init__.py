@@ -0,0 +1,10 @@
+"""
+Bayesian Regression Module
+
+Provides conjugate Normal-Inverse-Gamma linear regression with closed-form
+posteriors, batched posterior draws and posterior predictive intervals.
+"""
+
+from .method import BayesianLinearRegressionMethod
+
+__all__ = ['BayesianLinearRegressionMethod']
@@ -0,0 +1,188 @@
+"""
+Conjugate Bayesian Linear Regression Core Algorithms
+
+Normal-Inverse-Gamma model
+
+    y | beta, sigma^2 ~ N(X beta, sigma^2 I)
+    beta | sigma^2    ~ N(m0, sigma^2 Lambda0^{-1})
+    sigma^2           ~ IG(a0, b0)
+
+The posterior is again Normal-Inverse-Gamma and is obtained from a single
+Cholesky factorization of the posterior precision Lambda_n = X'X + Lambda0.
+Every later quantity (posterior standard deviations, batched draws,
+predictive intervals) reuses that triangular factor, so full uncertainty
+quantification costs about as much as an OLS fit and needs no MCMC.
+"""
+
+import numpy as np
+from scipy import linalg, stats
+
+
+def nig_posterior(X, y, prior_mean=None, prior_precision=None, a0=0.01, b0=0.01):
+    """
+    Normal-Inverse-Gamma posterior of a linear regression.
+
+    Args:
+        X: Design matrix (n x p), including an intercept column if wanted
+        y: Response vector (n,)
+        prior_mean: Prior mean m0 (p,); defaults to zeros
+        prior_precision: Prior precision Lambda0 as a (p,) diagonal or a
+            (p x p) matrix, relative to sigma^2; defaults to zeros (flat)
+        a0: Inverse-Gamma shape of sigma^2
+        b0: Inverse-Gamma scale of sigma^2
+
+    Returns:
+        dict with 'mean' (m_n), 'chol' (lower Cholesky factor of Lambda_n),
+        'a' and 'b' (a_n, b_n), 'prior_mean', 'prior_precision', 'n' and
+        'rss' (residual sum of squares at m_n)
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n, p = X.shape
+    m0 = np.zeros(p) if prior_mean is None else np.asarray(prior_mean, dtype=float)
+    L0 = np.zeros(p) if prior_precision is None else np.asarray(prior_precision, dtype=float)
+    L0 = np.diag(L0) if L0.ndim == 1 else L0
+
+    precision = X.T @ X + L0
+    try:
+        chol = linalg.cholesky(precision, lower=True, check_finite=False)
+    except linalg.LinAlgError:
+        raise ValueError("後驗精確度矩陣不是正定（變數共線或樣本不足），請加強先驗或移除共線變數")
+
+    mean = linalg.cho_solve((chol, True), X.T @ y + L0 @ m0, check_finite=False)
+    resid = y - X @ mean
+    rss = float(resid @ resid)
+    shrink = mean - m0
+    return {
+        "mean": mean,
+        "chol": chol,
+        "a": a0 + n / 2.0,
+        "b": b0 + 0.5 * (rss + float(shrink @ L0 @ shrink)),
+        "prior_mean": m0,
+        "prior_precision": L0,
+        "n": n,
+        "rss": rss
+    }
+
+
+def _quadratic_forms(post, X_new):
+    """Row-wise x' Lambda_n^{-1} x for the rows of X_new, via one triangular solve."""
+    W = linalg.solve_triangular(post["chol"], np.asarray(X_new, dtype=float).T, lower=True, check_finite=False)
+    return np.einsum("ij,ij->j", W, W)
+
+
+def coefficient_summary(post, level=0.95):
+    """
+    Marginal posterior of each coefficient (Student-t with 2 a_n df).
+
+    Args:
+        post: Output of nig_posterior
+        level: Credible level of the equal-tailed intervals
+
+    Returns:
+        dict with 'mean', 'sd', 'lower', 'upper', 'prob_positive' and
+        'sigma2_mean' (posterior mean of sigma^2, if a_n > 1)
+    """
+    p = len(post["mean"])
+    df = 2 * post["a"]
+    scale = np.sqrt(post["b"] / post["a"] * _quadratic_forms(post, np.eye(p)))
+    q = stats.t.ppf(0.5 + level / 2, df)
+    return {
+        "mean": post["mean"],
+        "sd": scale * np.sqrt(df / (df - 2)) if df > 2 else np.full(p, np.inf),
+        "lower": post["mean"] - q * scale,
+        "upper": post["mean"] + q * scale,
+        "prob_positive": stats.t.cdf(post["mean"] / scale, df),
+        "sigma2_mean": post["b"] / (post["a"] - 1) if post["a"] > 1 else np.inf
+    }
+
+
+def sample_posterior(post, n_draws=4000, random_state=0):
+    """
+    Joint posterior draws of (beta, sigma^2) as one batched operation.
+
+    sigma^2_s = b_n / Gamma(a_n, 1) and
+    beta_s = m_n + sigma_s L^{-T} z_s for all s at once: a single
+    triangular solve against the (p x n_draws) normal matrix.
+
+    Args:
+        post: Output of nig_posterior
+        n_draws: Number of draws
+        random_state: Seed
+
+    Returns:
+        tuple (beta_draws (n_draws x p), sigma2_draws (n_draws,))
+    """
+    rng = np.random.default_rng(random_state)
+    sigma2 = post["b"] / rng.gamma(post["a"], 1.0, size=n_draws)
+    Z = rng.standard_normal((len(post["mean"]), n_draws))
+    dev = linalg.solve_triangular(post["chol"], Z, lower=True, trans="T", check_finite=False)
+    beta = post["mean"] + (dev * np.sqrt(sigma2)).T
+    return beta, sigma2
+
+
+def predictive_intervals(post, X_new, levels=(0.5, 0.95)):
+    """
+    Posterior predictive mean and equal-tailed intervals for new rows.
+
+    The predictive distribution of each row is Student-t with 2 a_n df,
+    location x' m_n and scale^2 (b_n / a_n)(1 + x' Lambda_n^{-1} x); all rows
+    and levels are evaluated together by broadcasting.
+
+    Args:
+        post: Output of nig_posterior
+        X_new: New design rows (m x p)
+        levels: Interval levels
+
+    Returns:
+        dict with 'mean' (m,), 'scale' (m,), 'levels' and 'lower' /
+        'upper' (len(levels) x m)
+    """
+    X_new = np.asarray(X_new, dtype=float)
+    levels = np.atleast_1d(np.asarray(levels, dtype=float))
+    loc = X_new @ post["mean"]
+    scale = np.sqrt(post["b"] / post["a"] * (1.0 + _quadratic_forms(post, X_new)))
+    q = stats.t.ppf(0.5 + levels / 2, 2 * post["a"])[:, None]
+    return {
+        "mean": loc,
+        "scale": scale,
+        "levels": levels,
+        "lower": loc - q * scale,
+        "upper": loc + q * scale
+    }
+
+
+def predictive_draws(beta, sigma2, X_new, random_state=0):
+    """
+    Replicated responses y_rep (n_draws x m) from posterior draws.
+
+    Args:
+        beta: Coefficient draws (n_draws x p)
+        sigma2: Variance draws (n_draws,)
+        X_new: Design rows (m x p)
+        random_state: Seed
+
+    Returns:
+        numpy array of shape (n_draws, m)
+    """
+    rng = np.random.default_rng(random_state)
+    mu = beta @ np.asarray(X_new, dtype=float).T
+    return mu + np.sqrt(sigma2)[:, None] * rng.standard_normal(mu.shape)
+
+
+def bayes_r2(beta, sigma2, X):
+    """
+    Bayesian R^2 per draw: var(X beta_s) / (var(X beta_s) + sigma^2_s).
+
+    Args:
+        beta: Coefficient draws (n_draws x p)
+        sigma2: Variance draws (n_draws,)
+        X: Design matrix (n x p)
+
+    Returns:
+        numpy array of shape (n_draws,)
+    """
+    # var(X beta) = beta' Cov(X) beta, so the n x n_draws fit is never formed
+    C = np.cov(np.asarray(X, dtype=float), rowvar=False, bias=True)
+    var_fit = np.einsum("sp,pq,sq->s", beta, np.atleast_2d(C), beta)
+    return var_fit / (var_fit + sigma2)
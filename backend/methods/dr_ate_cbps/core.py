@@ -4,29 +4,135 @@ Doubly Robust ATE Estimation with CBPS-like Weighting
 Core algorithms for causal inference.
 """
 
+import warnings
+
 import numpy as np
 
 
-def cbps_weight(X: np.ndarray, T: np.ndarray) -> np.ndarray:
+def propensity_score(X: np.ndarray, T: np.ndarray, clip: float = 1e-3) -> np.ndarray:
     """
-    Calculate inverse propensity weights using logistic regression (CBPS-like).
+    Estimate propensity scores with logistic regression.
 
     Args:
         X: Covariates matrix (n x p)
         T: Treatment indicator (n,) with values 0 or 1
+        clip: Scores are clipped to [clip, 1 - clip]
 
     Returns:
-        weights: Array of weights (n,)
+        ps: Array of propensity scores (n,)
     """
     from sklearn.linear_model import LogisticRegression
     lr = LogisticRegression(max_iter=300)
     lr.fit(X, T)
     ps = lr.predict_proba(X)[:, 1]
-    ps = np.clip(ps, 1e-3, 1 - 1e-3)
+    return np.clip(ps, clip, 1 - clip)
+
+
+def cbps_weight(X: np.ndarray, T: np.ndarray, ps: np.ndarray = None) -> np.ndarray:
+    """
+    Calculate inverse propensity weights using logistic regression (CBPS-like).
+
+    Args:
+        X: Covariates matrix (n x p)
+        T: Treatment indicator (n,) with values 0 or 1
+        ps: Precomputed propensity scores (optional)
+
+    Returns:
+        weights: Array of weights (n,)
+    """
+    if ps is None:
+        ps = propensity_score(X, T)
     w = np.where(T == 1, 1 / ps, 1 / (1 - ps))
     return w
 
 
+def _entropy_balance_dual(Z: np.ndarray, max_iter: int = 50, tol: float = 1e-8):
+    """
+    Solve the entropy balancing dual min_lambda log(sum(exp(Z @ lambda))).
+
+    Z holds covariates already centered at the balance target, so the
+    gradient is the weighted mean of Z and vanishes exactly at balance.
+
+    Args:
+        Z: Centered covariates of one treatment arm (n_g x p)
+        max_iter: Maximum Newton iterations
+        tol: Convergence tolerance on the largest moment imbalance
+
+    Returns:
+        Tuple of (normalized weights summing to 1, converged flag)
+    """
+    p = Z.shape[1]
+    lam = np.zeros(p)
+
+    def objective(lam):
+        a = Z @ lam
+        m = a.max()
+        e = np.exp(a - m)
+        s = e.sum()
+        return m + np.log(s), e / s
+
+    f, w = objective(lam)
+    for _ in range(max_iter):
+        grad = Z.T @ w
+        if np.max(np.abs(grad)) < tol:
+            return w, True
+        Zw = Z * w[:, None]
+        hess = Z.T @ Zw - np.outer(grad, grad) + 1e-10 * np.eye(p)
+        step = np.linalg.solve(hess, grad)
+
+        # Backtracking line search on the convex dual
+        t = 1.0
+        while t > 1e-10:
+            f_new, w_new = objective(lam - t * step)
+            if f_new <= f - 1e-4 * t * grad @ step:
+                break
+            t *= 0.5
+        lam = lam - t * step
+        f, w = f_new, w_new
+
+    return w, bool(np.max(np.abs(Z.T @ w)) < tol)
+
+
+def entropy_balance_weight(X: np.ndarray, T: np.ndarray, max_iter: int = 50, tol: float = 1e-8) -> np.ndarray:
+    """
+    Calculate ATE weights by entropy balancing (Hainmueller, 2012).
+
+    Each arm is reweighted so that its covariate means equal the full-sample
+    means exactly. The problem is solved through its p-dimensional convex
+    dual with Newton's method, so the cost is O(n * p^2) per iteration
+    regardless of how many weights are estimated.
+
+    Args:
+        X: Covariates matrix (n x p)
+        T: Treatment indicator (n,) with values 0 or 1
+        max_iter: Maximum Newton iterations per arm
+        tol: Convergence tolerance on the standardized mean imbalance
+
+    Returns:
+        weights: Array of weights (n,), summing to n within each arm
+    """
+    X = np.asarray(X, dtype=float)
+    n = len(T)
+
+    # Balance standardized covariates; drop constant columns
+    target = X.mean(axis=0)
+    sd = X.std(axis=0)
+    keep = sd > 1e-12
+    Z = (X[:, keep] - target[keep]) / sd[keep]
+
+    w = np.empty(n)
+    for arm in (0, 1):
+        idx = T == arm
+        w_arm, converged = _entropy_balance_dual(Z[idx], max_iter=max_iter, tol=tol)
+        if not converged:
+            warnings.warn(
+                "Entropy balancing did not reach exact balance for arm "
+                f"T={arm}; the covariate means may lie outside its convex hull."
+            )
+        w[idx] = w_arm * n
+    return w
+
+
 def standardized_mean_difference(x_t, x_c, w_t, w_c):
     """
     Calculate weighted standardized mean difference (SMD).
@@ -62,7 +168,8 @@ def doubly_robust_ate(X, T, Y, w):
         w: Propensity weights (n,)
 
     Returns:
-        dict with 'ate', 'se', 'ci_lower', 'ci_upper'
+        dict with 'ate', 'se', 'ci_lower', 'ci_upper' and the per-unit
+        'dr_scores', 'mu1', 'mu0' (kept for sensitivity and trimming analyses)
     """
     from sklearn.linear_model import LinearRegression
 
@@ -94,5 +201,103 @@ def doubly_robust_ate(X, T, Y, w):
         "ate": ate,
         "se": se,
         "ci_lower": ci[0],
-        "ci_upper": ci[1]
+        "ci_upper": ci[1],
+        "dr_scores": dr_scores,
+        "mu1": mu1,
+        "mu0": mu0
+    }
+
+
+def trimming_sweep(ps, T, Y, mu1, mu0, w, thresholds, alpha=0.05, reweight=None):
+    """
+    Evaluate the DR estimate over a grid of propensity trimming thresholds.
+
+    A unit is kept at threshold a when a <= ps <= 1 - a. Units are sorted
+    once by min(ps, 1 - ps) in descending order, so every trimmed sample is
+    a prefix of that order and all sums needed by the estimator, its
+    influence-function SE and the effective sample size come from
+    cumulative sums. The outcome models (mu1, mu0) are not refit.
+
+    Args:
+        ps: Propensity scores (n,)
+        T: Treatment indicator (n,)
+        Y: Outcome variable (n,)
+        mu1: Fitted treated outcome model predictions (n,)
+        mu0: Fitted control outcome model predictions (n,)
+        w: Weights used by doubly_robust_ate (n,)
+        thresholds: Trimming thresholds in [0, 0.5)
+        alpha: Significance level for the confidence limits
+        reweight: Optional callable(keep_mask) -> weights of the kept units,
+            for weights that depend on the sample (entropy balancing); they
+            are then re-solved on every trimmed sample instead of reusing w
+
+    Returns:
+        dict of arrays (one entry per threshold): 'threshold', 'n_kept',
+        'n_treated', 'n_control', 'ate', 'se', 'ci_lower', 'ci_upper', 'ess'
+    """
+    from scipy import stats
+
+    T = np.asarray(T, dtype=float)
+    thresholds = np.asarray(thresholds, dtype=float)
+    overlap = np.minimum(ps, 1 - ps)
+
+    if reweight is not None:
+        rows = []
+        for a in thresholds:
+            keep = overlap >= a
+            both_arms = T[keep].any() and not T[keep].all()
+            w_keep = reweight(keep) if both_arms else w[keep]
+            rows.append(trimming_sweep(ps[keep], T[keep], Y[keep], mu1[keep], mu0[keep], w_keep, [a], alpha))
+        return {k: np.concatenate([r[k] for r in rows]) for k in rows[0]}
+    order = np.argsort(-overlap, kind="stable")
+
+    T_s, w_s = T[order], w[order]
+    tau = (mu1 - mu0)[order]
+    a = T_s * (Y - mu1)[order] * w_s
+    b = (1 - T_s) * (Y - mu0)[order] * w_s
+
+    def csum(v):
+        return np.concatenate([[0.0], np.cumsum(v)])
+
+    S = {
+        "n1": csum(T_s), "n0": csum(1 - T_s),
+        "w1": csum(T_s * w_s), "w0": csum((1 - T_s) * w_s),
+        "w": csum(w_s), "w2": csum(w_s ** 2),
+        "tau": csum(tau), "a": csum(a), "b": csum(b),
+        "tau2": csum(tau ** 2), "a2": csum(a ** 2), "b2": csum(b ** 2),
+        "tau_a": csum(tau * a), "tau_b": csum(tau * b)
+    }
+
+    # Number of units with overlap >= threshold (prefix length)
+    n_kept = np.searchsorted(-overlap[order], -thresholds, side="right")
+    s = {k: v[n_kept] for k, v in S.items()}
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Scores: tau + c1 * a - c0 * b with c = 1 / mean of arm weights
+        c1 = s["n1"] / s["w1"]
+        c0 = s["n0"] / s["w0"]
+        ate = (s["tau"] + c1 * s["a"] - c0 * s["b"]) / n_kept
+        sum_sq = (
+            s["tau2"] + c1 ** 2 * s["a2"] + c0 ** 2 * s["b2"] +
+            2 * c1 * s["tau_a"] - 2 * c0 * s["tau_b"]
+        )
+        var = (sum_sq / n_kept - ate ** 2) * n_kept / (n_kept - 1)
+        se = np.sqrt(np.maximum(var, 0) / n_kept)
+        ess = s["w"] ** 2 / s["w2"]
+
+    invalid = (s["n1"] == 0) | (s["n0"] == 0)
+    ate[invalid] = np.nan
+    se[invalid] = np.nan
+    z = stats.norm.ppf(1 - alpha / 2)
+
+    return {
+        "threshold": thresholds,
+        "n_kept": n_kept,
+        "n_treated": s["n1"].astype(int),
+        "n_control": s["n0"].astype(int),
+        "ate": ate,
+        "se": se,
+        "ci_lower": ate - z * se,
+        "ci_upper": ate + z * se,
+        "ess": ess
     }
@@ -5,13 +5,69 @@ BaseMethod wrapper for causal inference using DR estimator.
 """
 
 from ..base import BaseMethod, register
-from .core import cbps_weight, standardized_mean_difference, doubly_robust_ate
+from ..plotting import save_figure
+from .core import (
+    propensity_score,
+    cbps_weight,
+    entropy_balance_weight,
+    standardized_mean_difference,
+    doubly_robust_ate,
+    trimming_sweep
+)
+from .sensitivity import ate_e_values, bias_adjusted_grid
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 
 
+def _draw_balance(fig, d):
+    ax = fig.subplots()
+    ax.scatter(range(len(d["abs_smd"])), d["abs_smd"], alpha=0.6, s=50)
+    ax.axhline(0.1, linestyle="--", color='red', linewidth=2, label='SMD = 0.1 threshold')
+    ax.set_xlabel("Covariate Index", fontsize=12)
+    ax.set_ylabel("|SMD| (weighted)", fontsize=12)
+    ax.set_title("Weighted Balance Diagnostics (|SMD|)", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_trimming_sweep(fig, d):
+    ax = fig.subplots()
+    ax.plot(d["threshold"], d["ate"], marker="o", linewidth=2, label="DR ATE")
+    ax.fill_between(d["threshold"], np.asarray(d["ci_lower"], dtype=float), np.asarray(d["ci_upper"], dtype=float),
+                    alpha=0.2, label="95% CI")
+    ax.axhline(0, color="black", linewidth=0.8)
+    ax.set_xlabel("Trimming threshold a (keep a <= ps <= 1 - a)", fontsize=12)
+    ax.set_ylabel("ATE", fontsize=12)
+    ax2 = ax.twinx()
+    ax2.plot(d["threshold"], d["ess"], color="gray", linestyle="--", label="Effective sample size")
+    ax2.set_ylabel("Effective sample size", fontsize=12)
+    lines = ax.get_legend_handles_labels()
+    lines2 = ax2.get_legend_handles_labels()
+    ax.legend(lines[0] + lines2[0], lines[1] + lines2[1], loc="best")
+    ax.set_title("ATE Sensitivity to Propensity Trimming", fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_sensitivity_contour(fig, d):
+    ax = fig.subplots()
+    c1_mesh, c0_mesh = np.meshgrid(d["c_grid"], d["c_grid"], indexing="ij")
+    ate_adjusted = np.asarray(d["ate_adjusted"], dtype=float)
+    covers_zero = np.asarray(d["ci_covers_zero"], dtype=bool)
+    cs = ax.contourf(c0_mesh, c1_mesh, ate_adjusted, levels=20, cmap="RdBu_r")
+    fig.colorbar(cs, ax=ax, label="Bias-adjusted ATE")
+    if covers_zero.any() and not covers_zero.all():
+        ax.contourf(c0_mesh, c1_mesh, covers_zero.astype(float), levels=[0.5, 1.5],
+                    colors="none", hatches=["//"])
+    if ate_adjusted.min() < 0 < ate_adjusted.max():
+        ax.contour(c0_mesh, c1_mesh, ate_adjusted, levels=[0], colors="black", linewidths=2)
+    ax.scatter([0], [0], color="black", marker="x", s=80, label=f"Estimate (ATE = {d['ate']:.3f})")
+    ax.set_xlabel("c0: E[Y(0)|T=1,X] - E[Y(0)|T=0,X]", fontsize=12)
+    ax.set_ylabel("c1: E[Y(1)|T=1,X] - E[Y(1)|T=0,X]", fontsize=12)
+    ax.set_title("Sensitivity of ATE to Unmeasured Confounding", fontsize=14, fontweight='bold')
+    ax.legend(loc="upper right")
+
+
 @register
 class DrAteCbps(BaseMethod):
     id = "dr_ate_cbps"
@@ -25,7 +81,10 @@ class DrAteCbps(BaseMethod):
         Args:
             df: Input dataframe
             roles: Variable roles dict with 'treatment' and 'y' keys
-            params: Method parameters (optional)
+            params: Method parameters (optional, supports 'weighting'
+                ('cbps' or 'entropy_balance'), 'sensitivity',
+                'sensitivity_grid_size', 'sensitivity_max', 'trimming_sweep',
+                'trim_thresholds')
             out_dir: Output directory for results
 
         Returns:
@@ -43,8 +102,16 @@ class DrAteCbps(BaseMethod):
         T = df[t_col].astype(int).values
         Y = df[y_col].astype(float).values
 
-        # Calculate propensity weights
-        w = cbps_weight(X, T)
+        # Calculate balancing weights
+        weighting = params.get("weighting", "cbps")
+        run_sweep = params.get("trimming_sweep", False)
+        ps = propensity_score(X, T) if weighting == "cbps" or run_sweep else None
+        if weighting == "cbps":
+            w = cbps_weight(X, T, ps=ps)
+        elif weighting == "entropy_balance":
+            w = entropy_balance_weight(X, T)
+        else:
+            raise ValueError("weighting 必須是 'cbps' 或 'entropy_balance'")
 
         # Estimate ATE
         ate_result = doubly_robust_ate(X, T, Y, w)
@@ -68,21 +135,11 @@ class DrAteCbps(BaseMethod):
         ]
 
         # Generate balance plot
-        fig_path = os.path.join(out_dir, "balance.png")
-        plt.figure(figsize=(10, 6))
-        plt.scatter(range(len(smd_after)), np.abs(smd_after), alpha=0.6, s=50)
-        plt.axhline(0.1, linestyle="--", color='red', linewidth=2, label='SMD = 0.1 threshold')
-        plt.xlabel("Covariate Index", fontsize=12)
-        plt.ylabel("|SMD| (weighted)", fontsize=12)
-        plt.title("Weighted Balance Diagnostics (|SMD|)", fontsize=14, fontweight='bold')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(fig_path, dpi=300)
-        plt.close()
+        figures = [save_figure(os.path.join(out_dir, "balance.png"), _draw_balance, {"abs_smd": np.abs(smd_after)})]
 
         # Prepare metrics
         metrics = {
+            "weighting": weighting,
             "ATE": round(ate, 6),
             "SE": round(se, 6),
             "CI95_lower": round(ci_lower, 6),
@@ -92,6 +149,49 @@ class DrAteCbps(BaseMethod):
             "max_smd": round(float(max(abs(s) for s in smd_after)), 4)
         }
 
+        # Sensitivity analysis for unmeasured confounding
+        sensitivity = None
+        sensitivity_md = ""
+        if params.get("sensitivity", False):
+            sensitivity = self._sensitivity_analysis(
+                ate_result, T, Y, params, out_dir
+            )
+            figures.append(sensitivity["figure"])
+            metrics["E_value"] = round(sensitivity["e_value"], 4)
+            metrics["E_value_CI"] = round(sensitivity["e_value_ci"], 4)
+            sensitivity_md = f"""
+### 敏感性分析（未觀測混淆）
+- **E-value（點估計）**: {metrics['E_value']:.3f}
+- **E-value（信賴區間）**: {metrics['E_value_CI']:.3f}
+- **使 ATE 歸零所需的混淆強度 (c1 = c0)**: {sensitivity['tipping_point']:.4f}
+- **使信賴區間包含 0 所需的混淆強度 (c1 = c0)**: {sensitivity['tipping_point_ci']:.4f}
+
+E-value 表示未觀測混淆因子需同時與處置及結果有多強的關聯（風險比尺度），才足以完全解釋觀察到的效應。
+c1、c0 為處置組與對照組潛在結果的平均差異（結果變數單位），完整網格見 `sensitivity_table.csv`。
+"""
+
+        # Propensity trimming sweep
+        trimming = None
+        trimming_md = ""
+        if run_sweep:
+            # Entropy-balancing weights depend on the sample, so they are re-solved per threshold
+            reweight = (lambda keep: entropy_balance_weight(X[keep], T[keep])) \
+                if weighting == "entropy_balance" else None
+            trimming = self._trimming_sweep(ps, T, Y, w, ate_result, params, out_dir, reweight=reweight)
+            figures.append(trimming["figure"])
+            rows = "\n".join(
+                f"| {r['threshold']:.3f} | {r['n_kept']} | {r['ate']:.4f} | {r['se']:.4f} | {r['ess']:.1f} |"
+                for r in trimming["table"]
+            )
+            trimming_md = f"""
+### 傾向分數修剪敏感度
+保留 a ≤ 傾向分數 ≤ 1 − a 的樣本，觀察 ATE 隨修剪門檻 a 的變化（結果模型不重新配適，SE 為影響函數估計{"；熵平衡權重在每個修剪樣本上重新求解" if weighting == "entropy_balance" else ""}）。
+
+| 門檻 a | 保留樣本數 | ATE | SE | 有效樣本數 |
+|--------|-----------|-----|----|-----------|
+{rows}
+"""
+
         # Generate summary
         summary_md = f"""
 ## Doubly Robust ATE 估計結果
@@ -102,17 +202,121 @@ class DrAteCbps(BaseMethod):
 - **95% 信賴區間**: [{metrics['CI95_lower']:.4f}, {metrics['CI95_upper']:.4f}]
 
 ### 平衡診斷
+- **加權方式**: {"熵平衡 (Entropy Balancing)" if weighting == "entropy_balance" else "CBPS-like 傾向分數加權"}
 - **共變數數量**: {metrics['num_covariates']}
 - **平衡共變數數 (|SMD| < 0.1)**: {metrics['num_balanced']} / {metrics['num_covariates']}
 - **最大 |SMD|**: {metrics['max_smd']:.4f}
 
+{sensitivity_md}{trimming_md}
 ### 方法說明
-此方法使用 Doubly Robust 估計量，結合傾向分數加權與結果迴歸模型。
+此方法使用 Doubly Robust 估計量，結合加權（傾向分數或熵平衡）與結果迴歸模型。
 只要其中一個模型正確指定，估計量就是一致的。
 """
 
         return {
             "metrics": metrics,
-            "figures": [fig_path],
-            "summary_md": summary_md
+            "figures": figures,
+            "summary_md": summary_md,
+            "sensitivity": {
+                k: v for k, v in sensitivity.items() if k != "figure"
+            } if sensitivity else None,
+            "trimming_sweep": {
+                k: v for k, v in trimming.items() if k != "figure"
+            } if trimming else None
+        }
+
+    def _trimming_sweep(self, ps, T, Y, w, ate_result, params, out_dir, reweight=None):
+        """
+        DR estimate, SE and effective sample size over trimming thresholds.
+
+        Args:
+            ps: Propensity scores
+            T: Treatment indicator
+            Y: Outcome
+            w: Weights used for the main estimate
+            ate_result: Output of doubly_robust_ate (with 'mu1', 'mu0')
+            params: Method parameters
+            out_dir: Output directory for results
+            reweight: Optional callable(keep_mask) re-solving the weights on
+                each trimmed sample (see trimming_sweep)
+
+        Returns:
+            dict with table rows, table path and figure path
+        """
+        thresholds = params.get("trim_thresholds", np.round(np.linspace(0, 0.1, 11), 3))
+        sweep = trimming_sweep(ps, T, Y, ate_result["mu1"], ate_result["mu0"], w, thresholds, reweight=reweight)
+
+        table = pd.DataFrame(sweep)
+        table_path = os.path.join(out_dir, "trimming_sweep.csv")
+        table.to_csv(table_path, index=False)
+
+        fig_path = save_figure(os.path.join(out_dir, "trimming_sweep.png"), _draw_trimming_sweep, {
+            k: sweep[k] for k in ("threshold", "ate", "ci_lower", "ci_upper", "ess")
+        })
+
+        records = [
+            {k: (float(v) if k not in ("n_kept", "n_treated", "n_control") else int(v)) for k, v in row.items()}
+            for row in table.to_dict(orient="records")
+        ]
+        return {"table": records, "table_path": table_path, "figure": fig_path}
+
+    def _sensitivity_analysis(self, ate_result, T, Y, params, out_dir):
+        """
+        E-values and a bias-adjusted ATE grid over confounding strengths.
+
+        Args:
+            ate_result: Output of doubly_robust_ate (with 'dr_scores')
+            T: Treatment indicator
+            Y: Outcome
+            params: Method parameters
+            out_dir: Output directory for results
+
+        Returns:
+            dict with E-values, tipping points, table path and figure path
+        """
+        ate = ate_result["ate"]
+        se = ate_result["se"]
+        e_values = ate_e_values(
+            ate, ate_result["ci_lower"], ate_result["ci_upper"], float(np.std(Y, ddof=1))
+        )
+
+        # Confounding strengths in outcome units, symmetric around 0
+        grid_size = int(params.get("sensitivity_grid_size", 50))
+        c_max = float(params.get("sensitivity_max", 2 * max(abs(ate), se)))
+        c_grid = np.linspace(-c_max, c_max, grid_size)
+        grid = bias_adjusted_grid(ate_result["dr_scores"], T, c_grid, c_grid)
+
+        # Table (long format)
+        c1_mesh, c0_mesh = np.meshgrid(c_grid, c_grid, indexing="ij")
+        table_path = os.path.join(out_dir, "sensitivity_table.csv")
+        pd.DataFrame({
+            "c1": c1_mesh.ravel(),
+            "c0": c0_mesh.ravel(),
+            "ate_adjusted": grid["ate"].ravel(),
+            "se": grid["se"].ravel(),
+            "ci_lower": grid["ci_lower"].ravel(),
+            "ci_upper": grid["ci_upper"].ravel()
+        }).to_csv(table_path, index=False)
+
+        # Contour plot
+        fig_path = save_figure(os.path.join(out_dir, "sensitivity_contour.png"), _draw_sensitivity_contour, {
+            "c_grid": c_grid,
+            "ate_adjusted": grid["ate"],
+            "ci_covers_zero": (grid["ci_lower"] <= 0) & (grid["ci_upper"] >= 0),
+            "ate": ate
+        }, figsize=(9, 7))
+
+        # Along c1 = c0 = c the adjusted ATE is ATE - c with unchanged SE
+        z = 1.96
+        tipping_ci = ate - z * se if ate > 0 else ate + z * se
+
+        return {
+            "e_value": e_values["e_value"],
+            "e_value_ci": e_values["e_value_ci"],
+            "tipping_point": float(ate),
+            "tipping_point_ci": float(tipping_ci),
+            "grid_size": grid_size,
+            "c_max": c_max,
+            "table_path": table_path,
+            "figure": fig_path
         }
@@ -0,0 +1,10 @@
+"""
+Penalized Regression Module
+
+Provides Lasso / elastic-net regression with a full coordinate-descent
+lambda path, strong-rule screening and cross-validated lambda selection.
+"""
+
+from .method import LassoElasticNetMethod
+
+__all__ = ['LassoElasticNetMethod']
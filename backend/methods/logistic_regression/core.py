@@ -5,11 +5,12 @@ Provides binary classification utilities and model evaluation functions.
 """
 
 import numpy as np
+from scipy import stats
 from sklearn.linear_model import LogisticRegression as SklearnLogisticRegression
 from sklearn.metrics import roc_auc_score, roc_curve, accuracy_score, confusion_matrix
 
 
-def train_logistic_model(X, y, max_iter=200):
+def train_logistic_model(X, y, max_iter=200, C=1.0):
     """
     Train a logistic regression model.
 
@@ -17,11 +18,12 @@ def train_logistic_model(X, y, max_iter=200):
         X: Feature matrix (n x p)
         y: Binary target (n,)
         max_iter: Maximum iterations for optimization
+        C: Inverse L2 regularization strength (np.inf for no penalty)
 
     Returns:
         Trained sklearn LogisticRegression model
     """
-    model = SklearnLogisticRegression(max_iter=max_iter)
+    model = SklearnLogisticRegression(C=C, max_iter=max_iter)
     model.fit(X, y)
     return model
 
@@ -89,3 +91,188 @@ def get_roc_curve_data(y_true, y_pred_proba):
         Tuple of (fpr, tpr, thresholds)
     """
     return roc_curve(y_true, y_pred_proba)
+
+
+def threshold_sweep(y_true, y_pred_proba, cost_fp=1.0, cost_fn=1.0):
+    """
+    Confusion-matrix metrics at every distinct decision threshold.
+
+    Probabilities are sorted once; cumulative true/false positive counts
+    then give every operating point, so the total cost is O(n log n).
+    A unit is predicted positive when its probability >= threshold; the
+    first row (threshold = inf) predicts no positives.
+
+    Args:
+        y_true: True labels
+        y_pred_proba: Predicted probabilities
+        cost_fp: Cost of one false positive
+        cost_fn: Cost of one false negative
+
+    Returns:
+        dict of arrays: threshold, tp, fp, fn, tn, precision, recall,
+        specificity, f1, youden_j, accuracy, cost (mean cost per unit)
+    """
+    y_true = np.asarray(y_true).astype(int)
+    proba = np.asarray(y_pred_proba, dtype=float)
+    order = np.argsort(-proba, kind="mergesort")
+    p_sorted = proba[order]
+    y_sorted = y_true[order]
+
+    # Last position of every run of tied probabilities
+    last = np.r_[np.flatnonzero(np.diff(p_sorted)), len(p_sorted) - 1]
+    tp = np.r_[0, np.cumsum(y_sorted)[last]]
+    fp = np.r_[0, last + 1 - tp[1:]]
+    thresholds = np.r_[np.inf, p_sorted[last]]
+
+    n = len(y_true)
+    pos = int(y_true.sum())
+    neg = n - pos
+    fn = pos - tp
+    tn = neg - fp
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 1.0)
+        recall = tp / pos if pos else np.zeros(len(tp))
+        specificity = tn / neg if neg else np.zeros(len(tp))
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    return {
+        "threshold": thresholds,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "precision": precision,
+        "recall": recall,
+        "specificity": specificity,
+        "f1": f1,
+        "youden_j": recall + specificity - 1,
+        "accuracy": (tp + tn) / n,
+        "cost": (cost_fp * fp + cost_fn * fn) / n
+    }
+
+
+def optimal_thresholds(sweep):
+    """
+    Best operating points of a threshold sweep.
+
+    Args:
+        sweep: Output of threshold_sweep
+
+    Returns:
+        dict mapping 'f1', 'youden', 'cost' to
+        {'threshold', 'precision', 'recall', 'specificity', 'f1', 'youden_j', 'cost'}
+    """
+    # The threshold = inf row is excluded so every choice is a usable cut-off
+    best = {
+        "f1": 1 + int(np.argmax(sweep["f1"][1:])),
+        "youden": 1 + int(np.argmax(sweep["youden_j"][1:])),
+        "cost": 1 + int(np.argmin(sweep["cost"][1:]))
+    }
+    keys = ("threshold", "precision", "recall", "specificity", "f1", "youden_j", "cost")
+    return {
+        name: {k: float(sweep[k][i]) for k in keys}
+        for name, i in best.items()
+    }
+
+
+def average_precision(sweep):
+    """
+    Area under the precision-recall curve (step interpolation).
+
+    Args:
+        sweep: Output of threshold_sweep
+
+    Returns:
+        Average precision
+    """
+    return float(np.sum(np.diff(sweep["recall"]) * sweep["precision"][1:]))
+
+
+def delong_auc(y_true, y_pred_proba, alpha=0.05):
+    """
+    AUC with DeLong's variance from midranks (no bootstrap).
+
+    Uses the O(n log n) formulation of Sun & Xu (2014): the placement
+    values of each class follow from the midranks within the class and
+    within the pooled sample.
+
+    Args:
+        y_true: True labels
+        y_pred_proba: Predicted probabilities
+        alpha: Significance level for the confidence interval
+
+    Returns:
+        dict with 'auc', 'se', 'ci_lower', 'ci_upper'
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    proba = np.asarray(y_pred_proba, dtype=float)
+    pos = proba[y_true]
+    neg = proba[~y_true]
+    m, n = len(pos), len(neg)
+
+    tz = stats.rankdata(np.concatenate([pos, neg]))
+    tx = stats.rankdata(pos)
+    ty = stats.rankdata(neg)
+
+    auc = (tz[:m].sum() - m * (m + 1) / 2) / (m * n)
+    v10 = (tz[:m] - tx) / n
+    v01 = 1 - (tz[m:] - ty) / m
+    var = (np.var(v10, ddof=1) / m if m > 1 else 0.0) + (np.var(v01, ddof=1) / n if n > 1 else 0.0)
+    se = float(np.sqrt(var))
+    q = stats.norm.ppf(1 - alpha / 2)
+
+    return {
+        "auc": float(auc),
+        "se": se,
+        "ci_lower": float(max(auc - q * se, 0.0)),
+        "ci_upper": float(min(auc + q * se, 1.0))
+    }
+
+
+def calibration_diagnostics(y_true, y_pred_proba, n_bins=10):
+    """
+    Reliability curve, Brier score and Hosmer-Lemeshow test.
+
+    Units are grouped into quantile bins of the predicted probability;
+    observed and expected counts per bin come from one bincount pass each.
+
+    Args:
+        y_true: True labels
+        y_pred_proba: Predicted probabilities
+        n_bins: Number of (quantile) bins
+
+    Returns:
+        dict with 'mean_predicted', 'observed_rate', 'bin_counts' (arrays
+        over non-empty bins), 'brier_score', 'hosmer_lemeshow_stat',
+        'hosmer_lemeshow_df' and 'hosmer_lemeshow_p'
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    proba = np.asarray(y_pred_proba, dtype=float)
+
+    edges = np.unique(np.quantile(proba, np.linspace(0, 1, n_bins + 1)))
+    bins = np.clip(np.searchsorted(edges, proba, side="right") - 1, 0, max(len(edges) - 2, 0))
+    k = max(len(edges) - 1, 1)
+
+    counts = np.bincount(bins, minlength=k)
+    expected = np.bincount(bins, weights=proba, minlength=k)
+    observed = np.bincount(bins, weights=y_true, minlength=k)
+    used = counts > 0
+    counts, expected, observed = counts[used], expected[used], observed[used]
+
+    # Hosmer-Lemeshow: sum over bins of (O - E)^2 / (E (1 - E / n_g))
+    denom = expected * (1 - expected / counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hl_terms = np.where(denom > 0, (observed - expected) ** 2 / denom, 0.0)
+    hl = float(hl_terms.sum())
+    dof = max(len(counts) - 2, 1)
+
+    return {
+        "mean_predicted": expected / counts,
+        "observed_rate": observed / counts,
+        "bin_counts": counts,
+        "brier_score": float(np.mean((proba - y_true) ** 2)),
+        "hosmer_lemeshow_stat": hl,
+        "hosmer_lemeshow_df": dof,
+        "hosmer_lemeshow_p": float(stats.chi2.sf(hl, dof))
+    }
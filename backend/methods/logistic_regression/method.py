@@ -5,15 +5,143 @@ BaseMethod wrapper for binary classification using logistic regression.
 """
 
 from ..base import BaseMethod, register
+from ..plotting import save_figure, curve_points, histogram, draw_histogram
+from ..importance import feature_groups, permutation_importance
 from .core import (
     train_logistic_model,
     predict_probabilities,
     calculate_metrics,
-    get_roc_curve_data
+    get_roc_curve_data,
+    threshold_sweep,
+    optimal_thresholds,
+    average_precision,
+    delong_auc,
+    calibration_diagnostics
 )
+from .regularization import regularization_path, path_probabilities
+from .inference import coefficient_inference
+from .subsampling import local_case_control_fit
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+from sklearn.metrics import roc_auc_score
 import os
+import time
+
+
+def _draw_roc(fig, d):
+    ax = fig.subplots()
+    ax.plot(d["fpr"], d["tpr"], linewidth=2, label=f'ROC (AUC = {d["auc"]:.3f})')
+    ax.plot([0, 1], [0, 1], "--", color='gray', linewidth=2, label='Random Classifier')
+    ax.set_xlabel("False Positive Rate (FPR)", fontsize=12)
+    ax.set_ylabel("True Positive Rate (TPR)", fontsize=12)
+    ax.set_title("ROC Curve", fontsize=14, fontweight='bold')
+    ax.legend(loc='lower right', fontsize=11)
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_confusion(fig, d):
+    cm = d["cm"]
+    ax = fig.subplots()
+    im = ax.imshow(cm, interpolation='nearest', cmap='Blues')
+    ax.set_title('Confusion Matrix', fontsize=14, fontweight='bold')
+    fig.colorbar(im, ax=ax)
+    tick_marks = [0, 1]
+    ax.set_xticks(tick_marks, ['Predicted 0', 'Predicted 1'])
+    ax.set_yticks(tick_marks, ['Actual 0', 'Actual 1'])
+
+    # Add text annotations
+    for i in range(2):
+        for j in range(2):
+            ax.text(j, i, str(cm[i][j]),
+                    ha="center", va="center",
+                    color="white" if cm[i][j] > max(max(cm)) / 2 else "black",
+                    fontsize=20, fontweight='bold')
+
+    ax.set_ylabel('True Label', fontsize=12)
+    ax.set_xlabel('Predicted Label', fontsize=12)
+
+
+def _draw_importance(fig, d):
+    ax = fig.subplots()
+    ax.barh(d["feature"], d["importance_mean"], xerr=d["importance_std"],
+            color="steelblue", alpha=0.8, capsize=3)
+    ax.axvline(0, color="black", linewidth=0.8)
+    ax.set_xlabel("Decrease in AUC when permuted", fontsize=12)
+    ax.set_title("Permutation Feature Importance", fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='x')
+
+
+def _draw_calibration(fig, d):
+    ax1, ax2 = fig.subplots(2, 1, sharex=True, gridspec_kw={"height_ratios": [3, 1]})
+
+    ax1.plot([0, 1], [0, 1], "--", color="gray", linewidth=2, label="Perfectly calibrated")
+    ax1.plot(np.asarray(d["mean_predicted"], dtype=float), np.asarray(d["observed_rate"], dtype=float),
+             marker="o", linewidth=2, label=f"Model (Brier = {d['brier_score']:.3f})")
+    ax1.set_ylabel("Observed event rate", fontsize=12)
+    ax1.set_title(f"Calibration (Hosmer-Lemeshow p = {d['hosmer_lemeshow_p']:.3f})",
+                  fontsize=14, fontweight='bold')
+    ax1.set_xlim(0, 1)
+    ax1.set_ylim(0, 1)
+    ax1.legend(loc="upper left")
+    ax1.grid(True, alpha=0.3)
+
+    draw_histogram(ax2, d["hist_0"], alpha=0.5, label="Actual 0")
+    draw_histogram(ax2, d["hist_1"], alpha=0.5, label="Actual 1")
+    ax2.set_xlabel("Predicted probability", fontsize=12)
+    ax2.set_ylabel("Count", fontsize=12)
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+
+
+def _draw_threshold_sweep(fig, d):
+    ax1, ax2 = fig.subplots(1, 2)
+
+    ax1.plot(d["recall"], d["precision"], linewidth=2, label=f"PR (AP = {d['average_precision']:.3f})")
+    for name, marker in (("f1", "o"), ("youden", "s"), ("cost", "^")):
+        op = d["optimal"][name]
+        ax1.scatter(op["recall"], op["precision"], marker=marker, s=80, zorder=3,
+                    label=f"Best {name} (t = {op['threshold']:.3f})")
+    ax1.set_xlabel("Recall", fontsize=12)
+    ax1.set_ylabel("Precision", fontsize=12)
+    ax1.set_title("Precision-Recall Curve", fontsize=14, fontweight='bold')
+    ax1.set_xlim(0, 1)
+    ax1.set_ylim(0, 1.05)
+    ax1.legend(loc="lower left")
+    ax1.grid(True, alpha=0.3)
+
+    # The first row (threshold = inf) is dropped from the metric curves
+    for key, label in (("precision", "Precision"), ("recall", "Recall"),
+                       ("specificity", "Specificity"), ("f1", "F1"), ("youden_j", "Youden J")):
+        ax2.plot(d["threshold"][1:], d[key][1:], linewidth=2, label=label)
+    ax2.axvline(d["selected"], linestyle="--", color="black", linewidth=1.5, label=f"Threshold = {d['selected']:.3f}")
+    ax2.set_xlabel("Decision threshold", fontsize=12)
+    ax2.set_ylabel("Metric", fontsize=12)
+    ax2.set_title("Metrics by Threshold", fontsize=14, fontweight='bold')
+    ax2.legend(loc="best")
+    ax2.grid(True, alpha=0.3)
+
+
+def _draw_path(fig, d):
+    ax1, ax2 = fig.subplots(1, 2)
+    for line in d["paths"]:
+        if line["highlight"]:
+            ax1.plot(d["log_c"], line["coef"], linewidth=2, label=line["name"])
+        else:
+            ax1.plot(d["log_c"], line["coef"], color="lightgray", linewidth=1)
+    ax1.axvline(d["best_log_c"], linestyle="--", color="red", linewidth=1.5)
+    ax1.set_xlabel("log10(C)", fontsize=12)
+    ax1.set_ylabel("Coefficient", fontsize=12)
+    ax1.set_title("Coefficient Paths", fontsize=14, fontweight='bold')
+    ax1.legend(fontsize=8, loc="best")
+    ax1.grid(True, alpha=0.3)
+
+    ax2.errorbar(d["log_c"], d["cv"], yerr=d["cv_se"], fmt="o-", capsize=3)
+    ax2.axvline(d["best_log_c"], linestyle="--", color="red", linewidth=1.5, label=f"Best C = {d['best_c']:.3g}")
+    ax2.set_xlabel("log10(C)", fontsize=12)
+    ax2.set_ylabel(d["cv_label"], fontsize=12)
+    ax2.set_title("Cross-Validation Curve", fontsize=14, fontweight='bold')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
 
 
 @register
@@ -29,7 +157,14 @@ class LogisticRegressionMethod(BaseMethod):
         Args:
             df: Input dataframe
             roles: Variable roles dict with 'y' key
-            params: Method parameters (optional, supports 'max_iter', 'threshold')
+            params: Method parameters (optional, supports 'max_iter', 'threshold'
+                (a number, or 'f1' / 'youden' / 'cost' to use the optimal
+                operating point), 'cost_fp', 'cost_fn', 'calibration_bins',
+                'regularization_path', 'penalty' ('l1', 'l2', 'elasticnet'),
+                'l1_ratio', 'n_Cs', 'cv_folds', 'cv_scoring' ('deviance' or
+                'auc'), 'n_jobs', 'robust_se', 'local_case_control',
+                'pilot_size', 'lcc_scale', 'random_state',
+                'permutation_importance', 'importance_repeats', 'importance_grouped')
             out_dir: Output directory for results
 
         Returns:
@@ -49,60 +184,205 @@ class LogisticRegressionMethod(BaseMethod):
         max_iter = params.get("max_iter", 200)
         threshold = params.get("threshold", 0.5)
 
-        # Train model
-        model = train_logistic_model(X_values, y, max_iter=max_iter)
+        figures = []
+        path = None
+        lcc = None
+        if params.get("local_case_control", False):
+            # Fit on a local case-control subsample; coefficients are on the
+            # full-data scale after adding back the pilot
+            t0 = time.time()
+            lcc = local_case_control_fit(
+                X_values.astype(float), y,
+                pilot_size=int(params.get("pilot_size", 10000)),
+                scale=float(params.get("lcc_scale", 1.0)),
+                max_iter=max_iter,
+                random_state=params.get("random_state", 0)
+            )
+            lcc["fit_seconds"] = time.time() - t0
+            coefficients = lcc["coef"]
+            intercept = lcc["intercept"]
+            l2_penalty = 1.0 / lcc["model"].C
+            proba = path_probabilities(lcc, X_values)
+        elif params.get("regularization_path", False):
+            # Cross-validated path; the model at the selected C is used below
+            path = regularization_path(
+                X_values.astype(float), y,
+                penalty=params.get("penalty", "l2"),
+                l1_ratio=float(params.get("l1_ratio", 0.5)),
+                n_Cs=int(params.get("n_Cs", 20)),
+                cv=int(params.get("cv_folds", 5)),
+                scoring=params.get("cv_scoring", "deviance"),
+                n_jobs=params.get("n_jobs", -1),
+                max_iter=max_iter
+            )
+            coefficients = path["coef"]
+            intercept = path["intercept"]
+            # The path penalizes standardized coefficients: (1 / C) * scale**2 on the original scale
+            l2_penalty = path["scale"] ** 2 / path["best_C"] if params.get("penalty", "l2") == "l2" else None
+            proba = path_probabilities(path, X_values)
+        else:
+            # Train model
+            model = train_logistic_model(X_values, y, max_iter=max_iter)
+            coefficients = model.coef_[0]
+            intercept = model.intercept_[0]
+            l2_penalty = 1.0 / model.C
+
+            # Predictions
+            proba = predict_probabilities(model, X_values)
 
-        # Predictions
-        proba = predict_probabilities(model, X_values)
+        # Operating points at every distinct threshold from a single sort
+        sweep = threshold_sweep(
+            y, proba,
+            cost_fp=float(params.get("cost_fp", 1.0)),
+            cost_fn=float(params.get("cost_fn", 1.0))
+        )
+        optimal = optimal_thresholds(sweep)
+        if isinstance(threshold, str):
+            if threshold not in optimal:
+                raise ValueError("threshold 必須是數值或 'f1'、'youden'、'cost' 之一")
+            threshold = optimal[threshold]["threshold"]
 
         # Calculate metrics
         metrics = calculate_metrics(y, proba, threshold=threshold)
+        auc_ci = delong_auc(y, proba)
+        calibration = calibration_diagnostics(y, proba, n_bins=int(params.get("calibration_bins", 10)))
+
+        # Wald inference from the Hessian at the fitted solution (not valid
+        # after L1 selection, so only for ridge-type fits)
+        coef_table = None
+        inference_md = ""
+        lcc_md = ""
+        if l2_penalty is not None:
+            robust = params.get("robust_se", False)
+            if lcc is not None:
+                # Hessian on the kept rows, with the pilot as a known offset
+                sub = lcc["subsample"]
+                inference = coefficient_inference(
+                    X_values[sub].astype(float), y[sub], coefficients, intercept,
+                    l2_penalty=l2_penalty, robust=robust, offset=lcc["offset"]
+                )
+                # Efficiency relative to a full-data fit (one blocked pass)
+                full = coefficient_inference(
+                    X_values.astype(float), y, coefficients, intercept, l2_penalty=l2_penalty
+                )
+                efficiency = float(np.mean(full["se"][1:] ** 2 / inference["se"][1:] ** 2))
+                lcc["efficiency"] = efficiency
+                lcc_md = f"""
+### 局部個案對照抽樣 (Local Case-Control)
+- **先導樣本數**: {int(params.get("pilot_size", 10000))}（兩類各半，截距已校正）
+- **保留列數**: {len(sub)} / {len(y)}（{len(sub) / len(y):.2%}）
+- **配適時間**: {lcc['fit_seconds']:.2f} 秒
+- **相對效率**: {efficiency:.2%}（全資料估計變異數 / 抽樣估計變異數，係數平均）
+
+每列以 |y − p̂先導| 的機率保留，於保留樣本配適後加回先導係數，即得與全資料配適相當的係數。
+標準誤由保留樣本的 Hessian 計算（未計入先導估計的變異）。
+"""
+            else:
+                inference = coefficient_inference(
+                    X_values, y, coefficients, intercept,
+                    l2_penalty=l2_penalty, robust=robust
+                )
+            names = ["(Intercept)"] + X.columns.tolist()
+            coef_table = {
+                nm: {
+                    "coefficient": float(inference["coef"][i]),
+                    "std_err": float(inference["se"][i]),
+                    "z_value": float(inference["z"][i]),
+                    "p_value": float(inference["p"][i]),
+                    "odds_ratio": float(inference["odds_ratio"][i]),
+                    "or_ci_lower": float(inference["or_ci_lower"][i]),
+                    "or_ci_upper": float(inference["or_ci_upper"][i])
+                }
+                for i, nm in enumerate(names)
+            }
+            rows = "\n".join(
+                f"| {nm} | {c['coefficient']:.4f} | {c['std_err']:.4f} | {c['z_value']:.2f} | "
+                f"{c['p_value']:.4f} | {c['odds_ratio']:.4f} [{c['or_ci_lower']:.4f}, {c['or_ci_upper']:.4f}] |"
+                for nm, c in sorted(coef_table.items(), key=lambda x: x[1]["p_value"])[:15]
+            )
+            inference_md = f"""
+### 係數推論（{"穩健 (sandwich) 標準誤" if robust else "Fisher 資訊標準誤"}）
+| 變數 | 係數 | 標準誤 | z 值 | p 值 | 勝算比 [95% CI] |
+|------|------|--------|------|------|-----------------|
+{rows}
+"""
 
         # ROC curve
         fpr, tpr, _ = get_roc_curve_data(y, proba)
 
         # Generate ROC plot
-        fig_roc_path = os.path.join(out_dir, "roc.png")
-        plt.figure(figsize=(8, 8))
-        plt.plot(fpr, tpr, linewidth=2, label=f'ROC (AUC = {metrics["auc"]:.3f})')
-        plt.plot([0, 1], [0, 1], "--", color='gray', linewidth=2, label='Random Classifier')
-        plt.xlabel("False Positive Rate (FPR)", fontsize=12)
-        plt.ylabel("True Positive Rate (TPR)", fontsize=12)
-        plt.title("ROC Curve", fontsize=14, fontweight='bold')
-        plt.legend(loc='lower right', fontsize=11)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(fig_roc_path, dpi=300)
-        plt.close()
+        roc_keep = curve_points(len(fpr))
+        fig_roc_path = save_figure(os.path.join(out_dir, "roc.png"), _draw_roc, {
+            "fpr": fpr[roc_keep],
+            "tpr": tpr[roc_keep],
+            "auc": metrics["auc"]
+        }, figsize=(8, 8))
 
         # Generate confusion matrix plot
-        fig_cm_path = os.path.join(out_dir, "confusion_matrix.png")
         cm = [
             [metrics["true_negatives"], metrics["false_positives"]],
             [metrics["false_negatives"], metrics["true_positives"]]
         ]
+        fig_cm_path = save_figure(os.path.join(out_dir, "confusion_matrix.png"), _draw_confusion,
+                                  {"cm": cm}, figsize=(7, 6))
+        figures += [fig_roc_path, fig_cm_path]
+        figures.append(self._plot_threshold_sweep(sweep, optimal, threshold, out_dir))
+        figures.append(self._plot_calibration(calibration, proba, y, out_dir))
+        pd.DataFrame(sweep).to_csv(os.path.join(out_dir, "threshold_sweep.csv"), index=False)
+
+        op_labels = {"f1": "最大 F1", "youden": "最大 Youden J", "cost": "最小成本"}
+        op_rows = "\n".join(
+            f"| {op_labels[k]} | {v['threshold']:.4f} | {v['precision']:.4f} | {v['recall']:.4f} | "
+            f"{v['specificity']:.4f} | {v['f1']:.4f} | {v['youden_j']:.4f} | {v['cost']:.4f} |"
+            for k, v in optimal.items()
+        )
+        operating_md = f"""
+### 最佳決策閾值
+| 準則 | 閾值 | 精確率 | 召回率 | 特異度 | F1 | Youden J | 平均成本 |
+|------|------|--------|--------|--------|----|----------|----------|
+{op_rows}
+
+平均成本以每個偽陽性成本 {float(params.get("cost_fp", 1.0))}、每個偽陰性成本 {float(params.get("cost_fn", 1.0))} 計算；
+所有閾值的完整指標見 `threshold_sweep.csv`。PR 曲線下面積 (Average Precision): {average_precision(sweep):.4f}
+"""
 
-        plt.figure(figsize=(7, 6))
-        plt.imshow(cm, interpolation='nearest', cmap='Blues')
-        plt.title('Confusion Matrix', fontsize=14, fontweight='bold')
-        plt.colorbar()
-        tick_marks = [0, 1]
-        plt.xticks(tick_marks, ['Predicted 0', 'Predicted 1'])
-        plt.yticks(tick_marks, ['Actual 0', 'Actual 1'])
-
-        # Add text annotations
-        for i in range(2):
-            for j in range(2):
-                plt.text(j, i, str(cm[i][j]),
-                        ha="center", va="center",
-                        color="white" if cm[i][j] > max(max(cm)) / 2 else "black",
-                        fontsize=20, fontweight='bold')
-
-        plt.ylabel('True Label', fontsize=12)
-        plt.xlabel('Predicted Label', fontsize=12)
-        plt.tight_layout()
-        plt.savefig(fig_cm_path, dpi=300)
-        plt.close()
+        importance = None
+        importance_md = ""
+        if params.get("permutation_importance", False):
+            importance = self._permutation_importance(
+                X_values.astype(float), y, coefficients, intercept,
+                X.columns.tolist(), X_cols, params, out_dir
+            )
+            figures.append(importance["figure"])
+            rows = "\n".join(
+                f"| {r['feature']} | {r['importance_mean']:.4f} | {r['importance_std']:.4f} |"
+                for r in importance["table"][:15]
+            )
+            importance_md = f"""
+### 排列重要性 (Permutation Importance)
+以 AUC 下降量衡量（基準 AUC = {importance['baseline']:.4f}，重複 {int(params.get("importance_repeats", 5))} 次）；
+{"類別變數的所有 one-hot 欄位一起打亂" if params.get("importance_grouped", True) else "每個編碼後欄位分別打亂"}。
+
+| 變數 | AUC 下降 | 標準差 |
+|------|----------|--------|
+{rows}
+"""
+
+        path_md = ""
+        if path is not None:
+            figures.append(self._plot_path(path, X.columns.tolist(), params.get("cv_scoring", "deviance"), out_dir))
+            best = path["best_index"]
+            path_md = f"""
+### 正則化路徑（交叉驗證）
+- **懲罰項**: {params.get("penalty", "l2")}
+- **選擇準則**: {"CV deviance（最小）" if params.get("cv_scoring", "deviance") == "deviance" else "CV AUC（最大）"}
+- **最佳 C**: {path['best_C']:.4g}（共 {len(path['Cs'])} 個 C 值，{int(params.get("cv_folds", 5))} 折交叉驗證）
+- **CV deviance**: {path['cv_deviance'][best]:.4f} ± {path['cv_deviance_se'][best]:.4f}
+- **CV AUC**: {path['cv_auc'][best]:.4f} ± {path['cv_auc_se'][best]:.4f}
+- **非零係數數**: {int(path['n_nonzero'][best])} / {X.shape[1]}
+
+C 由小到大依序配適，每次以前一個解作為起始值（warm start）；各折在共用的標準化設計矩陣上平行計算。
+"""
 
         # Round metrics for display
         display_metrics = {
@@ -110,7 +390,13 @@ class LogisticRegressionMethod(BaseMethod):
             "auc": round(metrics["auc"], 4),
             "precision": round(metrics["precision"], 4),
             "recall": round(metrics["recall"], 4),
-            "f1_score": round(metrics["f1_score"], 4)
+            "f1_score": round(metrics["f1_score"], 4),
+            "auc_se": round(auc_ci["se"], 4),
+            "auc_ci_lower": round(auc_ci["ci_lower"], 4),
+            "auc_ci_upper": round(auc_ci["ci_upper"], 4),
+            "brier_score": round(calibration["brier_score"], 4),
+            "hosmer_lemeshow_stat": round(calibration["hosmer_lemeshow_stat"], 4),
+            "hosmer_lemeshow_p": round(calibration["hosmer_lemeshow_p"], 4)
         }
 
         # Generate summary
@@ -119,11 +405,16 @@ class LogisticRegressionMethod(BaseMethod):
 
 ### 模型表現
 - **準確率 (Accuracy)**: {display_metrics['accuracy']:.4f}
-- **AUC**: {display_metrics['auc']:.4f}
+- **AUC**: {display_metrics['auc']:.4f}（95% CI [{display_metrics['auc_ci_lower']:.4f}, {display_metrics['auc_ci_upper']:.4f}]，DeLong）
 - **精確率 (Precision)**: {display_metrics['precision']:.4f}
 - **召回率 (Recall)**: {display_metrics['recall']:.4f}
 - **F1 分數**: {display_metrics['f1_score']:.4f}
 
+### 校準診斷
+- **Brier 分數**: {display_metrics['brier_score']:.4f}（越低越好）
+- **Hosmer-Lemeshow 檢定**: χ² = {display_metrics['hosmer_lemeshow_stat']:.4f}（df = {calibration['hosmer_lemeshow_df']}），p = {display_metrics['hosmer_lemeshow_p']:.4f}
+- p 值小於 0.05 表示預測機率與實際發生率有顯著差異（校準不佳）
+
 ### 混淆矩陣
 |               | 預測為 0 | 預測為 1 |
 |---------------|---------|---------|
@@ -134,8 +425,8 @@ class LogisticRegressionMethod(BaseMethod):
 - **樣本數**: {len(y)}
 - **特徵數**: {X.shape[1]} (經 one-hot encoding 後)
 - **正類比例**: {sum(y) / len(y):.2%}
-- **決策閾值**: {threshold}
-
+- **決策閾值**: {threshold:.4g}
+{operating_md}{inference_md}{importance_md}{lcc_md}{path_md}
 ### 方法說明
 Logistic Regression 使用邏輯函數建立二元分類模型，輸出類別機率。
 此方法適合線性可分或接近線性可分的問題。
@@ -143,8 +434,144 @@ Logistic Regression 使用邏輯函數建立二元分類模型，輸出類別機
 
         return {
             "metrics": display_metrics,
-            "figures": [fig_roc_path, fig_cm_path],
+            "figures": figures,
             "summary_md": summary_md,
-            "model_coefficients": model.coef_[0].tolist() if hasattr(model, 'coef_') else None,
-            "feature_names": X.columns.tolist()
+            "model_coefficients": coefficients.tolist(),
+            "coefficients": coef_table,
+            "operating_points": optimal,
+            "permutation_importance": importance["table"] if importance else None,
+            "local_case_control": {
+                "n_subsample": int(len(lcc["subsample"])),
+                "subsample_fraction": float(len(lcc["subsample"]) / len(y)),
+                "efficiency": lcc.get("efficiency"),
+                "fit_seconds": lcc["fit_seconds"]
+            } if lcc is not None else None,
+            "feature_names": X.columns.tolist(),
+            "regularization_path": {
+                "Cs": path["Cs"].tolist(),
+                "cv_deviance": path["cv_deviance"].tolist(),
+                "cv_auc": path["cv_auc"].tolist(),
+                "n_nonzero": path["n_nonzero"].tolist(),
+                "best_C": path["best_C"]
+            } if path is not None else None
         }
+
+    def _permutation_importance(self, X_values, y, coefficients, intercept,
+                                encoded_names, original_names, params, out_dir):
+        """
+        Permutation importance (AUC drop) with a table and bar plot.
+
+        Args:
+            X_values: Encoded feature matrix
+            y: Binary target
+            coefficients: Fitted coefficients
+            intercept: Fitted intercept
+            encoded_names: Feature names after one-hot encoding
+            original_names: Feature names before encoding
+            params: Method parameters
+            out_dir: Output directory for results
+
+        Returns:
+            dict with table rows, baseline score and figure path
+        """
+        if params.get("importance_grouped", True):
+            groups = feature_groups(encoded_names, original_names)
+        else:
+            groups = {nm: [j] for j, nm in enumerate(encoded_names)}
+
+        table = permutation_importance(
+            lambda Z: Z @ coefficients + intercept,
+            X_values, y, roc_auc_score,
+            groups=groups,
+            n_repeats=int(params.get("importance_repeats", 5)),
+            n_jobs=params.get("n_jobs", -1),
+            random_state=params.get("random_state", 0)
+        )
+        table.to_csv(os.path.join(out_dir, "permutation_importance.csv"), index=False)
+
+        top = table.head(20).iloc[::-1]
+        fig_path = save_figure(os.path.join(out_dir, "permutation_importance.png"), _draw_importance, {
+            "feature": top["feature"],
+            "importance_mean": top["importance_mean"],
+            "importance_std": top["importance_std"]
+        }, figsize=(10, max(4, 0.4 * len(top))))
+
+        return {
+            "table": table.to_dict(orient="records"),
+            "baseline": table.attrs["baseline"],
+            "figure": fig_path
+        }
+
+    def _plot_calibration(self, calibration, proba, y, out_dir):
+        """
+        Plot the reliability curve with the distribution of predictions.
+
+        Args:
+            calibration: Output of calibration_diagnostics
+            proba: Predicted probabilities
+            y: True labels
+            out_dir: Output directory for results
+
+        Returns:
+            Figure path
+        """
+        bins = np.linspace(0, 1, 41)
+        return save_figure(os.path.join(out_dir, "calibration.png"), _draw_calibration, {
+            "mean_predicted": calibration["mean_predicted"],
+            "observed_rate": calibration["observed_rate"],
+            "brier_score": calibration["brier_score"],
+            "hosmer_lemeshow_p": calibration["hosmer_lemeshow_p"],
+            "hist_0": histogram(proba[y == 0], bins=bins),
+            "hist_1": histogram(proba[y == 1], bins=bins)
+        }, figsize=(8, 9))
+
+    def _plot_threshold_sweep(self, sweep, optimal, threshold, out_dir):
+        """
+        Plot the precision-recall curve and metrics against the threshold.
+
+        Args:
+            sweep: Output of threshold_sweep
+            optimal: Output of optimal_thresholds
+            threshold: Decision threshold in use
+            out_dir: Output directory for results
+
+        Returns:
+            Figure path
+        """
+        keep = curve_points(len(sweep["threshold"]))
+        return save_figure(os.path.join(out_dir, "threshold_sweep.png"), _draw_threshold_sweep, {
+            **{key: sweep[key][keep] for key in
+               ("threshold", "precision", "recall", "specificity", "f1", "youden_j")},
+            "average_precision": average_precision(sweep),
+            "optimal": optimal,
+            "selected": threshold
+        }, figsize=(14, 6))
+
+    def _plot_path(self, path, feature_names, scoring, out_dir):
+        """
+        Plot coefficient paths and the cross-validation curve against C.
+
+        Args:
+            path: Output of regularization_path
+            feature_names: Feature names (after one-hot encoding)
+            scoring: Selection criterion ('deviance' or 'auc')
+            out_dir: Output directory for results
+
+        Returns:
+            Figure path
+        """
+        coef_path = path["coef_path"]
+        top = np.argsort(-np.abs(coef_path[path["best_index"]]))[:10]
+        key = "cv_deviance" if scoring == "deviance" else "cv_auc"
+        return save_figure(os.path.join(out_dir, "regularization_path.png"), _draw_path, {
+            "log_c": np.log10(path["Cs"]),
+            "paths": [
+                {"name": feature_names[j], "coef": coef_path[:, j], "highlight": int(j) in top}
+                for j in range(coef_path.shape[1])
+            ],
+            "cv": path[key],
+            "cv_se": path[key + "_se"],
+            "cv_label": "CV deviance" if scoring == "deviance" else "CV AUC",
+            "best_log_c": np.log10(path["best_C"]),
+            "best_c": path["best_C"]
+        }, figsize=(14, 6))
@@ -0,0 +1,10 @@
+"""
+Nearest-Neighbour Matching Module
+
+Provides ATE estimation by propensity-score or Mahalanobis
+nearest-neighbour matching backed by a KD-tree index.
+"""
+
+from .method import NearestNeighborMatching
+
+__all__ = ['NearestNeighborMatching']
@@ -1,11 +1,48 @@
 from ..base import BaseMethod, register
+from ..plotting import save_figure, thin_points
 from .ohit import oga_hdic
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 import json
 
+def _draw_hdic(fig, d):
+    ax = fig.subplots()
+    ax.plot(range(1, len(d["hdic"]) + 1), d["hdic"], marker='o', linewidth=2)
+    ax.axvline(x=d["k_opt"], color='r', linestyle='--', label=f'Optimal k={d["k_opt"]}')
+    ax.set_xlabel("Number of Selected Variables (k)", fontsize=12)
+    ax.set_ylabel("HDIC Value", fontsize=12)
+    ax.set_title("High-Dimensional Information Criterion (HDIC)", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+def _draw_coefficients(fig, d):
+    ax = fig.subplots()
+    colors = ['red' if c < 0 else 'blue' for c in d["values"]]
+    ax.barh(d["names"], d["values"], color=colors, alpha=0.7)
+    ax.set_xlabel("Coefficient Value", fontsize=12)
+    ax.set_ylabel("Variables", fontsize=12)
+    title = d.get("title", f"Top {len(d['names'])} Selected Variables (After Trimming)")
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.axvline(x=0, color='black', linestyle='-', linewidth=0.8)
+    ax.grid(True, alpha=0.3, axis='x')
+
+def _draw_prediction(fig, d):
+    ax = fig.subplots()
+    ax.scatter(d["actual"], d["predicted"], alpha=0.5, s=30)
+
+    # 45度線
+    min_val = min(min(d["actual"]), min(d["predicted"]))
+    max_val = max(max(d["actual"]), max(d["predicted"]))
+    ax.plot([min_val, max_val], [min_val, max_val], 'r--', linewidth=2, label='Perfect Prediction')
+
+    ax.set_xlabel("Actual Values", fontsize=12)
+    ax.set_ylabel("Predicted Values", fontsize=12)
+    ax.set_title(f"Prediction vs Actual (R² = {d['r_squared']:.3f})", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
 @register
 class OGAHDICMethod(BaseMethod):
     id = "oga_hdic"
@@ -200,66 +237,31 @@ class OGAHDICMethod(BaseMethod):
         figures = []
 
         # 圖1: HDIC 曲線
-        fig_hdic_path = os.path.join(out_dir, "hdic_curve.png")
-        plt.figure(figsize=(10, 6))
-        plt.plot(range(1, Kn + 1), result["HDIC"], marker='o', linewidth=2)
-        plt.axvline(x=len(J_HDIC_names), color='r', linestyle='--', label=f'Optimal k={len(J_HDIC_names)}')
-        plt.xlabel("Number of Selected Variables (k)", fontsize=12)
-        plt.ylabel("HDIC Value", fontsize=12)
-        plt.title("High-Dimensional Information Criterion (HDIC)", fontsize=14, fontweight='bold')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(fig_hdic_path, dpi=300)
-        plt.close()
-        figures.append(fig_hdic_path)
+        figures.append(save_figure(os.path.join(out_dir, "hdic_curve.png"), _draw_hdic, {
+            "hdic": result["HDIC"],
+            "k_opt": len(J_HDIC_names)
+        }))
 
         # 圖2: 選擇的變數係數圖
         if len(coefficients) > 0:
-            fig_coef_path = os.path.join(out_dir, "coefficients.png")
-
             # 按係數絕對值排序
             coef_sorted = sorted(coefficients.items(), key=lambda x: abs(x[1]["coefficient"]), reverse=True)
             top_n = min(15, len(coef_sorted))  # 最多顯示15個
             coef_sorted = coef_sorted[:top_n]
-
-            var_names = [item[0] for item in coef_sorted]
-            coef_values = [item[1]["coefficient"] for item in coef_sorted]
-
-            plt.figure(figsize=(10, max(6, top_n * 0.4)))
-            colors = ['red' if c < 0 else 'blue' for c in coef_values]
-            plt.barh(var_names, coef_values, color=colors, alpha=0.7)
-            plt.xlabel("Coefficient Value", fontsize=12)
-            plt.ylabel("Variables", fontsize=12)
-            plt.title(f"Top {top_n} Selected Variables (After Trimming)", fontsize=14, fontweight='bold')
-            plt.axvline(x=0, color='black', linestyle='-', linewidth=0.8)
-            plt.grid(True, alpha=0.3, axis='x')
-            plt.tight_layout()
-            plt.savefig(fig_coef_path, dpi=300)
-            plt.close()
-            figures.append(fig_coef_path)
+            figures.append(save_figure(os.path.join(out_dir, "coefficients.png"), _draw_coefficients, {
+                "title": f"Top {top_n} Selected Variables (After Trimming)",
+                "names": [item[0] for item in coef_sorted],
+                "values": [item[1]["coefficient"] for item in coef_sorted]
+            }, figsize=(10, max(6, top_n * 0.4))))
 
         # 圖3: 預測值 vs 實際值
-        fig_pred_path = os.path.join(out_dir, "prediction_plot.png")
-        y_pred_trim = fit_Trim.fittedvalues
-
-        plt.figure(figsize=(8, 8))
-        plt.scatter(y, y_pred_trim, alpha=0.5, s=30)
-
-        # 45度線
-        min_val = min(y.min(), y_pred_trim.min())
-        max_val = max(y.max(), y_pred_trim.max())
-        plt.plot([min_val, max_val], [min_val, max_val], 'r--', linewidth=2, label='Perfect Prediction')
-
-        plt.xlabel("Actual Values", fontsize=12)
-        plt.ylabel("Predicted Values", fontsize=12)
-        plt.title(f"Prediction vs Actual (R² = {metrics['Trim_R_squared']:.3f})", fontsize=14, fontweight='bold')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(fig_pred_path, dpi=300)
-        plt.close()
-        figures.append(fig_pred_path)
+        y_pred_trim = np.asarray(fit_Trim.fittedvalues)
+        keep = thin_points(len(y))
+        figures.append(save_figure(os.path.join(out_dir, "prediction_plot.png"), _draw_prediction, {
+            "actual": np.asarray(y)[keep],
+            "predicted": y_pred_trim[keep],
+            "r_squared": metrics['Trim_R_squared']
+        }, figsize=(8, 8)))
 
         # 生成結果解讀
         interpretation = self._interpret_results(metrics, J_Trim_names, n, p)
@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 
+from ..base import checkpoint
+
 
 def oga_hdic(X, y, Kn=None, c1=5, HDIC_Type="HDBIC", c2=2, c3=2.01, intercept=True):
     """
@@ -117,6 +119,7 @@ def oga_hdic(X, y, Kn=None, c1=5, HDIC_Type="HDBIC", c2=2, c3=2.01, intercept=Tr
 
     # steps 2..K
     for k in range(1, K):
+        checkpoint()
         aSSE = np.abs((dX_np.T @ u).reshape(-1))
         with np.errstate(divide="ignore", invalid="ignore"):
             aSSE = np.where(zero_norm, -np.inf, aSSE / xnorms)
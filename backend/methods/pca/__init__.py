@@ -0,0 +1,10 @@
+"""
+Principal Component Analysis Module
+
+Provides randomized truncated-SVD PCA for wide dense, sparse or
+memory-mapped data.
+"""
+
+from .method import RandomizedPCAMethod
+
+__all__ = ['RandomizedPCAMethod']
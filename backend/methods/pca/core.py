@@ -0,0 +1,139 @@
+"""
+Randomized PCA Core Algorithms
+
+Truncated SVD of the centered (optionally standardized) data matrix by
+randomized range finding with power iterations (Halko, Martinsson &
+Tropp, 2011). The data are only touched through products X @ M and
+X' @ M, so the covariance matrix is never formed, sparse input is never
+densified (centering is applied implicitly), and dense or memory-mapped
+arrays are streamed in row blocks.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy import linalg
+
+
+class _CenteredOperator:
+    """
+    A = (X - 1 mean') diag(1 / scale) as a linear operator.
+
+    A @ M = X @ (M / scale) - 1 (mean / scale)' M
+    A' @ M = (X' @ M - mean (1' M)) / scale
+    """
+
+    def __init__(self, X, center=True, standardize=False, block_size=20000):
+        self.X = X
+        self.sparse = sp.issparse(X)
+        if self.sparse:
+            self.X = X.tocsr().astype(float)
+        self.block_size = block_size
+        self.n, self.p = X.shape
+        mean, var = self._column_moments()
+        self.mean = mean if center else np.zeros(self.p)
+        if not center:
+            var = var + mean ** 2
+        scale = np.sqrt(var * self.n / max(self.n - 1, 1))
+        self.constant = scale < 1e-12
+        self.scale = np.where(self.constant, 1.0, scale) if standardize else np.ones(self.p)
+        # Total variance of A (sum of its column variances)
+        col_var = var / self.scale ** 2
+        self.total_variance = float(np.sum(col_var) * self.n / max(self.n - 1, 1))
+
+    def _blocks(self):
+        for start in range(0, self.n, self.block_size):
+            stop = min(start + self.block_size, self.n)
+            yield start, stop, np.asarray(self.X[start:stop], dtype=float)
+
+    def _column_moments(self):
+        """Column means and (population) variances in one pass."""
+        if self.sparse:
+            mean = np.asarray(self.X.mean(axis=0)).ravel()
+            sq = np.asarray(self.X.multiply(self.X).mean(axis=0)).ravel()
+            return mean, np.maximum(sq - mean ** 2, 0)
+        total = np.zeros(self.p)
+        total_sq = np.zeros(self.p)
+        for _, _, B in self._blocks():
+            total += B.sum(axis=0)
+            total_sq += np.einsum("ij,ij->j", B, B)
+        mean = total / self.n
+        return mean, np.maximum(total_sq / self.n - mean ** 2, 0)
+
+    def matmul(self, M):
+        Ms = M / self.scale[:, None]
+        shift = self.mean @ Ms
+        if self.sparse:
+            return self.X @ Ms - shift
+        out = np.empty((self.n, M.shape[1]))
+        for start, stop, B in self._blocks():
+            out[start:stop] = B @ Ms - shift
+        return out
+
+    def rmatmul(self, Q):
+        if self.sparse:
+            XtQ = self.X.T @ Q
+        else:
+            XtQ = np.zeros((self.p, Q.shape[1]))
+            for start, stop, B in self._blocks():
+                XtQ += B.T @ Q[start:stop]
+        return (XtQ - np.outer(self.mean, Q.sum(axis=0))) / self.scale[:, None]
+
+
+def randomized_pca(X, n_components=10, standardize=False, oversample=10, n_iter=4,
+                   block_size=20000, random_state=0):
+    """
+    Top principal components by randomized truncated SVD.
+
+    Args:
+        X: Data matrix (n x p): numpy array, np.memmap or scipy.sparse
+        n_components: Number of components k
+        standardize: Scale columns to unit variance (correlation PCA)
+        oversample: Extra random directions beyond k
+        n_iter: Power iterations (more sharpens slowly decaying spectra)
+        block_size: Rows per block for dense / memory-mapped input
+        random_state: Seed for the test matrix
+
+    Returns:
+        dict with 'scores' (n x k), 'components' (k x p, unit rows),
+        'loadings' (p x k, components scaled by the component standard
+        deviation), 'singular_values', 'explained_variance',
+        'explained_variance_ratio', 'total_variance', 'mean' and 'scale'
+    """
+    A = _CenteredOperator(X, center=True, standardize=standardize, block_size=block_size)
+    n, p = A.n, A.p
+    k = int(n_components)
+    if not 0 < k <= min(n, p):
+        raise ValueError("主成分數必須介於 1 與 min(樣本數, 變數數) 之間")
+    ell = min(k + oversample, min(n, p))
+
+    rng = np.random.default_rng(random_state)
+    Y = A.matmul(rng.standard_normal((p, ell)))
+    Q, _ = linalg.qr(Y, mode="economic", check_finite=False)
+    for _ in range(n_iter):
+        # Re-orthonormalize each half step to keep small directions
+        Z, _ = linalg.qr(A.rmatmul(Q), mode="economic", check_finite=False)
+        Q, _ = linalg.qr(A.matmul(Z), mode="economic", check_finite=False)
+
+    # Small SVD of B = Q' A (ell x p)
+    B = A.rmatmul(Q).T
+    Ub, s, Vt = linalg.svd(B, full_matrices=False, check_finite=False)
+    U = Q @ Ub[:, :k]
+    s, Vt = s[:k], Vt[:k]
+
+    # Deterministic signs: largest-magnitude loading of each component positive
+    signs = np.sign(Vt[np.arange(k), np.abs(Vt).argmax(axis=1)])
+    signs[signs == 0] = 1
+    U, Vt = U * signs, Vt * signs[:, None]
+
+    explained = s ** 2 / max(n - 1, 1)
+    return {
+        "scores": U * s,
+        "components": Vt,
+        "loadings": Vt.T * np.sqrt(explained),
+        "singular_values": s,
+        "explained_variance": explained,
+        "explained_variance_ratio": explained / A.total_variance if A.total_variance > 0 else np.zeros(k),
+        "total_variance": A.total_variance,
+        "mean": A.mean,
+        "scale": A.scale
+    }
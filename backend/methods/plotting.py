@@ -0,0 +1,220 @@
+"""
+Figure rendering for methods.
+
+A method describes each figure as compact plot data (the arrays behind it)
+plus a module-level renderer `draw(fig, data)`, and calls save_figure().
+Inside deferred_figures() (used by the runner) nothing is drawn: the data
+and the renderer's import path are written to <out_dir>/plots/<name>.json,
+and variants (PNG at one of a few DPIs, SVG, WebP thumbnail) are rendered
+on first request by render_variant() and cached next to it. Outside that
+scope save_figure() renders the PNG immediately, as scripts expect.
+
+Every figure is drawn on its own matplotlib Figure with an Agg canvas (no
+pyplot global state), so variants can be rendered from any thread.
+"""
+
+import hashlib
+import importlib
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .base import KeyedLocks
+
+SCREEN_DPI = 100
+EXPORT_DPI = 300
+MIN_DPI, MAX_DPI = 50, 600
+# Requested DPIs snap to these, so a run caches at most this many PNGs per figure
+PNG_DPIS = (SCREEN_DPI, 200, EXPORT_DPI)
+THUMB_WIDTH = 320
+MAX_POINTS = 5000
+PLOTS_DIR = "plots"
+FIGURES_DIR = "figures"
+FORMATS = ("png", "svg", "webp")
+
+_defer_state = threading.local()
+_variant_locks = KeyedLocks()
+
+
+def to_json(value):
+    """Plain JSON value for plot data: arrays become lists and NaN / inf become None."""
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return to_json(value.tolist())
+    if hasattr(value, "tolist") and not isinstance(value, (str, bytes)):  # pandas objects, numpy scalars
+        return to_json(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def thin_points(n: int, max_points: int = MAX_POINTS, random_state: int = 0) -> np.ndarray:
+    """Sorted indices of at most `max_points` of n points, for scatter plots of large data."""
+    if n <= max_points:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(random_state).choice(n, size=max_points, replace=False))
+
+
+def curve_points(n: int, max_points: int = MAX_POINTS) -> np.ndarray:
+    """Evenly spaced indices (endpoints included) of at most `max_points` points along a curve."""
+    if n <= max_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+
+
+def histogram(values, bins=40, weights=None) -> dict:
+    """Bin counts and edges, drawn with draw_histogram() instead of shipping raw values."""
+    counts, edges = np.histogram(np.asarray(values, dtype=float), bins=bins, weights=weights)
+    return {"counts": counts, "edges": edges}
+
+
+def draw_histogram(ax, hist: dict, density: bool = False, **kwargs):
+    """Draw a histogram() result the way ax.hist would draw the raw values."""
+    edges = np.asarray(hist["edges"], dtype=float)
+    return ax.hist(edges[:-1], bins=edges, weights=np.asarray(hist["counts"], dtype=float),
+                   density=density, **kwargs)
+
+
+def _renderer_path(draw) -> str:
+    if "<locals>" in draw.__qualname__ or not draw.__module__.startswith("backend.methods."):
+        raise ValueError(f"繪圖函式必須是方法模組層級的函式: {draw.__qualname__}")
+    return f"{draw.__module__}:{draw.__qualname__}"
+
+
+def _load_renderer(path: str) -> Callable:
+    module, _, name = path.partition(":")
+    if not module.startswith("backend.methods."):
+        raise ValueError(f"不允許的繪圖函式: {path}")
+    return getattr(importlib.import_module(module), name)
+
+
+def render_figure(path: str, draw: Callable, data: dict, figsize: Tuple[float, float], dpi: float = SCREEN_DPI):
+    """Draw one figure on a fresh Figure/Agg canvas and write it to `path` (format from the extension)."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw(fig, data)
+    fig.tight_layout()
+    metadata = {"Date": None} if path.endswith(".svg") else None
+    fig.savefig(path, dpi=dpi, metadata=metadata)
+
+
+@contextmanager
+def deferred_figures():
+    """Within the block, save_figure() in this thread persists plot data instead of drawing."""
+    previous = getattr(_defer_state, "active", False)
+    _defer_state.active = True
+    try:
+        yield
+    finally:
+        _defer_state.active = previous
+
+
+def save_figure(path: str, draw: Callable, data: dict, figsize: Tuple[float, float] = (10, 6)) -> str:
+    """
+    Register a figure for `path` and return the path.
+
+    `draw(fig, data)` must be a module-level function of the method that
+    adds axes and artists to an empty Figure using only `data`, which is
+    passed through to_json() first, so it sees exactly what is persisted.
+    """
+    renderer = _renderer_path(draw)
+    data = to_json(data)
+    if not getattr(_defer_state, "active", False):
+        render_figure(path, draw, data, figsize)
+        return path
+
+    out_dir, filename = os.path.split(path)
+    spec = {
+        "name": os.path.splitext(filename)[0],
+        "renderer": renderer,
+        "figsize": list(figsize),
+        "data": data
+    }
+    os.makedirs(os.path.join(out_dir, PLOTS_DIR), exist_ok=True)
+    with open(os.path.join(out_dir, PLOTS_DIR, spec["name"] + ".json"), "w", encoding="utf-8") as f:
+        json.dump(spec, f, ensure_ascii=False, separators=(",", ":"))
+    return path
+
+
+def load_spec(out_dir: str, name: str):
+    """Persisted figure spec (name, renderer, figsize, data), or None if the run has no such figure."""
+    if os.path.basename(name) != name:
+        return None
+    try:
+        with open(os.path.join(out_dir, PLOTS_DIR, name + ".json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def spec_etag(out_dir: str, name: str, variant: str) -> str:
+    """Strong ETag of a figure variant: changes whenever its plot data or renderer does."""
+    with open(os.path.join(out_dir, PLOTS_DIR, name + ".json"), "rb") as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(variant.encode())
+    return '"' + digest.hexdigest()[:32] + '"'
+
+
+def snap_dpi(dpi: float) -> int:
+    """Nearest of PNG_DPIS to a requested DPI in [MIN_DPI, MAX_DPI] (ties go up)."""
+    if not MIN_DPI <= dpi <= MAX_DPI:
+        raise ValueError(f"dpi 必須介於 {MIN_DPI} 與 {MAX_DPI} 之間")
+    return min(PNG_DPIS, key=lambda d: (abs(d - dpi), -d))
+
+
+def variant_name(fmt: str, dpi: int = SCREEN_DPI) -> str:
+    """Cache label of a variant: png@<snapped dpi>, svg or thumb.webp."""
+    if fmt == "png":
+        return f"png@{snap_dpi(dpi)}"
+    if fmt == "webp":
+        return "thumb.webp"
+    return fmt
+
+
+def variant_path(out_dir: str, name: str, fmt: str = "png", dpi: int = SCREEN_DPI) -> str:
+    """Cache path of a figure variant (the PNG DPI is snapped to PNG_DPIS)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"不支援的圖檔格式: {fmt}")
+    if fmt == "png":
+        return os.path.join(out_dir, FIGURES_DIR, f"{name}@{snap_dpi(dpi)}.png")
+    if fmt == "webp":
+        return os.path.join(out_dir, FIGURES_DIR, f"{name}.thumb.webp")
+    return os.path.join(out_dir, FIGURES_DIR, f"{name}.svg")
+
+
+def render_variant(out_dir: str, name: str, fmt: str = "png", dpi: int = SCREEN_DPI) -> str:
+    """
+    Path of a rendered figure variant, drawing it from the persisted plot
+    data on first request.
+
+    PNG is rendered at `dpi` snapped to PNG_DPIS, SVG is vector, and WebP
+    is a thumbnail THUMB_WIDTH pixels wide. Concurrent requests for the
+    same variant render it once; files are published atomically.
+    """
+    path = variant_path(out_dir, name, fmt, dpi)
+    spec = load_spec(out_dir, name)
+    if spec is None:
+        raise FileNotFoundError(name)
+    if os.path.exists(path):
+        return path
+
+    with _variant_locks(path):
+        if not os.path.exists(path):
+            figsize = tuple(spec["figsize"])
+            render_dpi = THUMB_WIDTH / figsize[0] if fmt == "webp" else snap_dpi(dpi)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            root, ext = os.path.splitext(path)
+            tmp = f"{root}.{threading.get_ident()}.tmp{ext}"
+            render_figure(tmp, _load_renderer(spec["renderer"]), spec["data"], figsize, render_dpi)
+            os.replace(tmp, path)
+    return path
@@ -0,0 +1,11 @@
+"""
+Spatial Statistics Module
+
+Provides spatial autocorrelation analysis: KD-tree neighbour graphs,
+global and local Moran's I / Geary's C with permutation inference, and
+empirical variograms.
+"""
+
+from .method import SpatialAutocorrelationMethod
+
+__all__ = ['SpatialAutocorrelationMethod']
@@ -0,0 +1,360 @@
+"""
+Spatial Autocorrelation Core Algorithms
+
+Neighbour graphs come from a KD-tree (k nearest neighbours or a distance
+band) and are stored as sparse weights matrices. Global and local Moran's
+I and Geary's C are sparse matrix products; permutation inference
+evaluates a whole block of replicates with one sparse-dense product, and
+the empirical variogram is built from cumulative pair counts of a single
+dual-tree traversal, so no n x n distance matrix is ever formed.
+"""
+
+import warnings
+
+import numpy as np
+import scipy.sparse as sp
+from scipy import stats
+from scipy.spatial import cKDTree
+
+from ..base import checkpoint
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Upper bound on the number of floats held per block of permutations
+_BLOCK_ELEMENTS = 4_000_000
+
+
+def geographic_to_cartesian(lon, lat):
+    """
+    Longitude/latitude in degrees to 3-D points on the Earth sphere (km).
+
+    Straight-line (chord) distance is monotone in great-circle distance,
+    so nearest neighbours and distance bands carry over unchanged.
+    """
+    lon, lat = np.radians(lon), np.radians(lat)
+    return EARTH_RADIUS_KM * np.column_stack([
+        np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)
+    ])
+
+
+def chord_to_arc(d):
+    """Chord length on the Earth sphere to great-circle distance (km)."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(d / (2 * EARTH_RADIUS_KM), 1.0))
+
+
+def arc_to_chord(d):
+    """Great-circle distance (km) to chord length on the Earth sphere."""
+    return 2 * EARTH_RADIUS_KM * np.sin(np.minimum(d / (2 * EARTH_RADIUS_KM), np.pi / 2))
+
+
+def knn_weights(coords, k=8, tree=None):
+    """
+    Binary k-nearest-neighbour weights.
+
+    Args:
+        coords: Point coordinates (n x d)
+        k: Number of neighbours
+        tree: Prebuilt cKDTree on coords (optional)
+
+    Returns:
+        CSR matrix (n x n), w_ij = 1 if j is among the k nearest of i
+    """
+    n = len(coords)
+    if not 0 < k < n:
+        raise ValueError("鄰居數 k 必須介於 1 與樣本數 - 1 之間")
+    tree = tree if tree is not None else cKDTree(coords)
+    _, idx = tree.query(coords, k=k + 1)
+    # Drop each point itself (duplicates may push it out of column 0)
+    rows = np.repeat(np.arange(n), k + 1)
+    cols = idx.ravel()
+    keep = cols != rows
+    rows, cols = rows[keep], cols[keep]
+    # Points with duplicates keep k + 1 entries; trim to the k nearest
+    first = np.ones(len(rows), dtype=bool)
+    counts = np.bincount(rows, minlength=n)
+    over = np.flatnonzero(counts > k)
+    if len(over):
+        starts = np.searchsorted(rows, over)
+        first[starts + k] = False
+    W = sp.csr_matrix((np.ones(first.sum()), (rows[first], cols[first])), shape=(n, n))
+    return W
+
+
+def distance_band_weights(coords, threshold, tree=None):
+    """
+    Binary distance-band weights: w_ij = 1 if 0 < d(i, j) <= threshold.
+
+    Args:
+        coords: Point coordinates (n x d)
+        threshold: Band radius
+        tree: Prebuilt cKDTree on coords (optional)
+
+    Returns:
+        Symmetric CSR matrix (n x n)
+    """
+    n = len(coords)
+    tree = tree if tree is not None else cKDTree(coords)
+    pairs = tree.query_pairs(threshold, output_type="ndarray")
+    i, j = pairs[:, 0], pairs[:, 1]
+    W = sp.csr_matrix(
+        (np.ones(2 * len(pairs)), (np.concatenate([i, j]), np.concatenate([j, i]))),
+        shape=(n, n)
+    )
+    return W
+
+
+def row_standardize(W):
+    """Scale rows to sum to one; rows without neighbours stay zero."""
+    r = np.asarray(W.sum(axis=1)).ravel()
+    inv = np.divide(1.0, r, out=np.zeros_like(r), where=r > 0)
+    return sp.diags(inv) @ W
+
+
+def _weight_moments(W):
+    """S0, S1, S2 and row + column sums of a sparse weights matrix."""
+    W = W.tocsr()
+    S0 = W.sum()
+    S1 = 0.5 * (W + W.T).power(2).sum()
+    rc = np.asarray(W.sum(axis=1)).ravel() + np.asarray(W.sum(axis=0)).ravel()
+    S2 = np.sum(rc ** 2)
+    return float(S0), float(S1), float(S2), rc
+
+
+def _permutation_blocks(n, permutations, rng):
+    """Yield (n x b) blocks of permuted row indices."""
+    block = max(1, min(permutations, _BLOCK_ELEMENTS // max(n, 1)))
+    done = 0
+    while done < permutations:
+        checkpoint()
+        b = min(block, permutations - done)
+        yield rng.permuted(np.tile(np.arange(n), (b, 1)), axis=1).T
+        done += b
+
+
+def _pseudo_p(observed, simulated):
+    """One-sided pseudo p-value in the direction of the observed statistic."""
+    R = simulated.shape[-1]
+    larger = (simulated >= observed[..., None]).sum(axis=-1)
+    larger = np.minimum(larger, R - larger)
+    return (larger + 1) / (R + 1)
+
+
+def global_autocorrelation(z, W, permutations=999, random_state=0):
+    """
+    Global Moran's I and Geary's C with normal and permutation inference.
+
+    All permutations share the same sparse matrix; each block of
+    replicates costs one sparse-dense product W @ Z.
+
+    Args:
+        z: Attribute values (n,)
+        W: Sparse weights matrix (n x n)
+        permutations: Number of random relabelings (0 to skip)
+        random_state: Seed for the permutations
+
+    Returns:
+        dict with 'moran_I', 'moran_EI', 'moran_z', 'moran_p_norm',
+        'moran_p_sim', 'moran_sim', 'geary_C', 'geary_z', 'geary_p_norm',
+        'geary_p_sim', 'geary_sim'
+    """
+    z = np.asarray(z, dtype=float)
+    n = len(z)
+    W = W.tocsr()
+    S0, S1, S2, rc = _weight_moments(W)
+    d = z - z.mean()
+    m2 = d @ d
+
+    def statistics(D):
+        cross = np.einsum("ij,ij->j", D, W @ D)
+        I = n / S0 * cross / m2
+        # sum_ij w_ij (d_i - d_j)^2 = sum_i d_i^2 (r_i + c_i) - 2 d'Wd
+        C = (n - 1) / (2 * S0) * ((D ** 2).T @ rc - 2 * cross) / m2
+        return I, C
+
+    I, C = (v[0] for v in statistics(d[:, None]))
+
+    # Moments under the normality assumption
+    EI = -1.0 / (n - 1)
+    VI = (n * n * S1 - n * S2 + 3 * S0 * S0) / ((n * n - 1) * S0 * S0) - EI ** 2
+    VC = ((2 * S1 + S2) * (n - 1) - 4 * S0 * S0) / (2 * (n + 1) * S0 * S0)
+    zI = (I - EI) / np.sqrt(VI)
+    zC = (C - 1) / np.sqrt(VC)
+
+    out = {
+        "moran_I": float(I),
+        "moran_EI": EI,
+        "moran_z": float(zI),
+        "moran_p_norm": float(2 * stats.norm.sf(abs(zI))),
+        "geary_C": float(C),
+        "geary_z": float(zC),
+        "geary_p_norm": float(2 * stats.norm.sf(abs(zC))),
+        "moran_sim": None, "moran_p_sim": None,
+        "geary_sim": None, "geary_p_sim": None
+    }
+    if permutations:
+        rng = np.random.default_rng(random_state)
+        sims = [statistics(d[P]) for P in _permutation_blocks(n, permutations, rng)]
+        I_sim = np.concatenate([s[0] for s in sims])
+        C_sim = np.concatenate([s[1] for s in sims])
+        out.update({
+            "moran_sim": I_sim,
+            "moran_p_sim": float(_pseudo_p(np.array(I), I_sim)),
+            "geary_sim": C_sim,
+            "geary_p_sim": float(_pseudo_p(np.array(C), C_sim))
+        })
+    return out
+
+
+def _padded_weights(W):
+    """Row weights as an (n x K) array padded with zeros, and cardinalities."""
+    W = W.tocsr()
+    card = np.diff(W.indptr)
+    K = int(card.max()) if len(card) else 0
+    wts = np.zeros((W.shape[0], K))
+    wts[np.arange(K)[None, :] < card[:, None]] = W.data
+    return wts, card
+
+
+def local_autocorrelation(z, W, permutations=999, random_state=0):
+    """
+    Local Moran's I and local Geary's C with conditional permutation
+    inference.
+
+    For each observation its value is held fixed and its neighbours are
+    replaced by random draws from the other n - 1 observations. One draw
+    matrix (R x K) is shared by all observations, and a block of
+    observations is evaluated at once with fancy indexing, so there is no
+    Python loop over observations or replicates.
+
+    Args:
+        z: Attribute values (n,)
+        W: Sparse weights matrix (n x n), usually row-standardized
+        permutations: Number of conditional permutations (0 to skip)
+        random_state: Seed for the permutations
+
+    Returns:
+        dict with 'moran_Ii', 'moran_p_sim', 'geary_ci', 'geary_p_sim'
+        (arrays of length n; p-values are None without permutations),
+        'lag' (spatially lagged standardized values) and 'z'
+        (standardized values)
+    """
+    z = np.asarray(z, dtype=float)
+    n = len(z)
+    W = W.tocsr()
+    d = z - z.mean()
+    m2 = d @ d / n
+    zs = d / np.sqrt(m2)
+    lag = W @ zs
+
+    Ii = zs * lag
+    # sum_j w_ij (z_i - z_j)^2 = z_i^2 r_i - 2 z_i (Wz)_i + (W z^2)_i
+    r = np.asarray(W.sum(axis=1)).ravel()
+    ci = zs ** 2 * r - 2 * zs * lag + W @ (zs ** 2)
+
+    out = {"moran_Ii": Ii, "geary_ci": ci, "lag": lag, "z": zs,
+           "moran_p_sim": None, "geary_p_sim": None}
+    if not permutations:
+        return out
+
+    wts, card = _padded_weights(W)
+    K = wts.shape[1]
+    if K == 0:
+        return out
+    rng = np.random.default_rng(random_state)
+    # Draws from 0..n-2; index >= i is shifted by one to skip observation i
+    draws = np.stack([rng.choice(n - 1, size=K, replace=False) for _ in range(permutations)])
+
+    p_moran = np.empty(n)
+    p_geary = np.empty(n)
+    block = max(1, _BLOCK_ELEMENTS // (permutations * K))
+    for start in range(0, n, block):
+        checkpoint()
+        obs = np.arange(start, min(start + block, n))
+        idx = draws[None, :, :] + (draws[None, :, :] >= obs[:, None, None])
+        vals = zs[idx]
+        w = wts[obs]
+        I_sim = zs[obs, None] * np.einsum("brk,bk->br", vals, w)
+        C_sim = np.einsum("bk,brk->br", w, (zs[obs, None, None] - vals) ** 2)
+        p_moran[obs] = _pseudo_p(Ii[obs], I_sim)
+        p_geary[obs] = _pseudo_p(ci[obs], C_sim)
+    p_moran[card == 0] = np.nan
+    p_geary[card == 0] = np.nan
+    out["moran_p_sim"] = p_moran
+    out["geary_p_sim"] = p_geary
+    return out
+
+
+def lisa_quadrants(z, lag, p_values, alpha=0.05):
+    """
+    Moran scatterplot quadrant of each significant observation.
+
+    Returns:
+        Array of labels 'HH', 'LL', 'HL', 'LH' or 'NS' (not significant)
+    """
+    quad = np.where(z >= 0, np.where(lag >= 0, "HH", "HL"), np.where(lag >= 0, "LH", "LL"))
+    sig = np.asarray(p_values) <= alpha if p_values is not None else np.zeros(len(z), dtype=bool)
+    return np.where(sig, quad, "NS")
+
+
+def empirical_variogram(coords, z, n_bins=15, max_distance=None, tree=None,
+                        distance_transform=None, max_points=10000, random_state=0):
+    """
+    Isotropic empirical semivariogram from cumulative pair counts.
+
+    For radii r_0 < ... < r_B the tree's dual traversal returns, in one
+    pass, the number of pairs within each radius and the weighted sums
+    sum z_i^2 and sum z_i z_j over those pairs. Differencing consecutive
+    radii gives per-bin counts and sum (z_i - z_j)^2 without enumerating
+    pairs.
+
+    Args:
+        coords: Point coordinates (n x d)
+        z: Attribute values (n,)
+        n_bins: Number of distance bins
+        max_distance: Largest lag distance (default: one third of the
+            bounding-box diagonal)
+        tree: Prebuilt cKDTree on coords (optional)
+        distance_transform: Pair of callables (to_tree, from_tree) mapping
+            reported distances to tree distances and back (e.g. great-circle
+            km and chord length for geographic coordinates)
+        max_points: Above this many points a random subset is used; the
+            number of pairs within the largest lag grows quadratically
+        random_state: Seed for the subset
+
+    Returns:
+        dict with 'bin_edges', 'bin_centers', 'semivariance',
+        'pair_counts' (unordered pairs per bin) and 'n_points' (points used)
+    """
+    coords = np.asarray(coords, dtype=float)
+    z = np.asarray(z, dtype=float)
+    if max_points and len(z) > max_points:
+        keep = np.random.default_rng(random_state).choice(len(z), max_points, replace=False)
+        coords, z, tree = coords[keep], z[keep], None
+    tree = tree if tree is not None else cKDTree(coords)
+    to_tree, from_tree = distance_transform or (lambda v: v, lambda v: v)
+    if max_distance is None:
+        diag = np.linalg.norm(coords.max(axis=0) - coords.min(axis=0))
+        max_distance = from_tree(diag) / 3
+    edges = np.linspace(0, max_distance, n_bins + 1)
+    radii = to_tree(edges)
+
+    d = z - z.mean()
+    ones = np.ones(len(d))
+    count = tree.count_neighbors(tree, radii).astype(float)
+    sq = tree.count_neighbors(tree, radii, weights=(d ** 2, ones))
+    cross = tree.count_neighbors(tree, radii, weights=(d, d))
+    # Ordered pairs within radius; self pairs cancel in the differences
+    sum_sq_diff = 2 * sq - 2 * cross
+
+    pairs = np.diff(count)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = np.diff(sum_sq_diff) / (2 * pairs)
+    if (pairs == 0).any():
+        warnings.warn("Some variogram bins contain no pairs")
+    return {
+        "bin_edges": edges,
+        "bin_centers": (edges[:-1] + edges[1:]) / 2,
+        "semivariance": gamma,
+        "pair_counts": (pairs / 2).astype(np.int64),
+        "n_points": int(len(z))
+    }
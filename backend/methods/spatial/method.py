@@ -0,0 +1,304 @@
+"""
+Spatial Autocorrelation Method
+
+BaseMethod wrapper for global / local spatial autocorrelation and the
+empirical variogram of a variable observed at point locations.
+"""
+
+from ..base import BaseMethod, register
+from ..plotting import save_figure, thin_points, histogram, draw_histogram
+from .core import (
+    geographic_to_cartesian, chord_to_arc, arc_to_chord,
+    knn_weights, distance_band_weights, row_standardize,
+    global_autocorrelation, local_autocorrelation, lisa_quadrants,
+    empirical_variogram
+)
+from scipy.spatial import cKDTree
+import pandas as pd
+import numpy as np
+import re
+import os
+
+# (x pattern, y pattern, geographic)
+_COORDINATE_PATTERNS = [
+    (r"(lon|lng|long|longitude|經度)", r"(lat|latitude|緯度)", True),
+    (r"(x_?coord|coord_?x|easting|pos_?x)", r"(y_?coord|coord_?y|northing|pos_?y)", False),
+]
+
+_QUADRANT_COLORS = {"HH": "#d7191c", "LL": "#2c7bb6", "HL": "#fdae61", "LH": "#abd9e9", "NS": "lightgray"}
+
+
+def _draw_scatter(fig, d):
+    ax = fig.subplots()
+    ax.scatter(d["z"], d["lag"], c=[_QUADRANT_COLORS[q] for q in d["clusters"]], s=15, alpha=0.7)
+    lim = np.array(d["z_range"])
+    ax.plot(lim, d["slope"] * lim, color="black", linewidth=2, label=f"slope = {d['slope']:.3f}")
+    ax.axhline(0, color="gray", linewidth=0.8)
+    ax.axvline(0, color="gray", linewidth=0.8)
+    ax.set_xlabel(f"{d['y_col']} (standardized)", fontsize=12)
+    ax.set_ylabel(f"Spatial lag of {d['y_col']}", fontsize=12)
+    ax.set_title(f"Moran Scatterplot (I = {d['moran_I']:.4f})", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_map(fig, d):
+    ax = fig.subplots()
+    xy = np.asarray(d["xy"], dtype=float).reshape(-1, 2)
+    clusters = np.asarray(d["clusters"])
+    for q in ("NS", "LH", "HL", "LL", "HH"):
+        sel = clusters == q
+        if d["counts"].get(q):
+            ax.scatter(xy[sel, 0], xy[sel, 1], c=_QUADRANT_COLORS[q], s=12 if q == "NS" else 20,
+                       label=f"{q} ({d['counts'][q]})")
+    ax.set_xlabel(d["x_label"], fontsize=12)
+    ax.set_ylabel(d["y_label"], fontsize=12)
+    ax.set_title(f"Local Moran Clusters (p ≤ {d['alpha']})", fontsize=14, fontweight='bold')
+    ax.legend()
+    if not d["geographic"]:
+        ax.set_aspect("equal", adjustable="datalim")
+
+
+def _draw_permutations(fig, d):
+    ax = fig.subplots()
+    draw_histogram(ax, d["moran_sim"], color="steelblue", alpha=0.7, label="Permuted I")
+    ax.axvline(d["moran_I"], color="red", linewidth=2, label="Observed I")
+    ax.set_xlabel("Moran's I", fontsize=12)
+    ax.set_ylabel("Frequency", fontsize=12)
+    ax.set_title(f"Permutation Test ({d['permutations']} replicates)", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_variogram(fig, d):
+    ax = fig.subplots()
+    ax.plot(d["bin_centers"], np.asarray(d["semivariance"], dtype=float), "o-", color="darkgreen", linewidth=2)
+    ax.axhline(d["sample_variance"], color="gray", linestyle="--", label="Sample variance")
+    ax.set_xlabel(f"Distance ({d['unit']})" if d["unit"] else "Distance", fontsize=12)
+    ax.set_ylabel("Semivariance", fontsize=12)
+    ax.set_title("Empirical Variogram", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def _detect_coordinates(columns):
+    """Guess (x column, y column, geographic) from column names."""
+    for px, py, geo in _COORDINATE_PATTERNS:
+        cx = next((c for c in columns if re.fullmatch(px, str(c), re.I)), None)
+        cy = next((c for c in columns if re.fullmatch(py, str(c), re.I)), None)
+        if cx and cy:
+            return cx, cy, geo
+    return None, None, False
+
+
+@register
+class SpatialAutocorrelationMethod(BaseMethod):
+    id = "spatial_autocorrelation"
+    name = "Spatial Autocorrelation (Moran's I / Geary's C)"
+    requires = {"y": "continuous"}
+
+    def required_columns(self, available, roles, params):
+        y_col = roles.get("y")
+        coords = params.get("coords") or _detect_coordinates([c for c in available if c != y_col])[:2]
+        return [c for c in (y_col, *coords) if c]
+
+    def run(self, df: pd.DataFrame, roles: dict, params: dict, out_dir: str):
+        """
+        Execute spatial autocorrelation analysis.
+
+        Args:
+            df: Input dataframe, one row per location
+            roles: Variable roles dict with 'y' key (the attribute analysed)
+            params: Method parameters (optional, supports 'coords' ([x, y]
+                columns; detected from names such as lon/lat if omitted),
+                'geographic' (treat coords as lon/lat degrees), 'weights'
+                ('knn' or 'distance'), 'k', 'threshold' (band radius, km for
+                geographic coordinates), 'row_standardize', 'permutations',
+                'alpha', 'variogram_bins', 'max_distance')
+            out_dir: Output directory for results
+
+        Returns:
+            dict with metrics, figures, summary and local_clusters
+        """
+        y_col = roles.get("y")
+        if y_col is None:
+            raise ValueError("roles.y 未指定")
+
+        coords_cols = params.get("coords")
+        if coords_cols:
+            cx, cy = coords_cols
+            geographic = bool(params.get("geographic", False))
+        else:
+            cx, cy, geographic = _detect_coordinates([c for c in df.columns if c != y_col])
+            geographic = bool(params.get("geographic", geographic))
+        if cx is None:
+            raise ValueError("找不到座標欄位；請以 params.coords 指定 [x, y]（或 [經度, 緯度]）欄位")
+
+        data = df.dropna(subset=[cx, cy, y_col])
+        z = data[y_col].astype(float).values
+        xy = data[[cx, cy]].astype(float).values
+        n = len(z)
+        if n < 10:
+            raise ValueError("空間自相關分析至少需要 10 個位置")
+
+        if geographic:
+            points = geographic_to_cartesian(xy[:, 0], xy[:, 1])
+            transform = (arc_to_chord, chord_to_arc)
+            unit = "km"
+        else:
+            points = xy
+            transform = None
+            unit = ""
+        tree = cKDTree(points)
+
+        # Neighbour graph
+        scheme = params.get("weights", "knn")
+        if scheme == "knn":
+            k = int(params.get("k", min(8, n - 1)))
+            W = knn_weights(points, k, tree=tree)
+            scheme_md = f"k 最近鄰（k = {k}）"
+        elif scheme == "distance":
+            if params.get("threshold") is None:
+                # Smallest band that gives every location at least one neighbour
+                dist, _ = tree.query(points, k=2)
+                threshold = float(dist[:, 1].max())
+                threshold = chord_to_arc(threshold) if geographic else threshold
+            else:
+                threshold = float(params["threshold"])
+            W = distance_band_weights(points, arc_to_chord(threshold) if geographic else threshold, tree=tree)
+            scheme_md = f"距離帶（半徑 {threshold:.4g}{unit}）"
+        else:
+            raise ValueError("weights 必須是 'knn' 或 'distance'")
+
+        cardinality = np.diff(W.indptr)
+        n_islands = int((cardinality == 0).sum())
+        standardized = bool(params.get("row_standardize", True))
+        if standardized:
+            W = row_standardize(W)
+
+        permutations = int(params.get("permutations", 999))
+        alpha = float(params.get("alpha", 0.05))
+        glob = global_autocorrelation(z, W, permutations)
+        local = local_autocorrelation(z, W, permutations)
+        local_p = local["moran_p_sim"]
+        clusters = lisa_quadrants(local["z"], local["lag"], local_p, alpha)
+        cluster_counts = {q: int((clusters == q).sum()) for q in ("HH", "LL", "HL", "LH", "NS")}
+
+        vario = empirical_variogram(
+            points, z,
+            n_bins=int(params.get("variogram_bins", 15)),
+            max_distance=params.get("max_distance"),
+            tree=tree if n <= 10000 else None,
+            distance_transform=transform
+        )
+
+        figures = []
+
+        # Moran scatterplot (slope and range from all points, markers thinned)
+        keep = thin_points(n)
+        figures.append(save_figure(os.path.join(out_dir, "moran_scatter.png"), _draw_scatter, {
+            "z": local["z"][keep],
+            "lag": local["lag"][keep],
+            "clusters": clusters[keep],
+            "z_range": [local["z"].min(), local["z"].max()],
+            "slope": np.polyfit(local["z"], local["lag"], 1)[0],
+            "y_col": y_col,
+            "moran_I": glob["moran_I"]
+        }, figsize=(8, 8)))
+
+        # LISA cluster map
+        figures.append(save_figure(os.path.join(out_dir, "lisa_clusters.png"), _draw_map, {
+            "xy": xy[keep],
+            "clusters": clusters[keep],
+            "counts": {q: int((clusters == q).sum()) for q in _QUADRANT_COLORS},
+            "x_label": cx,
+            "y_label": cy,
+            "alpha": alpha,
+            "geographic": geographic
+        }, figsize=(9, 8)))
+
+        # Permutation reference distribution
+        if glob["moran_sim"] is not None:
+            figures.append(save_figure(os.path.join(out_dir, "moran_permutations.png"), _draw_permutations, {
+                "moran_sim": histogram(glob["moran_sim"], bins=50),
+                "moran_I": glob["moran_I"],
+                "permutations": permutations
+            }, figsize=(10, 5)))
+
+        # Empirical variogram
+        figures.append(save_figure(os.path.join(out_dir, "variogram.png"), _draw_variogram, {
+            "bin_centers": vario["bin_centers"],
+            "semivariance": vario["semivariance"],
+            "sample_variance": np.var(z, ddof=1),
+            "unit": unit
+        }))
+
+        metrics = {
+            "num_locations": int(n),
+            "weights": scheme,
+            "row_standardized": standardized,
+            "mean_neighbors": round(float(cardinality.mean()), 2),
+            "num_islands": n_islands,
+            "morans_I": round(glob["moran_I"], 6),
+            "morans_I_expected": round(glob["moran_EI"], 6),
+            "morans_I_z": round(glob["moran_z"], 4),
+            "morans_I_p_norm": round(glob["moran_p_norm"], 6),
+            "morans_I_p_sim": glob["moran_p_sim"],
+            "gearys_C": round(glob["geary_C"], 6),
+            "gearys_C_z": round(glob["geary_z"], 4),
+            "gearys_C_p_norm": round(glob["geary_p_norm"], 6),
+            "gearys_C_p_sim": glob["geary_p_sim"],
+            "permutations": permutations,
+            "hotspots_HH": cluster_counts["HH"],
+            "coldspots_LL": cluster_counts["LL"],
+            "spatial_outliers": cluster_counts["HL"] + cluster_counts["LH"],
+            "variogram_points": vario["n_points"]
+        }
+
+        local_geary_sig = int((local["geary_p_sim"] <= alpha).sum()) if local["geary_p_sim"] is not None else 0
+        direction = "正（相近位置數值相似，呈聚集）" if glob["moran_I"] > glob["moran_EI"] else "負（相近位置數值相異，呈分散）"
+        p_sim_md = f"，排列檢定 p = {glob['moran_p_sim']:.4f}" if glob["moran_p_sim"] is not None else ""
+        c_sim_md = f"，排列檢定 p = {glob['geary_p_sim']:.4f}" if glob["geary_p_sim"] is not None else ""
+        island_md = f"\n- **無鄰居的位置**: {n_islands}（不參與局部檢定）" if n_islands else ""
+
+        summary_md = f"""
+## 空間自相關分析結果
+
+### 空間權重
+- **位置數**: {n}
+- **座標欄位**: {cx}, {cy}（{"經緯度，以球面距離計算" if geographic else "平面座標"}）
+- **鄰居定義**: {scheme_md}，{"列標準化" if standardized else "二元權重"}
+- **平均鄰居數**: {metrics['mean_neighbors']}{island_md}
+
+### 全域空間自相關
+- **Moran's I**: {glob['moran_I']:.4f}（期望值 {glob['moran_EI']:.4f}；z = {glob['moran_z']:.3f}，常態近似 p = {glob['moran_p_norm']:.4f}{p_sim_md}）
+- **Geary's C**: {glob['geary_C']:.4f}（期望值 1；z = {glob['geary_z']:.3f}，常態近似 p = {glob['geary_p_norm']:.4f}{c_sim_md}）
+- **自相關方向**: {direction}
+
+### 局部空間自相關（LISA，p ≤ {alpha}）
+| 類型 | 說明 | 位置數 |
+|------|------|--------|
+| HH | 高值被高值包圍（熱點） | {cluster_counts['HH']} |
+| LL | 低值被低值包圍（冷點） | {cluster_counts['LL']} |
+| HL | 高值被低值包圍（離群） | {cluster_counts['HL']} |
+| LH | 低值被高值包圍（離群） | {cluster_counts['LH']} |
+
+- **局部 Geary's C 顯著位置數**: {local_geary_sig}
+
+### 方法說明
+鄰居關係以 KD 樹查詢建立並存為稀疏權重矩陣，不形成 n × n 距離矩陣。全域排列檢定以一次稀疏矩陣乘法同時計算一整批排列；
+局部檢定採條件排列（固定該位置的值、隨機抽換其鄰居），所有位置共用同一組抽樣並以向量化索引計算。
+變異圖 (variogram) 由樹的累積配對計數差分得到各距離區間的配對數與平方差總和{f"（使用 {vario['n_points']} 個隨機抽樣位置）" if vario['n_points'] < n else ""}。
+局部檢定同時進行多個位置的檢定，顯著結果應視為探索性。
+"""
+
+        return {
+            "metrics": metrics,
+            "figures": figures,
+            "summary_md": summary_md,
+            "local_clusters": {
+                "cluster": clusters.tolist(),
+                "local_moran": local["moran_Ii"].tolist(),
+                "local_moran_p": [None if np.isnan(v) else float(v) for v in local_p] if local_p is not None else None
+            }
+        }
@@ -0,0 +1,10 @@
+"""
+Survival Analysis Module
+
+Provides Kaplan-Meier curves, the log-rank test and Cox proportional
+hazards regression (Breslow or Efron ties) for time-to-event data.
+"""
+
+from .method import SurvivalCoxKMMethod
+
+__all__ = ['SurvivalCoxKMMethod']
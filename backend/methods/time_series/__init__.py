@@ -0,0 +1,10 @@
+"""
+Time Series Module
+
+Provides autoregressive and lagged-regression forecasting models with
+ACF/PACF diagnostics and rolling-origin backtests.
+"""
+
+from .method import TimeSeriesARMethod
+
+__all__ = ['TimeSeriesARMethod']
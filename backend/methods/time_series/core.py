@@ -0,0 +1,222 @@
+"""
+Time Series Core Algorithms
+
+Autoregressive and lagged-regression models. Lag matrices are strided
+views of the series (no copies), ACF/PACF come from one FFT plus a
+Durbin-Levinson recursion, and rolling-origin backtests update the fitted
+coefficients by recursive least squares (one rank-one update, and a
+downdate for fixed windows, per origin) instead of refitting per window.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import linalg, stats
+
+from ..base import checkpoint
+
+
+def lag_matrix(x, p):
+    """
+    Lagged copies of x as a read-only strided view.
+
+    Args:
+        x: Series (n,) or (n, m)
+        p: Number of lags
+
+    Returns:
+        View of shape (n - p, p + 1) (or (n - p, m, p + 1) for 2-D x);
+        column k holds x[t - k] for t = p .. n - 1
+    """
+    x = np.asarray(x, dtype=float)
+    return sliding_window_view(x, p + 1, axis=0)[..., ::-1]
+
+
+def acf(x, nlags):
+    """
+    Sample autocorrelation up to nlags, via FFT in O(n log n).
+
+    Args:
+        x: Series (n,)
+        nlags: Largest lag
+
+    Returns:
+        Array (nlags + 1,) starting with 1 at lag 0
+    """
+    x = np.asarray(x, dtype=float)
+    x = x - x.mean()
+    n = len(x)
+    # Zero-pad to avoid circular wrap-around
+    size = 1 << int(np.ceil(np.log2(2 * n - 1)))
+    f = np.fft.rfft(x, size)
+    acov = np.fft.irfft(f * np.conjugate(f), size)[:nlags + 1]
+    return acov / acov[0]
+
+
+def pacf(rho):
+    """
+    Partial autocorrelation from an autocorrelation sequence.
+
+    Durbin-Levinson recursion, O(nlags^2).
+
+    Args:
+        rho: Autocorrelations (nlags + 1,) starting with lag 0
+
+    Returns:
+        Array (nlags + 1,) starting with 1 at lag 0
+    """
+    nlags = len(rho) - 1
+    out = np.ones(nlags + 1)
+    phi = np.zeros(0)
+    for k in range(1, nlags + 1):
+        denom = 1 - phi @ rho[1:k]
+        a = (rho[k] - phi @ rho[k - 1:0:-1]) / denom if denom > 0 else 0.0
+        phi = np.append(phi - a * phi[::-1], a)
+        out[k] = a
+    return out
+
+
+def ljung_box(rho, n, lags, dof=0):
+    """Ljung-Box Q statistic and p-value from residual autocorrelations."""
+    k = np.arange(1, lags + 1)
+    q = n * (n + 2) * np.sum(rho[1:lags + 1] ** 2 / (n - k))
+    df = max(lags - dof, 1)
+    return float(q), float(stats.chi2.sf(q, df))
+
+
+def lagged_design(y, p, exog=None, exog_lags=1):
+    """
+    Target and regressors for an AR(p) model with optional lagged exogenous
+    variables.
+
+    Args:
+        y: Series (n,)
+        p: Autoregressive lags
+        exog: Exogenous series (n, m), optional
+        exog_lags: Lags 1..exog_lags of every exogenous series
+
+    Returns:
+        Tuple of (target (n - L,), design (n - L, 1 + p + m * exog_lags),
+        L) where L = max(p, exog_lags) is the number of rows lost; column 0
+        is the intercept
+    """
+    L = max(p, exog_lags if exog is not None else 0)
+    Y = lag_matrix(y, L)
+    blocks = [np.ones((len(Y), 1)), Y[:, 1:p + 1]]
+    if exog is not None:
+        Z = lag_matrix(np.asarray(exog, dtype=float).reshape(len(y), -1), L)
+        blocks.append(Z[:, :, 1:exog_lags + 1].reshape(len(Y), -1))
+    return Y[:, 0], np.hstack(blocks), L
+
+
+def ols(target, X):
+    """Least-squares fit with information criteria."""
+    beta, _, rank, _ = linalg.lstsq(X, target, check_finite=False)
+    resid = target - X @ beta
+    n, k = X.shape
+    sigma2 = resid @ resid / n
+    tss = np.sum((target - target.mean()) ** 2)
+    return {
+        "coef": beta,
+        "resid": resid,
+        "sigma2": sigma2,
+        "r_squared": 1 - resid @ resid / tss if tss > 0 else 0.0,
+        "aic": n * np.log(sigma2) + 2 * k,
+        "bic": n * np.log(sigma2) + k * np.log(n),
+        "rank": int(rank)
+    }
+
+
+def select_order(y, max_lag, exog=None, exog_lags=1, criterion="bic"):
+    """
+    AR order minimizing AIC or BIC, all orders fitted on a common sample.
+
+    Returns:
+        Tuple of (best order, dict order -> criterion value)
+    """
+    target, X_full, _ = lagged_design(y, max_lag, exog, exog_lags)
+    exog_cols = X_full[:, 1 + max_lag:]
+    scores = {}
+    for p in range(1, max_lag + 1):
+        X = np.hstack([X_full[:, :1 + p], exog_cols])
+        scores[p] = float(ols(target, X)[criterion])
+    return min(scores, key=scores.get), scores
+
+
+def rls_backtest(target, X, initial, window=None, forgetting=1.0, refresh=1000):
+    """
+    Rolling-origin one-step-ahead backtest with recursive least squares.
+
+    The model is fitted once on the first `initial` rows; at every later
+    origin the row is forecast with the current coefficients, then folded
+    in with a Sherman-Morrison update (and, for a fixed window, the row
+    leaving the window is removed with a downdate), costing O(k^2) per
+    origin instead of a full refit.
+
+    Args:
+        target: Response (n,)
+        X: Regressors (n, k)
+        initial: Rows in the first estimation window
+        window: Fixed window length (None = expanding window)
+        forgetting: Exponential forgetting factor in (0, 1]; 1 = none
+        refresh: Re-solve from scratch every this many origins to bound
+            rounding drift of the recursive inverse (fixed windows only)
+
+    Returns:
+        dict with 'origins' (row indices forecast), 'forecast', 'actual',
+        'error' and 'coef_path' (coefficients used at each origin)
+    """
+    n, k = X.shape
+    if initial < k + 1 or initial >= n:
+        raise ValueError("初始估計視窗需大於參數個數且小於樣本數")
+    if window is not None and window < initial:
+        raise ValueError("固定視窗長度不可小於初始估計視窗")
+    if not 0 < forgetting <= 1:
+        raise ValueError("遺忘因子必須介於 0（不含）與 1 之間")
+    if window is not None and forgetting != 1:
+        raise ValueError("固定視窗與遺忘因子不可同時使用")
+
+    def exact(start, stop):
+        Xw, yw = X[start:stop], target[start:stop]
+        P = linalg.pinvh(Xw.T @ Xw)
+        return P @ (Xw.T @ yw), P
+
+    start = max(initial - window, 0) if window is not None else 0
+    beta, P = exact(start, initial)
+
+    origins = np.arange(initial, n)
+    forecast = np.empty(len(origins))
+    coef_path = np.empty((len(origins), k))
+    for i, t in enumerate(origins):
+        if i % 1000 == 0:
+            checkpoint()
+        x = X[t]
+        coef_path[i] = beta
+        forecast[i] = x @ beta
+
+        # Update with the new row
+        Px = P @ x
+        gain = Px / (forgetting + x @ Px)
+        beta = beta + gain * (target[t] - forecast[i])
+        P = (P - np.outer(gain, Px)) / forgetting
+
+        if window is not None and t + 1 - start > window:
+            if (i + 1) % refresh == 0:
+                start = t + 1 - window
+                beta, P = exact(start, t + 1)
+                continue
+            # Downdate: remove the oldest row from the window
+            x_old = X[start]
+            Px = P @ x_old
+            gain = Px / (x_old @ Px - 1)
+            beta = beta + gain * (target[start] - x_old @ beta)
+            P = P - np.outer(gain, Px)
+            start += 1
+
+    actual = target[origins]
+    return {
+        "origins": origins,
+        "forecast": forecast,
+        "actual": actual,
+        "error": actual - forecast,
+        "coef_path": coef_path
+    }
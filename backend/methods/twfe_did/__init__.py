@@ -0,0 +1,10 @@
+"""
+Panel Difference-in-Differences Module
+
+Provides two-way fixed-effects (unit and time) DiD estimation for panel
+data with cluster-robust inference.
+"""
+
+from .method import TwoWayFixedEffectsDiD
+
+__all__ = ['TwoWayFixedEffectsDiD']
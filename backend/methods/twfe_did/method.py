@@ -0,0 +1,207 @@
+"""
+Two-Way Fixed-Effects DiD Method
+
+BaseMethod wrapper for panel difference-in-differences with absorbed unit
+and time effects.
+"""
+
+from ..base import BaseMethod, register
+from ..plotting import save_figure
+from .core import drop_singletons, twfe_regression
+import pandas as pd
+import numpy as np
+import os
+
+
+def _draw_trends(fig, d):
+    ax = fig.subplots()
+    n_periods = len(d["time_levels"])
+    for line in d["groups"]:
+        ax.plot(range(n_periods), np.asarray(line["mean"], dtype=float), marker="o", linewidth=2, label=line["label"])
+    step = max(1, n_periods // 15)
+    ax.set_xticks(range(0, n_periods, step))
+    ax.set_xticklabels(d["time_levels"][::step], rotation=45)
+    ax.set_xlabel("Time", fontsize=12)
+    ax.set_ylabel(f"Mean {d['y_col']}", fontsize=12)
+    ax.set_title("Outcome Trends by Treatment Group", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_coefficients(fig, d):
+    ax = fig.subplots()
+    coef, lower, upper = (np.asarray(d[key], dtype=float) for key in ("coefficient", "ci_lower", "ci_upper"))
+    for i, nm in enumerate(d["names"]):
+        color = "red" if nm == "treatment" else "steelblue"
+        ax.errorbar(coef[i], i, xerr=[[coef[i] - lower[i]], [upper[i] - coef[i]]], fmt="o", color=color, capsize=4)
+    ax.set_yticks(range(len(d["names"])))
+    ax.set_yticklabels(d["names"])
+    ax.axvline(0, color="black", linewidth=0.8)
+    ax.set_xlabel("Coefficient (95% CI, clustered by unit)", fontsize=12)
+    ax.set_title("Two-Way Fixed Effects Estimates", fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='x')
+
+
+@register
+class TwoWayFixedEffectsDiD(BaseMethod):
+    id = "twfe_did"
+    name = "Panel DiD (Two-Way Fixed Effects)"
+    requires = {"treatment": "binary", "y": "continuous", "id": "any", "time": "any"}
+
+    def required_columns(self, available, roles, params):
+        # Without an explicit covariate list every column is a covariate
+        if params.get("covariates") is None:
+            return None
+        keys = [roles.get(r) for r in ("y", "treatment", "id", "time")] + [params.get("post")]
+        return [c for c in keys if c] + list(params["covariates"])
+
+    def run(self, df: pd.DataFrame, roles: dict, params: dict, out_dir: str):
+        """
+        Execute two-way fixed-effects difference-in-differences.
+
+        Args:
+            df: Input dataframe in long format (one row per unit-period)
+            roles: Variable roles dict with 'y', 'treatment', 'id', 'time' keys.
+                The treatment column is the unit-period treatment indicator
+                (treated x post), unless params['post'] is given.
+            params: Method parameters (optional, supports 'post' (column of
+                post-period indicator), 'covariates' (list of columns), 'tol')
+            out_dir: Output directory for results
+
+        Returns:
+            dict with metrics, figures, and summary
+        """
+        y_col = roles.get("y")
+        t_col = roles.get("treatment")
+        id_col = roles.get("id")
+        time_col = roles.get("time")
+
+        if not (y_col and t_col and id_col and time_col):
+            raise ValueError("面板 DiD 需要 roles.y、roles.treatment、roles.id 與 roles.time")
+
+        post_col = params.get("post")
+        used = {y_col, t_col, id_col, time_col} | ({post_col} if post_col else set())
+        # Default covariates: numeric columns only, so ID-like strings are not one-hot encoded
+        covs = params.get("covariates", [
+            c for c in df.columns if c not in used and pd.api.types.is_numeric_dtype(df[c])
+        ])
+
+        # Prepare data
+        data = df.dropna(subset=list(used))
+        D = data[t_col].astype(float).values
+        if post_col:
+            D = D * data[post_col].astype(float).values
+        Y = data[y_col].astype(float).values
+        unit = pd.factorize(data[id_col])[0]
+        time_codes, time_levels = pd.factorize(data[time_col], sort=True)
+        cov_df = pd.get_dummies(data[covs], drop_first=True).fillna(0).astype(float) if covs \
+            else pd.DataFrame(index=data.index)
+
+        # Drop singleton units and re-index groups
+        keep = drop_singletons(unit)
+        n_singletons = int((~keep).sum())
+        Y, D = Y[keep], D[keep]
+        unit = pd.factorize(unit[keep])[0]
+        # Periods observed only in singleton units disappear with them
+        time_codes, time_levels = pd.factorize(time_levels[time_codes[keep]], sort=True)
+        cov_values = cov_df.values[keep]
+
+        X = np.column_stack([D, cov_values])
+        names = ["treatment"] + cov_df.columns.tolist()
+        result = twfe_regression(Y, X, unit, time_codes, tol=float(params.get("tol", 1e-10)))
+
+        if not result["kept_columns"][0]:
+            raise ValueError(
+                "處置變數在控制個體與時間固定效果後沒有變異；"
+                "請提供 處置×事後 指標，或以 params.post 指定事後期間欄位"
+            )
+
+        kept_names = [nm for nm, k in zip(names, result["kept_columns"]) if k]
+        absorbed = [nm for nm, k in zip(names, result["kept_columns"]) if not k]
+        coefficients = {
+            nm: {
+                "coefficient": float(result["coef"][i]),
+                "std_err": float(result["se"][i]),
+                "t_value": float(result["t"][i]),
+                "p_value": float(result["p"][i]),
+                "ci_lower": float(result["ci_lower"][i]),
+                "ci_upper": float(result["ci_upper"][i])
+            }
+            for i, nm in enumerate(kept_names)
+        }
+        did = coefficients["treatment"]
+
+        figures = []
+
+        # Outcome trends: ever-treated vs never-treated units
+        ever_treated = (np.bincount(unit, weights=D) > 0)[unit]
+        n_periods = len(time_levels)
+
+        groups = []
+        for flag, label in ((True, "Ever treated"), (False, "Never treated")):
+            sel = ever_treated == flag
+            if sel.any():
+                sums = np.bincount(time_codes[sel], weights=Y[sel], minlength=n_periods)
+                cnts = np.bincount(time_codes[sel], minlength=n_periods)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    groups.append({"label": label, "mean": sums / cnts})
+        figures.append(save_figure(os.path.join(out_dir, "did_trends.png"), _draw_trends, {
+            "groups": groups,
+            "time_levels": [str(v) for v in time_levels],
+            "y_col": y_col
+        }))
+
+        # Coefficient plot with cluster-robust CIs
+        coef_sorted = sorted(coefficients.items(), key=lambda x: abs(x[1]["t_value"]), reverse=True)[:15]
+        figures.append(save_figure(os.path.join(out_dir, "twfe_coefficients.png"), _draw_coefficients, {
+            "names": [nm for nm, _ in coef_sorted],
+            **{key: [c[key] for _, c in coef_sorted] for key in ("coefficient", "ci_lower", "ci_upper")}
+        }, figsize=(10, max(4, len(coef_sorted) * 0.45))))
+
+        metrics = {
+            "DiD_ATT": round(did["coefficient"], 6),
+            "SE_cluster": round(did["std_err"], 6),
+            "CI95_lower": round(did["ci_lower"], 6),
+            "CI95_upper": round(did["ci_upper"], 6),
+            "p_value": round(did["p_value"], 6),
+            "num_observations": int(len(Y)),
+            "num_units": int(result["n_clusters"]),
+            "num_periods": int(n_periods),
+            "num_singletons_dropped": n_singletons,
+            "num_covariates": len(kept_names) - 1,
+            "within_R_squared": round(result["within_r2"], 4),
+            "demeaning_sweeps": int(result["sweeps"])
+        }
+
+        absorbed_md = f"\n- **被固定效果吸收或共線而移除的共變數**: {', '.join(absorbed)}" if absorbed else ""
+
+        summary_md = f"""
+## 面板差異中的差異 (TWFE DiD) 估計結果
+
+### 處置效應估計
+- **DiD 估計值 (ATT)**: {metrics['DiD_ATT']:.4f}
+- **群聚穩健標準誤 (依個體)**: {metrics['SE_cluster']:.4f}
+- **95% 信賴區間**: [{metrics['CI95_lower']:.4f}, {metrics['CI95_upper']:.4f}]
+- **p 值**: {metrics['p_value']:.4f}
+
+### 資料概況
+- **觀測值 (個體-期間)**: {metrics['num_observations']}
+- **個體數**: {metrics['num_units']}
+- **期間數**: {metrics['num_periods']}
+- **移除的單一觀測個體**: {metrics['num_singletons_dropped']}
+- **控制共變數數**: {metrics['num_covariates']}{absorbed_md}
+- **組內 R²**: {metrics['within_R_squared']:.4f}
+
+### 方法說明
+以個體與時間雙向固定效果模型估計處置效應；固定效果以交替投影（反覆去除個體與時間平均）吸收，
+不建立虛擬變數矩陣，記憶體用量與觀測值數成正比。標準誤依個體群聚，允許同一個體跨期間相關。
+識別仰賴平行趨勢假設，請檢視趨勢圖中處置前兩組走勢是否平行。
+若處置時點交錯且效果隨時間異質，TWFE 估計值可能偏誤。
+"""
+
+        return {
+            "metrics": metrics,
+            "figures": figures,
+            "summary_md": summary_md,
+            "coefficients": coefficients
+        }
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException
+from backend.services import datasets
+
+router = APIRouter(tags=["datasets"])
+
+@router.get("/datasets")
+def list_datasets_endpoint():
+    """列出已登錄的資料集（不含欄位剖析）"""
+    return datasets.list_datasets()
+
+@router.get("/datasets/{dataset_id}")
+def dataset_endpoint(dataset_id: str):
+    """單一資料集的中繼資料：原始檔名、列數、schema、欄位剖析與預覽"""
+    meta = datasets.get(dataset_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail=f"找不到資料集: {dataset_id}")
+    return meta
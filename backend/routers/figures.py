@@ -0,0 +1,55 @@
+import os
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+from backend.methods.plotting import SCREEN_DPI, load_spec, render_variant, spec_etag, variant_name, variant_path
+from backend.services import run_cache
+
+router = APIRouter(tags=["figures"])
+
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml", "webp": "image/webp"}
+CACHE_CONTROL = "public, max-age=86400"
+
+def _run_dir(run_id: str, name: str) -> str:
+    out_dir = os.path.join(run_cache.RUNS_DIR, run_id)
+    if os.path.basename(run_id) != run_id or load_spec(out_dir, name) is None:
+        raise HTTPException(status_code=404, detail=f"找不到圖表: {run_id}/{name}")
+    return out_dir
+
+def _not_modified(request: Request, etag: str) -> bool:
+    tags = request.headers.get("if-none-match", "")
+    return etag in [t.strip() for t in tags.split(",")] or tags.strip() == "*"
+
+@router.get("/runs/{run_id}/figures/{filename}")
+def figure_endpoint(run_id: str, filename: str, request: Request, dpi: int = SCREEN_DPI):
+    """
+    圖檔：{name}.png（可指定 ?dpi=，取最接近的 100/200/300）、{name}.svg 或 {name}.webp（縮圖）
+    首次請求時由儲存的繪圖資料產生並快取，並重新計算該次執行的快取大小；ETag 相符時回傳 304
+    """
+    name, ext = os.path.splitext(filename)
+    fmt = ext.lstrip(".")
+    if fmt not in MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail=f"不支援的圖檔格式: {fmt}")
+    out_dir = _run_dir(run_id, name)
+    try:
+        cached = os.path.exists(variant_path(out_dir, name, fmt, dpi))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    etag = spec_etag(out_dir, name, variant_name(fmt, dpi))
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    path = render_variant(out_dir, name, fmt, dpi)
+    if not cached:
+        run_cache.update_size(run_id)
+    return FileResponse(path, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+@router.get("/runs/{run_id}/plots/{name}")
+def plot_data_endpoint(run_id: str, name: str, request: Request):
+    """圖表背後的繪圖資料（JSON），供前端自行繪製互動式圖表"""
+    out_dir = _run_dir(run_id, name)
+    etag = spec_etag(out_dir, name, "data")
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    spec = load_spec(out_dir, name)
+    return JSONResponse({k: spec[k] for k in ("name", "figsize", "data")}, headers=headers)
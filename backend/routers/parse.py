@@ -3,9 +3,15 @@ from backend.services.parser import parse_question_and_csv
 
 router = APIRouter(tags=["parse"])
 
+# Plain def: the chunked disk I/O runs in the threadpool, not on the event loop
 @router.post("/parse")
-async def parse_endpoint(
+def parse_endpoint(
     question: str = Form(...),
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    exact: bool = Form(False)
 ):
-    return parse_question_and_csv(question, file)
+    """
+    上傳 CSV 並解析問題；預覽與角色推斷使用有上限的樣本
+    exact=true 時另做一次串流統計，回傳精確的列數、缺值與基數
+    """
+    return parse_question_and_csv(question, file, exact=exact)
@@ -1,16 +1,83 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 from backend.services.runner import run_method
+from backend.services import datasets
+from backend.services.jobs import job_queue, QueueFullError, MAX_PRIORITY, SUCCEEDED, FAILED, CANCELLED
 
 router = APIRouter(tags=["run"])
 
 class RunIn(BaseModel):
     method_id: str
-    file_path: str
+    dataset_id: str | None = None
+    file_path: str | None = None  # 舊版直接指定檔案路徑；建議改用 dataset_id
     roles: dict
     params: dict | None = None
+    priority: int = Field(0, ge=0, le=MAX_PRIORITY)  # 0（預設）到 MAX_PRIORITY，數字越大越先執行
+    use_cache: bool = True
 
-@router.post("/run")
+def _get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"找不到工作: {job_id}")
+    return job
+
+def _status(job):
+    return {**job.to_dict(), "queue_position": job_queue.position(job)}
+
+@router.post("/run", status_code=202)
 def run_endpoint(p: RunIn):
-    result = run_method(p.method_id, p.file_path, p.roles, p.params or {})
-    return result
+    """
+    送出分析工作，立即回傳 job_id
+    以 GET /run/{job_id} 輪詢狀態、GET /run/{job_id}/result 取得結果
+    資料以 dataset_id 指定（/api/parse 回傳）；仍接受舊版的 file_path
+    """
+    if p.dataset_id is not None:
+        dataset = datasets.get(p.dataset_id)
+        if dataset is None:
+            raise HTTPException(status_code=404, detail=f"找不到資料集: {p.dataset_id}")
+        file_path, data_hash = datasets.data_path(p.dataset_id), dataset["content_hash"]
+    elif p.file_path is not None:
+        file_path, data_hash = p.file_path, None
+    else:
+        raise HTTPException(status_code=422, detail="需指定 dataset_id 或 file_path")
+
+    try:
+        job = job_queue.submit(
+            run_method, p.method_id, file_path, p.roles, p.params or {},
+            use_cache=p.use_cache, data_hash=data_hash, priority=p.priority,
+            meta={"method_id": p.method_id, "dataset_id": p.dataset_id}
+        )
+    except QueueFullError as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e), "retry_after": e.retry_after},
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    return _status(job)
+
+@router.get("/run/{job_id}")
+def run_status_endpoint(job_id: str):
+    return _status(_get_job(job_id))
+
+@router.get("/run/{job_id}/result")
+def run_result_endpoint(job_id: str):
+    """
+    已完成：回傳分析結果；尚在排隊或執行：202 與目前狀態
+    圖表以網址回傳（figures / plots），首次請求時才繪製
+    失敗：500；已取消：409
+    """
+    job = _get_job(job_id)
+    if job.status == SUCCEEDED:
+        return job.result
+    if job.status == FAILED:
+        return JSONResponse(status_code=500, content=_status(job))
+    if job.status == CANCELLED:
+        return JSONResponse(status_code=409, content=_status(job))
+    return JSONResponse(status_code=202, content=_status(job))
+
+@router.delete("/run/{job_id}")
+def run_cancel_endpoint(job_id: str):
+    """取消工作：排隊中立即取消，執行中則於下一個檢查點停止"""
+    _get_job(job_id)
+    return _status(job_queue.cancel(job_id))
@@ -19,6 +19,7 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import roc_auc_score, roc_curve, accuracy_score, confusion_matrix, precision_score, recall_score
 from scipy import stats
 import matplotlib.pyplot as plt
+from backend.methods.logistic_regression.inference import coefficient_inference
 
 
 def run_logistic_regression_detailed(df, roles, params, out_dir):
@@ -52,17 +53,22 @@ def run_logistic_regression_detailed(df, roles, params, out_dir):
         "recall": round(float(recall_score(y, yhat)), 4)
     }
 
-    # 提取係數
+    # 提取係數（標準誤由配適解的 Hessian 計算，含 sklearn 預設的 L2 懲罰）
+    inference = coefficient_inference(
+        X, y, model.coef_[0], model.intercept_[0],
+        l2_penalty=1.0 / model.C,
+        robust=params.get("robust_se", False)
+    )
     coefficients = {}
-    for i, col in enumerate(X_cols):
-        coef = float(model.coef_[0][i])
-        odds_ratio = float(np.exp(coef))
-
+    for i, col in enumerate(X_cols, start=1):
         coefficients[col] = {
-            "coefficient": round(coef, 4),
-            "odds_ratio": round(odds_ratio, 4),
-            "std_err": None,  # sklearn 不直接提供
-            "p_value": None   # sklearn 不直接提供
+            "coefficient": round(float(inference["coef"][i]), 4),
+            "odds_ratio": round(float(inference["odds_ratio"][i]), 4),
+            "std_err": round(float(inference["se"][i]), 4),
+            "z_value": round(float(inference["z"][i]), 4),
+            "p_value": round(float(inference["p"][i]), 4),
+            "or_ci_lower": round(float(inference["or_ci_lower"][i]), 4),
+            "or_ci_upper": round(float(inference["or_ci_upper"][i]), 4)
         }
 
     # 生成圖表
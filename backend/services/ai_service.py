@@ -40,10 +40,13 @@ def analyze_question_with_gpt(question: str, df_summary: dict) -> dict:
 2. classification - 分類問題 (例如：預測二元結果、機率預測)
 3. prediction - 預測問題 (例如：迴歸分析、預測連續值)
 4. survival - 存活分析 (例如：時間到事件分析、風險評估)
+5. time_series - 時間序列預測 (例如：依時間排序的銷售量、指標預測)
+6. spatial - 空間分析 (例如：地理位置上的聚集、熱點偵測)
+7. dimension_reduction - 降維 (例如：大量變數的主成分分析、萃取少數綜合指標)
 
 請用以下 JSON 格式回答：
 {{
-    "task_type": "causal/classification/prediction/survival",
+    "task_type": "causal/classification/prediction/survival/time_series/spatial/dimension_reduction",
     "reasoning": "簡短說明為什麼是這個任務類型",
     "confidence": "high/medium/low"
 }}"""
@@ -0,0 +1,133 @@
+"""
+資料集登錄服務
+
+上傳的檔案以內容雜湊 (SHA-256) 識別：相同位元組只存一份，位於
+DATASETS_DIR/{dataset_id}/，內含 data.csv、背景轉存的 data.parquet 與
+meta.json（原始檔名、大小、列數、schema、欄位剖析與預覽）。重複上傳直接沿用
+已存的剖析結果；分析請求以 dataset_id 指定資料，下游快取也以內容雜湊為鍵。
+"""
+
+import json
+import os
+import threading
+import time
+
+DATASETS_DIR = "backend/storage/datasets"
+DATA_NAME = "data.csv"
+META_NAME = "meta.json"
+ID_LENGTH = 16
+
+_lock = threading.Lock()
+_id_locks = {}
+
+
+def dataset_id_for(content_hash: str) -> str:
+    """Stable dataset id derived from the content hash."""
+    return content_hash[:ID_LENGTH]
+
+
+def dataset_dir(dataset_id: str) -> str:
+    return os.path.join(DATASETS_DIR, dataset_id)
+
+
+def data_path(dataset_id: str) -> str:
+    """Path of the stored CSV; runs read the Parquet copy next to it once ingested."""
+    return os.path.join(dataset_dir(dataset_id), DATA_NAME)
+
+
+def _meta_path(dataset_id: str) -> str:
+    return os.path.join(dataset_dir(dataset_id), META_NAME)
+
+
+def _valid_id(dataset_id: str) -> bool:
+    return len(dataset_id) == ID_LENGTH and all(c in "0123456789abcdef" for c in dataset_id)
+
+
+def _id_lock(dataset_id: str) -> threading.Lock:
+    with _lock:
+        return _id_locks.setdefault(dataset_id, threading.Lock())
+
+
+def _write_meta(meta: dict):
+    path = _meta_path(meta["dataset_id"])
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(tmp, path)
+
+
+def get(dataset_id: str):
+    """Stored metadata of a dataset, or None if unknown."""
+    if not _valid_id(dataset_id):
+        return None
+    try:
+        with open(_meta_path(dataset_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def list_datasets() -> list:
+    """Metadata of every registered dataset (without profiles), newest first."""
+    if not os.path.isdir(DATASETS_DIR):
+        return []
+    out = []
+    for name in os.listdir(DATASETS_DIR):
+        meta = get(name)
+        if meta is not None:
+            out.append({k: v for k, v in meta.items() if k not in ("profile", "head")})
+    return sorted(out, key=lambda m: m["created_at"], reverse=True)
+
+
+def register(staged_path: str, content_hash: str, filename: str, describe):
+    """
+    Add an uploaded file to the registry, storing identical content once.
+
+    Args:
+        staged_path: Fully written upload; moved into the registry, or
+            deleted when the content is already stored
+        content_hash: SHA-256 of the file content
+        filename: Original file name, recorded for display
+        describe: Callable(csv_path) -> dict of metadata fields (schema,
+            row count, profile, ...), called only for new content
+
+    Returns:
+        tuple (metadata dict, created) where created is False for a duplicate
+    """
+    dataset_id = dataset_id_for(content_hash)
+    with _id_lock(dataset_id):
+        meta = get(dataset_id)
+        if meta is not None:
+            if meta["content_hash"] != content_hash:
+                raise ValueError(f"資料集識別碼衝突: {dataset_id}")
+            os.remove(staged_path)
+            if filename not in meta["filenames"]:
+                meta["filenames"].append(filename)
+            meta["uploads"] = meta.get("uploads", 1) + 1
+            _write_meta(meta)
+            return meta, False
+
+        os.makedirs(dataset_dir(dataset_id), exist_ok=True)
+        path = data_path(dataset_id)
+        os.replace(staged_path, path)
+        meta = {
+            "dataset_id": dataset_id,
+            "content_hash": content_hash,
+            "filenames": [filename],
+            "uploads": 1,
+            "created_at": time.time(),
+            **describe(path)
+        }
+        _write_meta(meta)
+        return meta, True
+
+
+def update(dataset_id: str, fields: dict) -> dict:
+    """Merge `fields` into a dataset's stored metadata and return the result."""
+    with _id_lock(dataset_id):
+        meta = get(dataset_id)
+        if meta is None:
+            raise ValueError(f"找不到資料集: {dataset_id}")
+        meta.update(fields)
+        _write_meta(meta)
+        return meta
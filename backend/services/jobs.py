@@ -0,0 +1,190 @@
+"""
+背景工作佇列
+
+/api/run 的分析改在有界的背景執行緒池中執行：送出後立即取得 job_id，
+之後輪詢狀態與結果。佇列依優先順序排程，滿載時拒絕新工作（由路由回傳
+429 與 Retry-After），取消則透過方法迴圈中的 checkpoint() 協作完成。
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict, deque
+
+from backend.methods.base import CancelEvent, RunCancelled, cancellation_scope
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+# 用戶端可指定的優先順序範圍；超出範圍者由 /api/run 以 422 拒絕
+MAX_PRIORITY = 10
+
+
+class QueueFullError(Exception):
+    """Raised by JobQueue.submit when the pending queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"工作佇列已滿，請於 {retry_after} 秒後重試")
+        self.retry_after = retry_after
+
+
+class Job:
+    """A unit of work tracked by JobQueue."""
+
+    def __init__(self, fn, args, kwargs, priority: int, meta: dict):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.seq = 0
+        self.meta = meta
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = CancelEvent()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "priority": self.priority,
+            "cancel_requested": self.cancel_event.is_set(),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            **self.meta
+        }
+
+
+class JobQueue:
+    """
+    Bounded priority executor.
+
+    Jobs wait in a priority queue (higher priority first, FIFO within a
+    priority) and run on a fixed pool of daemon worker threads. At most
+    `max_pending` jobs may wait; beyond that submit() raises QueueFullError
+    with a Retry-After estimate from recent run times. Finished jobs are kept
+    for polling, oldest evicted beyond `max_history`.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, max_history: int = 200):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_history = max_history
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._jobs = OrderedDict()
+        self._pending = 0
+        self._durations = deque(maxlen=20)
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def _ensure_workers(self):
+        # Started lazily so importing the module does not spawn threads
+        if not self._workers:
+            for i in range(self.max_workers):
+                t = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                t.start()
+                self._workers.append(t)
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up."""
+        mean = sum(self._durations) / len(self._durations) if self._durations else 5.0
+        waves = max(self._pending, 1) / self.max_workers
+        return max(1, int(round(mean * waves)))
+
+    def submit(self, fn, *args, priority: int = 0, meta: dict = None, **kwargs) -> Job:
+        """Queue fn(*args, **kwargs); raises QueueFullError when at capacity."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(self.retry_after())
+            job = Job(fn, args, kwargs, int(priority), meta or {})
+            job.seq = next(self._seq)
+            self._jobs[job.job_id] = job
+            self._pending += 1
+            self._evict()
+        self._ensure_workers()
+        self._queue.put((-job.priority, job.seq, job))
+        return job
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def position(self, job: Job) -> int:
+        """Number of queued jobs that will start before this one (0 if not queued)."""
+        if job.status != QUEUED:
+            return 0
+        with self._lock:
+            ahead = [j for j in self._jobs.values() if j.status == QUEUED and j is not job
+                     and (j.priority > job.priority or (j.priority == job.priority and j.seq < job.seq))]
+        return len(ahead)
+
+    def cancel(self, job_id: str):
+        """
+        Request cancellation. A queued job is cancelled at once; a running job
+        stops at its next checkpoint(). Returns the job, or None if unknown.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        with self._lock:
+            if job.status in FINISHED:
+                return job
+            job.cancel_event.set()
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                self._pending -= 1
+        return job
+
+    def _evict(self):
+        finished = [jid for jid, j in self._jobs.items() if j.status in FINISHED]
+        for jid in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[jid]
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            with self._lock:
+                if job.status != QUEUED:  # cancelled while waiting
+                    continue
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._pending -= 1
+            try:
+                with cancellation_scope(job.cancel_event):
+                    result = job.fn(*job.args, **job.kwargs)
+                job.result, status = result, SUCCEEDED
+            except RunCancelled:
+                status = CANCELLED
+            except Exception as e:
+                job.error = str(e)
+                print(f"[Jobs] 工作 {job.job_id} 失敗: {traceback.format_exc()}")
+                status = FAILED
+            job.finished_at = time.time()
+            with self._lock:
+                job.status = status
+                self._durations.append(job.finished_at - job.started_at)
+
+
+# Shared queue for /api/run
+job_queue = JobQueue(
+    max_workers=int(os.getenv("RUN_WORKERS", "2")),
+    max_pending=int(os.getenv("RUN_QUEUE_SIZE", "16"))
+)
+
+# Background Parquet conversion of uploads
+ingest_queue = JobQueue(max_workers=1, max_pending=64)
@@ -1,14 +1,20 @@
 import pandas as pd
-import io, os, re, json
-from datetime import datetime
+import hashlib, os, re, json, uuid
+from backend.services import datasets
 from backend.services.ai_service import analyze_question_with_gpt
+from backend.services.jobs import ingest_queue, QueueFullError
+from backend.services.profiler import profile_csv
 
-def _infer_y_type(df: pd.DataFrame, roles: dict) -> str:
+# 上傳以 1 MB 區塊寫入磁碟；Parquet 轉存每次處理 INGEST_CHUNK_ROWS 列
+UPLOAD_CHUNK_BYTES = 1 << 20
+INGEST_CHUNK_ROWS = 100000
+
+def _infer_y_type(columns: dict, roles: dict) -> str:
     y = roles.get("y")
-    if y is None or y not in df.columns: return "unknown"
-    s = df[y].dropna()
-    if set(s.unique()).issubset({0,1}): return "binary"
-    if pd.api.types.is_integer_dtype(s) and s.nunique() < 15: return "count"
+    if y is None or y not in columns: return "unknown"
+    col = columns[y]
+    if col["binary01"]: return "binary"
+    if col["dtype"].startswith("int") and col["n_unique"] is not None and col["n_unique"] < 15: return "count"
     return "continuous"
 
 def _simple_task_from_question(q: str, df_summary: dict = None, use_gpt: bool = True) -> str:
@@ -40,21 +46,27 @@ def _simple_task_from_question(q: str, df_summary: dict = None, use_gpt: bool =
         return "causal"
     if any(k in ql for k in ["survival","存活","time to event","風險"]):
         return "survival"
+    if any(k in ql for k in ["空間","spatial","地理","熱點","hotspot","moran"]):
+        return "spatial"
+    if any(k in ql for k in ["時間序列","time series","forecast","自我迴歸","趨勢預測"]):
+        return "time_series"
+    if any(k in ql for k in ["降維","主成分","pca","dimension reduction","因素結構"]):
+        return "dimension_reduction"
     if any(k in ql for k in ["分類","classif","0/1","機率"]):
         return "classification"
     if any(k in ql for k in ["預測","regression","迴歸"]):
         return "prediction"
     return "prediction"
 
-def _guess_roles(df: pd.DataFrame):
-    cols = list(df.columns)
+def _guess_roles(columns: dict):
+    cols = list(columns)
     guess = {"y": None, "treatment": None, "time": None, "id": None}
     for c in cols:
         if re.fullmatch(r"(y|label|target|outcome)", c, re.I):
             guess["y"] = c; break
     for c in cols:
         if re.fullmatch(r"(t|treat|treatment|w|z)", c, re.I):
-            if set(df[c].dropna().unique()).issubset({0,1}):
+            if columns[c]["binary01"]:
                 guess["treatment"] = c; break
     for c in cols:
         if re.search(r"(time|duration|survival|t_?end)", c, re.I):
@@ -64,35 +76,163 @@ def _guess_roles(df: pd.DataFrame):
             guess["id"] = c; break
     return guess
 
-def parse_question_and_csv(question, file):
-    content = file.file.read()
-    df = pd.read_csv(io.BytesIO(content))
-    roles = _guess_roles(df)
+def _save_upload(src, dest: str) -> dict:
+    """
+    將上傳串流分塊寫入磁碟，同時計算 SHA-256 與行數，不把整個檔案留在記憶體
+
+    Args:
+        src: 可讀取的二進位串流（UploadFile.file）
+        dest: 目的檔路徑
+
+    Returns:
+        {"sha256", "n_bytes", "n_lines"}
+    """
+    h = hashlib.sha256()
+    n_bytes = n_lines = 0
+    last = b""
+    with open(dest, "wb") as out:
+        for chunk in iter(lambda: src.read(UPLOAD_CHUNK_BYTES), b""):
+            h.update(chunk)
+            out.write(chunk)
+            n_bytes += len(chunk)
+            n_lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if n_bytes and last != b"\n":
+        n_lines += 1
+    return {"sha256": h.hexdigest(), "n_bytes": n_bytes, "n_lines": n_lines}
+
+def _write_parquet(csv_path: str, parquet_path: str, chunksize: int, promote_ints: bool) -> int:
+    """Stream CSV chunks into one Parquet file whose schema is fixed by the first chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                if promote_ints:
+                    schema = pa.schema([
+                        f.with_type(pa.float64()) if pa.types.is_integer(f.type) else f for f in schema
+                    ]).remove_metadata()
+                writer = pq.ParquetWriter(parquet_path + ".tmp", schema, compression="zstd")
+            writer.write_table(table.cast(writer.schema))
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError("CSV 沒有資料列")
+    # Publish atomically: readers never see a half-written file
+    os.replace(parquet_path + ".tmp", parquet_path)
+    return n_rows
+
+def ingest_dataset(csv_path: str, chunksize: int = INGEST_CHUNK_ROWS):
+    """
+    將上傳的 CSV 分塊轉存為壓縮的 Parquet 欄式檔（與 CSV 同目錄同檔名）
+
+    欄位型別以第一個區塊固定，後續區塊轉型後寫入；之後每次執行只需讀取需要的欄位，
+    不必重新解析文字與推斷型別。若後段出現小數使整數欄位無法轉型，改以浮點數欄位重寫一次；
+    仍不相容（例如數值欄位後段出現文字）或缺少 Parquet 引擎（pyarrow）時，回傳原 CSV 路徑。
+
+    Args:
+        csv_path: 已儲存的 CSV 路徑
+        chunksize: 每個區塊的列數
+
+    Returns:
+        (後續執行使用的資料檔路徑, 總列數；沿用 CSV 時為 None)
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    for promote_ints in (False, True):
+        try:
+            return parquet_path, _write_parquet(csv_path, parquet_path, chunksize, promote_ints)
+        except Exception as e:
+            error = e
+        if os.path.exists(parquet_path + ".tmp"):
+            os.remove(parquet_path + ".tmp")
+    print(f"[Parser] Parquet 轉換失敗，沿用 CSV: {error}")
+    return csv_path, None
+
+def _describe_dataset(csv_path: str, upload: dict, exact: bool) -> dict:
+    """
+    剖析資料檔，產生存入資料集登錄的中繼資料（列數、schema、欄位剖析與預覽）
+
+    Args:
+        csv_path: 已存入登錄的 CSV 路徑
+        upload: _save_upload 的回傳值
+        exact: 是否另做一次串流精確統計
+    """
+    # 型別、角色與預覽只看有上限的樣本（exact=True 時另做一次串流精確統計）
+    profile = profile_csv(csv_path, exact=exact, n_rows_hint=max(upload["n_lines"] - 1, 0))
+    columns = profile["columns"]
+    return {
+        "n_bytes": upload["n_bytes"],
+        "n_rows": profile["n_rows"],
+        "n_rows_exact": profile["n_rows_exact"],
+        "n_cols": len(columns),
+        "sampled_rows": profile["sampled_rows"],
+        "schema": {c: col["dtype"] for c, col in columns.items()},
+        "head": profile["sample"].head(5).to_dict(orient="records"),
+        "profile": columns
+    }
+
+def parse_question_and_csv(question, file, exact: bool = False):
+    staging = os.path.join(datasets.DATASETS_DIR, "_incoming")
+    os.makedirs(staging, exist_ok=True)
+    filename = os.path.basename(file.filename)
+    staged = os.path.join(staging, f"{uuid.uuid4().hex}_{filename}")
+    upload = _save_upload(file.file, staged)
+
+    # 相同內容只存一份、只剖析一次；重複上傳直接沿用登錄中的中繼資料
+    meta, created = datasets.register(
+        staged, upload["sha256"], filename, lambda path: _describe_dataset(path, upload, exact)
+    )
+    dataset_id = meta["dataset_id"]
+    file_path = datasets.data_path(dataset_id)
+    if not created and exact and not meta["n_rows_exact"]:
+        meta = datasets.update(dataset_id, _describe_dataset(file_path, upload, exact=True))
+
+    # Parquet 轉存在背景進行；完成前執行分析直接讀 CSV
+    if created:
+        try:
+            ingest_queue.submit(ingest_dataset, file_path, meta={"dataset_id": dataset_id})
+        except QueueFullError:
+            print(f"[Parser] 轉存佇列已滿，資料集 {dataset_id} 將直接以 CSV 讀取")
+
+    columns = meta["profile"]
+    roles = _guess_roles(columns)
 
     # 準備 df_summary 給 GPT 使用
     df_summary = {
-        "columns": list(df.columns),
-        "n_rows": len(df),
-        "n_cols": df.shape[1]
+        "columns": list(columns),
+        "n_rows": meta["n_rows"],
+        "n_cols": meta["n_cols"]
     }
 
     # 使用 GPT 進行任務識別
     task = _simple_task_from_question(question, df_summary=df_summary, use_gpt=True)
-    y_type = _infer_y_type(df, roles)
-
-    up_dir = "backend/storage/uploads"
-    os.makedirs(up_dir, exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    file_path = os.path.join(up_dir, f"{ts}_{file.filename}")
-    with open(file_path, "wb") as f:
-        f.write(content)
-    head = df.head(5).to_dict(orient="records")
-    schema = {c: str(df[c].dtype) for c in df.columns}
+    y_type = _infer_y_type(columns, roles)
+
     return {
         "question": question,
         "task": task,
         "y_type": y_type,
+        "y_type_confidence": columns[roles["y"]]["confidence"] if roles["y"] else None,
         "roles": roles,
+        "dataset_id": dataset_id,
         "file_path": file_path,
-        "preview": {"n_rows": len(df), "n_cols": df.shape[1], "schema": schema, "head": head}
+        "content_hash": meta["content_hash"],
+        "duplicate": not created,
+        "preview": {
+            "n_rows": meta["n_rows"],
+            "n_rows_exact": meta["n_rows_exact"],
+            "n_cols": meta["n_cols"],
+            "n_bytes": meta["n_bytes"],
+            "sampled_rows": meta["sampled_rows"],
+            "schema": meta["schema"],
+            "head": meta["head"]
+        },
+        "profile": columns
     }
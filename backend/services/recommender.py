@@ -29,6 +29,68 @@ def recommend_methods(task: str, y_type: str, roles: dict, question: str = "", d
             "inputs_required": ["treatment(0/1)", "outcome", "covariates"]
         })
 
+    # 最近鄰配對（與加權估計互相對照）
+    if task == "causal" and roles.get("treatment") and roles.get("y"):
+        recs.append({
+            "method_id": "nn_matching",
+            "name": "Nearest-Neighbour Matching ATE (KD-tree)",
+            "why": "偵測到因果問題且存在 treatment/outcome 欄位；以最近鄰配對估計 ATE/ATT，可與加權估計結果互相對照。",
+            "assumptions": ["可觀測性(ignorability)", "overlap（配對距離不可過遠）"],
+            "inputs_required": ["treatment(0/1)", "outcome", "covariates"]
+        })
+
+    # 面板資料（個體 × 時間）的差異中的差異
+    if task == "causal" and roles.get("treatment") and roles.get("y") and roles.get("id") and roles.get("time"):
+        recs.append({
+            "method_id": "twfe_did",
+            "name": "Panel DiD (Two-Way Fixed Effects)",
+            "why": "偵測到因果問題且資料含個體 id 與時間欄位；以雙向固定效果估計差異中的差異效應。",
+            "assumptions": ["平行趨勢", "處置效果不隨處置時點異質（交錯處置時需留意）"],
+            "inputs_required": ["treatment(處置×事後, 0/1)", "outcome", "id", "time"]
+        })
+
+    # 存活分析（追蹤時間 + 事件指標）
+    if task == "survival" and roles.get("time"):
+        recs.append({
+            "method_id": "survival_cox_km",
+            "name": "Survival Analysis (Kaplan-Meier + Cox PH)",
+            "why": "偵測到存活分析問題且資料含追蹤時間欄位；估計存活曲線並以 Cox 模型估計風險比。",
+            "assumptions": ["比例風險", "非資訊性設限", "樣本獨立"],
+            "inputs_required": ["time(追蹤時間)", "y(事件 0/1，1=發生)", "covariates"]
+        })
+
+    # 時間序列預測（依時間排序的連續結果）
+    if task == "time_series" and y_type == "continuous" and roles.get("y"):
+        recs.append({
+            "method_id": "time_series_ar",
+            "name": "Time Series AR / Lagged Regression (Rolling Backtest)",
+            "why": "偵測到時間序列預測問題；以自我迴歸模型預測並以滾動起點回測評估樣本外表現。",
+            "assumptions": ["定態（必要時先差分）", "線性自我相關結構", "等間隔觀測"],
+            "inputs_required": ["y(連續)", "time(排序用，選填)", "外生變數(選填)"]
+        })
+
+    # 空間自相關（含座標欄位的連續變數）
+    if task == "spatial" and y_type == "continuous" and roles.get("y"):
+        recs.append({
+            "method_id": "spatial_autocorrelation",
+            "name": "Spatial Autocorrelation (Moran's I / Geary's C)",
+            "why": "偵測到空間分析問題；檢定數值是否在地理上聚集，並找出熱點、冷點與空間離群值。",
+            "assumptions": ["鄰居定義（k 最近鄰或距離帶）合理", "空間過程大致定態"],
+            "inputs_required": ["y(連續)", "座標欄位（經度/緯度或 x/y）"]
+        })
+
+    # 主成分分析（降維任務，或未指定結果變數的寬資料）
+    n_cols = df_info.get("n_cols", 0) if df_info else 0
+    if task == "dimension_reduction" or (n_cols >= 50 and not roles.get("y")):
+        recs.append({
+            "method_id": "randomized_pca",
+            "name": "PCA (Randomized Truncated SVD)",
+            "why": f"資料含 {n_cols} 個欄位；以主成分萃取少數綜合指標，可用於探索結構或作為後續模型的輸入。" if n_cols >= 50
+                   else "偵測到降維問題；以主成分分析萃取解釋最多變異的少數綜合指標。",
+            "assumptions": ["變數間以線性相關為主", "變異大小代表資訊量（建議標準化）"],
+            "inputs_required": ["多個數值變數X"]
+        })
+
     # 高維度變數選擇 (OGA-HDIC)
     if y_type == "continuous" and roles.get("y") and df_info:
         n_samples = df_info.get("n_rows", 0)
@@ -42,6 +104,23 @@ def recommend_methods(task: str, y_type: str, roles: dict, question: str = "", d
                 "assumptions": ["真實模型是稀疏的（只有少數變數真正重要）", "線性關係", "樣本獨立"],
                 "inputs_required": ["y(連續)", "多個預測變數X"]
             })
+            recs.append({
+                "method_id": "lasso_enet",
+                "name": "Lasso / Elastic Net (座標下降路徑)",
+                "why": "高維度情境下以交叉驗證選擇懲罰強度；可與 OGA-HDIC 的選擇結果互相對照。",
+                "assumptions": ["真實模型是稀疏的", "線性關係", "樣本獨立"],
+                "inputs_required": ["y(連續)", "多個預測變數X"]
+            })
+
+    # 貝氏線性迴歸（連續結果、需要不確定性量化）；排在高維度方法之後，避免擠掉前三名中的變數選擇方法
+    if task == "prediction" and y_type == "continuous" and roles.get("y"):
+        recs.append({
+            "method_id": "bayesian_linreg",
+            "name": "Bayesian Linear Regression (Conjugate NIG)",
+            "why": "連續結果變數；以共軛先驗取得係數的完整後驗分佈、可信區間與預測區間，計算成本與 OLS 相近。",
+            "assumptions": ["線性關係", "誤差常態且變異一致", "樣本獨立"],
+            "inputs_required": ["y(連續)", "X"]
+        })
 
     if y_type == "binary" and roles.get("y"):
         recs.append({
@@ -0,0 +1,235 @@
+"""
+分析結果快取
+
+以「資料內容雜湊 + 正規化的 method_id / roles / params + 方法程式碼版本
++ 結果格式版本」作為鍵，相同請求直接回傳已存的結果與圖表，不重新讀檔、
+配適或繪圖。程式碼版本涵蓋方法套件及其遞移匯入的 backend 模組（共用的
+base / plotting / importance 等）與 runner 本身。快取的執行目錄依最近使用
+時間 (LRU) 淘汰，總大小不超過上限。
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from backend.methods.base import KeyedLocks
+
+RUNS_DIR = "backend/storage/runs"
+INDEX_NAME = "_cache_index.json"
+MAX_BYTES = int(float(os.getenv("RUN_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+# Bump when the payload or run directory layout changes without a code change the hash would see
+SCHEMA_VERSION = 1
+# The runner shapes every payload, so its (transitive) code is part of every version
+RUNNER_MODULE = "backend.services.runner"
+MAX_FILE_HASHES = 1024
+
+_ROOT = Path(__file__).resolve().parents[2]
+_lock = threading.Lock()
+_key_locks = KeyedLocks()
+_file_hashes = OrderedDict()
+_code_versions = {}
+# Cache-hit bookkeeping (key -> [last_used, hits]) kept in memory and folded into the index on the next write
+_usage = {}
+
+
+def file_hash(file_path: str) -> str:
+    """SHA-256 of a file's content, memoized (LRU-bounded) on (path, size, mtime)."""
+    st = os.stat(file_path)
+    stamp = (os.path.abspath(file_path), st.st_size, st.st_mtime_ns)
+    with _lock:
+        if stamp in _file_hashes:
+            _file_hashes.move_to_end(stamp)
+            return _file_hashes[stamp]
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    with _lock:
+        _file_hashes[stamp] = h.hexdigest()
+        while len(_file_hashes) > MAX_FILE_HASHES:
+            _file_hashes.popitem(last=False)
+    return h.hexdigest()
+
+
+def _module_file(name: str):
+    """
+    Source file of a backend.* module, or None for other packages and for
+    package __init__ files (backend.methods imports every method).
+    """
+    parts = name.split(".")
+    if parts[0] != "backend":
+        return None
+    path = _ROOT.joinpath(*parts).with_suffix(".py")
+    return path if path.is_file() else None
+
+
+def _imported_files(path: Path) -> set:
+    """backend.* module files imported by one source file, relative imports included."""
+    package = list(path.relative_to(_ROOT).with_suffix("").parts[:-1])
+    names = []
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = package[:len(package) - node.level + 1] if node.level else []
+            base = ".".join(base + (node.module.split(".") if node.module else []))
+            # `from pkg import name` may import a submodule
+            names += [base] + [f"{base}.{alias.name}" for alias in node.names]
+    return {f for f in map(_module_file, names) if f is not None}
+
+
+def code_files(method_cls) -> list:
+    """Source files a method's results depend on: its package and every backend module it or the runner imports."""
+    todo = set(Path(inspect.getfile(method_cls)).resolve().parent.glob("*.py"))
+    todo.add(_module_file(RUNNER_MODULE))
+    seen = set()
+    while todo:
+        path = todo.pop()
+        seen.add(path)
+        todo |= _imported_files(path) - seen
+    return sorted(seen)
+
+
+def code_version(method_cls) -> str:
+    """Hash of code_files(); changes whenever any code the method's results depend on does."""
+    if method_cls not in _code_versions:
+        h = hashlib.sha256()
+        for src in code_files(method_cls):
+            h.update(src.relative_to(_ROOT).as_posix().encode())
+            h.update(src.read_bytes())
+        _code_versions[method_cls] = h.hexdigest()[:16]
+    return _code_versions[method_cls]
+
+
+def cache_key(data_hash: str, method_id: str, roles: dict, params: dict, version: str) -> str:
+    """Canonical key: dict key order and unset (empty) roles do not change it."""
+    canonical = {
+        "data": data_hash,
+        "method_id": method_id,
+        "roles": {k: v for k, v in (roles or {}).items() if v not in (None, "", [])},
+        "params": params or {},
+        "version": version,
+        "schema": SCHEMA_VERSION
+    }
+    blob = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def key_lock(key: str):
+    """
+    Per-key lock (a context manager) so identical concurrent requests compute
+    once and share the result; the lock is dropped once no request holds or
+    waits for it.
+    """
+    return _key_locks(key)
+
+
+def _index_path():
+    return os.path.join(RUNS_DIR, INDEX_NAME)
+
+
+def _load_index() -> dict:
+    try:
+        with open(_index_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_index(index: dict):
+    tmp = _index_path() + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp, _index_path())
+
+
+def _dir_size(path: str) -> int:
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file())
+
+
+def lookup(key: str):
+    """
+    Stored payload for `key` (and mark it recently used), or None.
+
+    A hit only updates in-memory usage, which store() / update_size() write
+    back to the index, so hits never rewrite the index file. The payload is
+    read outside the global lock; a run evicted in the meantime is a miss.
+    """
+    with _lock:
+        entry = _load_index().get(key)
+        if entry is None:
+            return None
+        result_path = os.path.join(RUNS_DIR, entry["run_id"], "result.json")
+    try:
+        with open(result_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    with _lock:
+        usage = _usage.setdefault(key, [0.0, 0])
+        usage[0] = time.time()
+        usage[1] += 1
+    return payload
+
+
+def _merge_usage(index: dict):
+    """Fold in-memory hit bookkeeping into `index` (caller holds _lock)."""
+    for key, (last_used, hits) in _usage.items():
+        entry = index.get(key)
+        if entry is None:
+            continue
+        entry["last_used"] = max(entry["last_used"], last_used)
+        entry["hits"] = entry.get("hits", 0) + hits
+    _usage.clear()
+
+
+def _evict(index: dict, keep_run_id: str):
+    """Drop least-recently-used runs (other than `keep_run_id`) until the index fits MAX_BYTES."""
+    total = sum(e["size"] for e in index.values())
+    for old_key, entry in sorted(index.items(), key=lambda kv: kv[1]["last_used"]):
+        if total <= MAX_BYTES:
+            break
+        if entry["run_id"] == keep_run_id:
+            continue
+        shutil.rmtree(os.path.join(RUNS_DIR, entry["run_id"]), ignore_errors=True)
+        total -= entry["size"]
+        del index[old_key]
+
+
+def store(key: str, run_id: str):
+    """Record a finished run under `key`, then evict least-recently-used runs over the size cap."""
+    with _lock:
+        index = _load_index()
+        _merge_usage(index)
+        now = time.time()
+        index[key] = {
+            "run_id": run_id,
+            "size": _dir_size(os.path.join(RUNS_DIR, run_id)),
+            "created": now,
+            "last_used": now,
+            "hits": 0
+        }
+        _evict(index, run_id)
+        _save_index(index)
+
+
+def update_size(run_id: str):
+    """Re-measure a cached run after files were added to it (rendered figures), then evict over the size cap."""
+    with _lock:
+        index = _load_index()
+        entries = [e for e in index.values() if e["run_id"] == run_id]
+        if not entries:
+            return
+        _merge_usage(index)
+        size = _dir_size(os.path.join(RUNS_DIR, run_id))
+        for entry in entries:
+            entry["size"] = size
+        _evict(index, run_id)
+        _save_index(index)
@@ -1,18 +1,91 @@
-import os, uuid, json
+import os, uuid, json, shutil
 import pandas as pd
-from backend.methods.base import METHODS_REGISTRY
+from backend.methods.base import METHODS_REGISTRY, RunCancelled, checkpoint
+from backend.methods.plotting import deferred_figures
 from backend.services.reports import render_html_report
+from backend.services import run_cache
 
-def run_method(method_id: str, file_path: str, roles: dict, params: dict):
+def run_method(method_id: str, file_path: str, roles: dict, params: dict, use_cache: bool = True,
+               data_hash: str = None):
+    """
+    Run a method and return its payload.
+
+    Figures are not drawn here: the method's plot data is persisted and each
+    figure is rendered on first request through the figure endpoints, whose
+    URLs the payload lists under "figures" and "plots".
+    """
     if method_id not in METHODS_REGISTRY:
         raise ValueError(f"Unknown method_id: {method_id}")
-    df = pd.read_csv(file_path)
+    method_cls = METHODS_REGISTRY[method_id]
+    if not use_cache:
+        return _execute(method_cls, file_path, roles, params)
+
+    # Identical data + method + roles + params + method code: reuse the stored run.
+    # Registered datasets pass their content hash, so the file is not re-hashed.
+    key = run_cache.cache_key(
+        data_hash or run_cache.file_hash(file_path), method_id, roles, params, run_cache.code_version(method_cls)
+    )
+    with run_cache.key_lock(key):
+        cached = run_cache.lookup(key)
+        if cached is not None:
+            return {**cached, "file_path": file_path, "cached": True}
+        payload = _execute(method_cls, file_path, roles, params)
+        run_cache.store(key, payload["run_id"])
+    return payload
+
+def load_dataset(file_path: str, method=None, roles: dict = None, params: dict = None):
+    """
+    Read a dataset (Parquet from ingestion, or CSV), loading only the columns
+    the method declares via required_columns(). A CSV whose background
+    Parquet conversion has finished is read from the Parquet copy.
+    """
+    columnar = os.path.splitext(file_path)[0] + ".parquet"
+    if not file_path.endswith(".parquet") and os.path.exists(columnar) \
+            and os.path.getmtime(columnar) >= os.path.getmtime(file_path):
+        file_path = columnar
+    is_parquet = file_path.endswith(".parquet")
+    if is_parquet:
+        import pyarrow.parquet as pq
+        available = pq.read_schema(file_path).names
+    else:
+        available = pd.read_csv(file_path, nrows=0).columns.tolist()
+
+    wanted = method.required_columns(available, roles or {}, params or {}) if method is not None else None
+    columns = None if wanted is None else [c for c in available if c in set(wanted)]
+    if is_parquet:
+        return pd.read_parquet(file_path, columns=columns)
+    return pd.read_csv(file_path, usecols=columns)
+
+def figure_links(run_id: str, figure_path: str) -> dict:
+    """API URLs of one figure: PNG at screen resolution, SVG, WebP thumbnail and its plot data."""
+    name = os.path.splitext(os.path.basename(figure_path))[0]
+    base = f"/api/runs/{run_id}"
+    return {
+        "name": name,
+        "figure": f"{base}/figures/{name}.png",
+        "svg": f"{base}/figures/{name}.svg",
+        "thumbnail": f"{base}/figures/{name}.webp",
+        "data": f"{base}/plots/{name}"
+    }
+
+def _execute(method_cls, file_path: str, roles: dict, params: dict):
+    method = method_cls()
+    df = load_dataset(file_path, method, roles, params)
+    checkpoint()
     run_id = str(uuid.uuid4())[:8]
-    out_dir = f"backend/storage/runs/{run_id}"
+    out_dir = f"{run_cache.RUNS_DIR}/{run_id}"
     os.makedirs(out_dir, exist_ok=True)
 
-    method = METHODS_REGISTRY[method_id]()
-    result = method.run(df, roles, params, out_dir=out_dir)
+    # Only plot data is written here; figures render on first request
+    try:
+        with deferred_figures():
+            result = method.run(df, roles, params, out_dir=out_dir)
+        checkpoint()
+    except RunCancelled:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        raise
+    plots = [figure_links(run_id, f) for f in result.get("figures", [])]
+    figures = [p["figure"] for p in plots]
 
     html_path = os.path.join(out_dir, "report.html")
     render_html_report(
@@ -20,18 +93,19 @@ def run_method(method_id: str, file_path: str, roles: dict, params: dict):
         title=method.name,
         summary=result.get("summary_md",""),
         metrics=result.get("metrics",{}),
-        figures=result.get("figures",[])
+        figures=figures
     )
 
     payload = {
         "run_id": run_id,
-        "method_id": method_id,
+        "method_id": method_cls.id,
         "metrics": result.get("metrics",{}),
-        "figures": result.get("figures",[]),
+        "figures": figures,
+        "plots": plots,
         "summary": result.get("summary_md",""),
         "report_html_path": html_path,
         "file_path": file_path
     }
     with open(os.path.join(out_dir, "result.json"), "w", encoding="utf-8") as f:
         json.dump(payload, f, ensure_ascii=False, indent=2)
-    return payload
+    return {**payload, "cached": False}
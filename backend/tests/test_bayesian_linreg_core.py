@@ -0,0 +1,66 @@
+"""
+共軛貝氏線性迴歸核心演算法單元測試
+"""
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+
+from backend.methods.bayesian_linreg.core import (
+    nig_posterior, coefficient_summary, sample_posterior, predictive_intervals
+)
+from backend.methods.bayesian_linreg.method import BayesianLinearRegressionMethod
+
+
+def _data(n=300, p=4, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([np.ones(n), rng.normal(size=(n, p))])
+    y = X @ rng.normal(size=p + 1) + rng.normal(0, 1.5, n)
+    return X, y
+
+
+def test_posterior_matches_closed_form():
+    """平坦先驗下後驗平均等於 OLS；有先驗時等於 (X'X + Λ₀)⁻¹(X'y + Λ₀m₀)"""
+    X, y = _data()
+    flat = nig_posterior(X, y, a0=0, b0=0)
+    np.testing.assert_allclose(flat["mean"], sm.OLS(y, X).fit().params, atol=1e-10)
+
+    L0 = np.array([0.0, 5, 5, 5, 5])
+    m0 = np.array([0.0, 1, -1, 0.5, 0])
+    post = nig_posterior(X, y, prior_mean=m0, prior_precision=L0, a0=2, b0=3)
+    expected = np.linalg.solve(X.T @ X + np.diag(L0), X.T @ y + L0 * m0)
+    np.testing.assert_allclose(post["mean"], expected, atol=1e-10)
+    b_direct = 3 + 0.5 * (y @ y + m0 @ (L0 * m0) - expected @ (X.T @ X + np.diag(L0)) @ expected)
+    assert np.isclose(post["a"], 2 + len(y) / 2)
+    assert np.isclose(post["b"], b_direct)
+
+
+def test_batched_draws_and_predictive_intervals():
+    """批次抽樣的動差應符合解析後驗；解析預測區間應與抽樣分位數一致"""
+    X, y = _data()
+    post = nig_posterior(X, y)
+    summary = coefficient_summary(post)
+    beta, sigma2 = sample_posterior(post, n_draws=100000)
+    cov = post["b"] / (post["a"] - 1) * np.linalg.inv(post["chol"] @ post["chol"].T)
+    np.testing.assert_allclose(beta.mean(axis=0), summary["mean"], atol=5 * np.sqrt(cov.diagonal().max() / 1e5))
+    np.testing.assert_allclose(np.cov(beta, rowvar=False), cov, atol=0.03 * cov.diagonal().max())
+    assert np.isclose(sigma2.mean(), summary["sigma2_mean"], rtol=0.01)
+
+    pi = predictive_intervals(post, X[:5], levels=(0.9,))
+    rng = np.random.default_rng(1)
+    y_rep = beta @ X[:5].T + np.sqrt(sigma2)[:, None] * rng.standard_normal((len(sigma2), 5))
+    np.testing.assert_allclose(np.quantile(y_rep, 0.05, axis=0), pi["lower"][0], atol=0.05)
+    np.testing.assert_allclose(np.quantile(y_rep, 0.95, axis=0), pi["upper"][0], atol=0.05)
+
+
+def test_method_run_outputs(tmp_path):
+    """方法執行應輸出係數可信區間、貝氏 R² 與圖表"""
+    X, y = _data(n=200, p=3)
+    df = pd.DataFrame(X[:, 1:], columns=["x1", "x2", "x3"])
+    df["y"] = y
+    res = BayesianLinearRegressionMethod().run(df, {"y": "y"}, {"n_draws": 500}, str(tmp_path))
+    c = res["coefficients"]["x1"]
+    assert c["ci_lower"] < c["coefficient"] < c["ci_upper"]
+    assert 0 < res["metrics"]["bayes_R2_median"] < 1
+    assert 0.85 < res["metrics"]["predictive_coverage"] <= 1
+    assert len(res["figures"]) == 3
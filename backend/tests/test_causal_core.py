@@ -0,0 +1,220 @@
+"""
+因果推論核心演算法單元測試
+"""
+
+import numpy as np
+
+from backend.methods.dr_ate_cbps.sensitivity import e_value, ate_e_values, bias_adjusted_grid
+
+
+def _simulate(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3))
+    ps = 1 / (1 + np.exp(-(0.5 * X[:, 0] - 0.3 * X[:, 1])))
+    T = rng.binomial(1, ps)
+    Y = 2.0 * T + X @ np.array([1.0, -0.5, 0.2]) + rng.normal(size=n)
+    return X, T, Y
+
+
+def test_e_value_symmetry():
+    """E-value 對 RR 與 1/RR 應相同，RR = 1 時為 1"""
+    assert np.isclose(e_value(1.0), 1.0)
+    assert np.isclose(e_value(2.0), e_value(0.5))
+    assert np.isclose(e_value(2.0), 2 + np.sqrt(2))
+
+
+def test_e_value_ci_covering_null():
+    """信賴區間包含 0 時 E-value(CI) 為 1"""
+    ev = ate_e_values(0.1, -0.2, 0.4, sd_y=1.0)
+    assert ev["e_value_ci"] == 1.0
+    assert ev["e_value"] > 1.0
+
+
+def test_bias_adjusted_grid_matches_direct_computation():
+    """廣播網格應與逐點調整 DR 分數的結果一致"""
+    _, T, Y = _simulate()
+    scores = Y + np.random.default_rng(1).normal(size=len(Y))
+    c1_grid = np.linspace(-1, 1, 7)
+    c0_grid = np.linspace(-2, 2, 5)
+    grid = bias_adjusted_grid(scores, T, c1_grid, c0_grid)
+
+    assert grid["ate"].shape == (7, 5)
+    i, j = 2, 4
+    adjusted = scores - c1_grid[i] * (1 - T) - c0_grid[j] * T
+    assert np.isclose(grid["ate"][i, j], adjusted.mean())
+    assert np.isclose(grid["se"][i, j], adjusted.std(ddof=1) / np.sqrt(len(T)))
+
+
+def test_matching_recovers_effect():
+    """KD-tree 配對（含偏誤校正）應接近真實效應 2.0"""
+    from backend.methods.nn_matching.core import matching_ate, mahalanobis_transform
+
+    X, T, Y = _simulate(n=4000)
+    result = matching_ate(mahalanobis_transform(X), X, T, Y, k=2)
+    assert abs(result["ate"] - 2.0) < 4 * result["se"]
+    assert result["kept"].all()
+
+    # 緊的 caliper 只保留部分單位
+    tight = matching_ate(X[:, 0], X, T, Y, k=1, caliper=3e-4)
+    assert 0 < tight["kept"].sum() < len(T)
+
+
+def test_entropy_balance_exact_means():
+    """熵平衡權重應使兩組加權平均等於全樣本平均"""
+    from backend.methods.dr_ate_cbps.core import entropy_balance_weight
+
+    X, T, _ = _simulate(n=3000)
+    w = entropy_balance_weight(X, T)
+    target = X.mean(axis=0)
+    for arm in (0, 1):
+        idx = T == arm
+        assert np.allclose(np.average(X[idx], axis=0, weights=w[idx]), target, atol=1e-6)
+        assert np.isclose(w[idx].sum(), len(T))
+
+
+def test_twfe_matches_dummy_regression():
+    """交替投影的 TWFE 係數應與虛擬變數 OLS 相同（非平衡面板）"""
+    from backend.methods.twfe_did.core import twfe_regression
+
+    rng = np.random.default_rng(3)
+    unit = np.repeat(np.arange(40), 6)
+    time = np.tile(np.arange(6), 40)
+    keep = rng.random(len(unit)) > 0.15
+    unit, time = unit[keep], time[keep]
+    D = ((unit < 20) & (time >= 3)).astype(float)
+    x = rng.normal(size=len(D))
+    y = 1.5 * D + 0.5 * x + rng.normal(size=40)[unit] + 0.3 * time + rng.normal(size=len(D))
+
+    result = twfe_regression(y, np.column_stack([D, x]), unit, time)
+
+    dummies = np.column_stack([
+        D, x,
+        (unit[:, None] == np.arange(40)).astype(float),
+        (time[:, None] == np.arange(1, 6)).astype(float)
+    ])
+    beta = np.linalg.lstsq(dummies, y, rcond=None)[0]
+    assert np.allclose(result["coef"], beta[:2], atol=1e-6)
+
+
+def test_trimming_sweep_matches_subset_estimate():
+    """累積和修剪掃描應與直接在保留子樣本上計算的 DR 分數平均相同"""
+    from backend.methods.dr_ate_cbps.core import (
+        propensity_score, cbps_weight, doubly_robust_ate, trimming_sweep
+    )
+
+    X, T, Y = _simulate(n=1500)
+    ps = propensity_score(X, T)
+    w = cbps_weight(X, T, ps=ps)
+    res = doubly_robust_ate(X, T, Y, w)
+    sweep = trimming_sweep(ps, T, Y, res["mu1"], res["mu0"], w, [0.0, 0.2])
+
+    assert np.isclose(sweep["ate"][0], res["ate"])
+    keep = (ps >= 0.2) & (ps <= 0.8)
+    Tk, wk, Yk = T[keep], w[keep], Y[keep]
+    mu1, mu0 = res["mu1"][keep], res["mu0"][keep]
+    scores = (
+        (mu1 - mu0)
+        + Tk * (Yk - mu1) * wk / wk[Tk == 1].mean()
+        - (1 - Tk) * (Yk - mu0) * wk / wk[Tk == 0].mean()
+    )
+    assert sweep["n_kept"][1] == keep.sum()
+    assert np.isclose(sweep["ate"][1], scores.mean())
+    assert np.isclose(sweep["se"][1], scores.std(ddof=1) / np.sqrt(len(scores)))
+
+
+def test_matching_rejects_empty_caliper(tmp_path):
+    """caliper 過小以致沒有任何配對時，估計函式本身即應回報錯誤，不產生空平均警告或 NaN"""
+    import pandas as pd
+    import pytest
+    from backend.methods.nn_matching.method import NearestNeighborMatching
+
+    import warnings
+    from backend.methods.nn_matching.core import matching_ate
+
+    X, T, Y = _simulate(n=300)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with pytest.raises(ValueError, match="caliper"):
+            matching_ate(X[:, 0], X, T, Y, k=1, caliper=1e-12)
+
+    df = pd.DataFrame({"x0": X[:, 0], "x1": X[:, 1], "t": T, "y": Y})
+    with pytest.raises(ValueError, match="caliper"):
+        NearestNeighborMatching().run(df, {"treatment": "t", "y": "y"}, {"caliper": 1e-12}, str(tmp_path))
+
+
+def test_twfe_period_only_in_singleton_unit(tmp_path):
+    """只出現在單一觀測個體的時期移除後應重新編碼：平衡面板一次收斂，字串欄位不當作共變數"""
+    import warnings
+    import pandas as pd
+    from backend.methods.twfe_did.core import demean_two_way
+    from backend.methods.twfe_did.method import TwoWayFixedEffectsDiD
+
+    rng = np.random.default_rng(4)
+    unit = np.repeat(np.arange(30), 5)
+    time = np.tile([0, 1, 3, 4, 5], 30)  # code 2 never observed
+    M = rng.normal(size=(len(unit), 2))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        _, sweeps = demean_two_way(M, unit, time)
+    assert sweeps == demean_two_way(M, unit, np.tile(np.arange(5), 30))[1] <= 2
+
+    D = ((unit < 15) & (time >= 3)).astype(float)
+    df = pd.DataFrame({
+        "id": np.r_[unit, 99], "t": np.r_[time, 2], "d": np.r_[D, 0.0],
+        "y": np.r_[2.0 * D + rng.normal(size=len(D)), 0.0],
+        "label": [f"u{i}" for i in np.r_[unit, 99]]
+    })
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        result = TwoWayFixedEffectsDiD().run(df, {"y": "y", "treatment": "d", "id": "id", "time": "t"}, {},
+                                             str(tmp_path))
+    assert abs(result["metrics"]["DiD_ATT"] - 2.0) < 0.5
+    assert list(result["coefficients"]) == ["treatment"]
+
+
+def test_twfe_drops_collinear_covariates(tmp_path):
+    """去除固定效果後共線的共變數（重複或等比例縮放）應被移除並列出，不影響 ATT"""
+    import pandas as pd
+    from backend.methods.twfe_did.method import TwoWayFixedEffectsDiD
+
+    rng = np.random.default_rng(5)
+    unit = np.repeat(np.arange(50), 6)
+    time = np.tile(np.arange(6), 50)
+    D = ((unit < 25) & (time >= 3)).astype(float)
+    price = rng.normal(size=len(D))
+    df = pd.DataFrame({
+        "id": unit, "t": time, "d": D, "price": price,
+        "y": 2.0 * D + 0.5 * price + rng.normal(size=50)[unit] + rng.normal(size=len(D))
+    })
+    roles = {"y": "y", "treatment": "d", "id": "id", "time": "t"}
+    reference = TwoWayFixedEffectsDiD().run(df, roles, {}, str(tmp_path))
+    result = TwoWayFixedEffectsDiD().run(df.assign(price2=2 * price, price_k=1000 * price), roles, {},
+                                         str(tmp_path))
+    assert list(result["coefficients"]) == ["treatment", "price"]
+    for key in ("DiD_ATT", "SE_cluster", "within_R_squared"):
+        assert np.isclose(result["metrics"][key], reference["metrics"][key], atol=1e-6)
+    assert abs(result["metrics"]["DiD_ATT"] - 2.0) < 4 * result["metrics"]["SE_cluster"]
+    assert "price2, price_k" in result["summary_md"]
+
+
+def test_trimming_sweep_resolves_entropy_weights():
+    """熵平衡權重在每個修剪樣本上重新求解，結果應等於直接在子樣本上重新估計"""
+    from backend.methods.dr_ate_cbps.core import (
+        propensity_score, entropy_balance_weight, doubly_robust_ate, trimming_sweep
+    )
+
+    X, T, Y = _simulate(n=1500)
+    ps = propensity_score(X, T)
+    w = entropy_balance_weight(X, T)
+    res = doubly_robust_ate(X, T, Y, w)
+    keep = (ps >= 0.2) & (ps <= 0.8)
+    sweep = trimming_sweep(ps, T, Y, res["mu1"], res["mu0"], w, [0.0, 0.2],
+                           reweight=lambda k: entropy_balance_weight(X[k], T[k]))
+
+    assert np.isclose(sweep["ate"][0], res["ate"])
+    wk = entropy_balance_weight(X[keep], T[keep])
+    direct = trimming_sweep(ps[keep], T[keep], Y[keep], res["mu1"][keep], res["mu0"][keep], wk, [0.0])
+    assert sweep["n_kept"][1] == keep.sum()
+    assert np.isclose(sweep["ate"][1], direct["ate"][0]) and np.isclose(sweep["se"][1], direct["se"][0])
+    stale = trimming_sweep(ps, T, Y, res["mu1"], res["mu0"], w, [0.2])
+    assert not np.isclose(sweep["ate"][1], stale["ate"][0])
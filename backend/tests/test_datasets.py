@@ -0,0 +1,95 @@
+"""
+資料集登錄單元測試
+"""
+
+import io
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.methods.base import BaseMethod, METHODS_REGISTRY
+from backend.routers import run as run_router
+from backend.services import datasets, parser, profiler, run_cache
+from backend.services.jobs import JobQueue, SUCCEEDED
+
+
+class _CountingMethod(BaseMethod):
+    id = "_test_dataset_counting"
+    name = "Counting"
+    calls = 0
+
+    def run(self, df, roles, params, out_dir):
+        type(self).calls += 1
+        return {"metrics": {"n": len(df)}, "figures": [], "summary_md": ""}
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, "DATASETS_DIR", str(tmp_path / "datasets"))
+    monkeypatch.setattr(parser, "analyze_question_with_gpt", lambda *a, **k: {})
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"y": rng.normal(size=200), "treat": rng.integers(0, 2, 200)})
+    return df.to_csv(index=False).encode()
+
+
+def _upload(content, name):
+    return SimpleNamespace(file=io.BytesIO(content), filename=name)
+
+
+def test_duplicate_upload_stored_and_profiled_once(registry, monkeypatch):
+    """相同內容以不同檔名上傳時只存一份、只剖析一次，並回傳相同的 dataset_id"""
+    calls = []
+    real = profiler.profile_csv
+    monkeypatch.setattr(parser, "profile_csv", lambda *a, **k: calls.append(a) or real(*a, **k))
+
+    first = parser.parse_question_and_csv("預測 y", _upload(registry, "a.csv"))
+    second = parser.parse_question_and_csv("處理效果", _upload(registry, "b.csv"))
+    assert first["dataset_id"] == second["dataset_id"] and len(calls) == 1
+    assert not first["duplicate"] and second["duplicate"]
+    assert second["preview"] == first["preview"] and second["roles"]["treatment"] == "treat"
+
+    meta = datasets.get(first["dataset_id"])
+    assert meta["filenames"] == ["a.csv", "b.csv"] and meta["uploads"] == 2
+    assert meta["n_rows"] == 200 and meta["schema"]["treat"] == "int64"
+    stored = os.listdir(datasets.dataset_dir(first["dataset_id"]))
+    assert stored.count(datasets.DATA_NAME) == 1
+    assert os.listdir(os.path.join(datasets.DATASETS_DIR, "_incoming")) == []
+
+    other = parser.parse_question_and_csv("預測 y", _upload(registry + b"0.5,1\n", "a.csv"))
+    assert other["dataset_id"] != first["dataset_id"]
+    assert [m["dataset_id"] for m in datasets.list_datasets()] == [other["dataset_id"], first["dataset_id"]]
+
+
+def test_run_by_dataset_id(registry, tmp_path, monkeypatch):
+    """以 dataset_id 執行分析並以內容雜湊命中快取；未知的 dataset_id 回傳 404"""
+    monkeypatch.setattr(run_cache, "RUNS_DIR", str(tmp_path / "runs"))
+    monkeypatch.setitem(METHODS_REGISTRY, _CountingMethod.id, _CountingMethod)
+    _CountingMethod.calls = 0
+    monkeypatch.setattr(run_cache, "file_hash", lambda path: pytest.fail("dataset should not be re-hashed"))
+    q = JobQueue(max_workers=1)
+    monkeypatch.setattr(run_router, "job_queue", q)
+    app = FastAPI()
+    app.include_router(run_router.router, prefix="/api")
+    client = TestClient(app)
+
+    dataset_id = parser.parse_question_and_csv("預測 y", _upload(registry, "a.csv"))["dataset_id"]
+    results = []
+    for _ in range(2):
+        r = client.post("/api/run", json={"method_id": _CountingMethod.id, "dataset_id": dataset_id, "roles": {}})
+        assert r.status_code == 202 and r.json()["dataset_id"] == dataset_id
+        job = q.get(r.json()["job_id"])
+        while job.status not in (SUCCEEDED, "failed"):
+            time.sleep(0.01)
+        results.append(client.get(f"/api/run/{job.job_id}/result").json())
+    assert results[0]["metrics"] == {"n": 200} and results[1]["cached"]
+    assert _CountingMethod.calls == 1
+
+    missing = {"method_id": _CountingMethod.id, "dataset_id": "0" * 16, "roles": {}}
+    assert client.post("/api/run", json=missing).status_code == 404
+    assert client.post("/api/run", json={"method_id": _CountingMethod.id, "roles": {}}).status_code == 422
@@ -0,0 +1,97 @@
+"""
+欄式資料匯入與欄位投影單元測試
+"""
+
+import hashlib
+import io
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.methods.time_series.method import TimeSeriesARMethod
+from backend.methods.lasso_enet.method import LassoElasticNetMethod
+from backend.services import datasets, parser, profiler
+from backend.services.parser import ingest_dataset
+from backend.services.runner import load_dataset
+
+
+def _wide(tmp_path, n=50, p=30):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(n, p)), columns=[f"x{j}" for j in range(p)])
+    df["y"] = rng.normal(size=n)
+    df["date"] = pd.date_range("2024-01-01", periods=n).astype(str)
+    df["region"] = rng.choice(["north", "south"], n)
+    path = tmp_path / "upload.csv"
+    df.to_csv(path, index=False)
+    return df, str(path)
+
+
+def test_projection_reads_only_required_columns(tmp_path):
+    """方法宣告所需欄位時只讀取那些欄位（保留檔案欄位順序）；未宣告時讀取全部"""
+    df, path = _wide(tmp_path)
+    roles = {"y": "y", "time": "date"}
+    params = {"exog": ["x3", "x1"]}
+    projected = load_dataset(path, TimeSeriesARMethod(), roles, params)
+    assert list(projected.columns) == ["x1", "x3", "y", "date"]
+    pd.testing.assert_frame_equal(projected, df[["x1", "x3", "y", "date"]])
+
+    full = load_dataset(path, LassoElasticNetMethod(), {"y": "y"}, {})
+    assert full.shape == df.shape
+
+
+def test_parquet_ingestion_roundtrip(tmp_path):
+    """轉存的 Parquet 應保留型別，投影讀取結果與 CSV 相同"""
+    pytest.importorskip("pyarrow")
+    df, path = _wide(tmp_path)
+    parsed = pd.read_csv(path)
+    dataset, n_rows = ingest_dataset(path, chunksize=16)
+    assert dataset.endswith(".parquet") and n_rows == len(parsed)
+    pd.testing.assert_frame_equal(pd.read_parquet(dataset), parsed)
+
+    roles = {"y": "y", "time": "date"}
+    params = {"exog": ["x2"]}
+    pd.testing.assert_frame_equal(
+        load_dataset(dataset, TimeSeriesARMethod(), roles, params),
+        load_dataset(path, TimeSeriesARMethod(), roles, params)
+    )
+
+
+def test_late_chunk_types(tmp_path):
+    """後段才出現缺值或小數的整數欄位改存為浮點數；出現文字時沿用原 CSV 路徑"""
+    pytest.importorskip("pyarrow")
+    late = tmp_path / "late_decimal.csv"
+    late.write_text("count,y\n1,0.1\n2,0.2\n2.5,0.3\n,0.4\n")
+    dataset, n_rows = ingest_dataset(str(late), chunksize=2)
+    assert n_rows == 4
+    pd.testing.assert_frame_equal(pd.read_parquet(dataset), pd.read_csv(late))
+
+    bad = tmp_path / "late_text.csv"
+    bad.write_text("count,y\n1,0.1\n2,0.2\nmany,0.3\n")
+    assert ingest_dataset(str(bad), chunksize=2) == (str(bad), None)
+    assert not (tmp_path / "late_text.parquet").exists()
+
+
+def test_streaming_parse_uses_bounded_sample(tmp_path, monkeypatch):
+    """上傳分塊寫入並計算雜湊；型別推斷只讀樣本，列數仍為全部"""
+    df, path = _wide(tmp_path, n=300)
+    content = open(path, "rb").read()
+    monkeypatch.setattr(datasets, "DATASETS_DIR", str(tmp_path / "datasets"))
+    monkeypatch.setattr(parser, "UPLOAD_CHUNK_BYTES", 4096)
+    monkeypatch.setattr(profiler, "SAMPLE_ROWS", 40)
+    monkeypatch.setattr(profiler, "HEAD_ROWS", 20)
+
+    def no_gpt(*args, **kwargs):
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(parser, "analyze_question_with_gpt", no_gpt)
+    upload = SimpleNamespace(file=io.BytesIO(content), filename="../wide.csv")
+    out = parser.parse_question_and_csv("預測 y", upload)
+
+    assert out["content_hash"] == hashlib.sha256(content).hexdigest()
+    assert open(out["file_path"], "rb").read() == content
+    assert out["file_path"] == datasets.data_path(out["dataset_id"])
+    assert out["preview"]["n_rows"] == 300 and 20 < out["preview"]["sampled_rows"] <= 40
+    assert out["roles"]["y"] == "y" and out["y_type"] == "continuous"
@@ -0,0 +1,118 @@
+"""
+背景工作佇列單元測試
+"""
+
+import pickle
+import threading
+import time
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.methods.base import CancelEvent, RunCancelled, cancellation_scope, checkpoint
+from backend.methods.lasso_enet.core import cross_validate_path
+from backend.routers import run as run_router
+from backend.services.jobs import JobQueue, QueueFullError, MAX_PRIORITY, SUCCEEDED, CANCELLED
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while job.status not in (SUCCEEDED, CANCELLED, "failed") and time.time() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+
+def test_priority_order_and_backpressure():
+    """單一工作執行緒時高優先工作先執行；佇列滿時拒絕並提供 Retry-After"""
+    q = JobQueue(max_workers=1, max_pending=3)
+    gate = threading.Event()
+    order = []
+    blocker = q.submit(gate.wait)
+    while blocker.status != "running":
+        time.sleep(0.01)
+
+    low = q.submit(order.append, "low", priority=0)
+    high = q.submit(order.append, "high", priority=5)
+    q.submit(order.append, "low2", priority=0)
+    with pytest.raises(QueueFullError) as exc:
+        q.submit(order.append, "overflow")
+    assert exc.value.retry_after >= 1
+    assert q.position(high) == 0 and q.position(low) == 1
+
+    gate.set()
+    assert _wait(low) == SUCCEEDED
+    time.sleep(0.05)
+    assert order == ["high", "low", "low2"]
+
+
+def test_cooperative_cancellation():
+    """排隊中的工作立即取消；執行中的工作在下一個 checkpoint 停止"""
+    q = JobQueue(max_workers=1, max_pending=4)
+    started = threading.Event()
+
+    def long_loop():
+        started.set()
+        while True:
+            checkpoint()
+            time.sleep(0.005)
+
+    running = q.submit(long_loop)
+    waiting = q.submit(lambda: "never")
+    started.wait(5)
+    q.cancel(waiting.job_id)
+    assert waiting.status == CANCELLED
+    q.cancel(running.job_id)
+    assert _wait(running) == CANCELLED
+    assert waiting.result is None
+
+
+def test_cancellation_reaches_worker_processes():
+    """取消旗標可序列化給工作程序；CV 各折在工作程序中的 checkpoint 也會停止執行"""
+    event = CancelEvent()
+    remote = pickle.loads(pickle.dumps(event))
+    assert not remote.is_set()
+    event.set()
+    assert remote.is_set()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 20))
+    y = X[:, 0] + rng.normal(size=200)
+    with cancellation_scope(remote), pytest.raises(RunCancelled):
+        cross_validate_path(X, y, n_jobs=2)
+
+
+def test_run_endpoints(monkeypatch):
+    """POST /run 立即回傳 job_id，可輪詢結果；佇列滿時回傳 429"""
+    q = JobQueue(max_workers=1, max_pending=1)
+    monkeypatch.setattr(run_router, "job_queue", q)
+    monkeypatch.setattr(run_router, "run_method", lambda *a, **k: {"run_id": "x", "metrics": {"n": 1}})
+    app = FastAPI()
+    app.include_router(run_router.router, prefix="/api")
+    client = TestClient(app)
+
+    body = {"method_id": "m", "file_path": "f.csv", "roles": {}}
+    r = client.post("/api/run", json=body)
+    assert r.status_code == 202
+    job_id = r.json()["job_id"]
+    _wait(q.get(job_id))
+    assert client.get(f"/api/run/{job_id}/result").json()["metrics"] == {"n": 1}
+    assert client.get("/api/run/unknown").status_code == 404
+
+    # 優先順序限制在 0 到 MAX_PRIORITY，避免任意用戶端插隊
+    assert client.post("/api/run", json={**body, "priority": MAX_PRIORITY + 1}).status_code == 422
+    assert client.post("/api/run", json={**body, "priority": -1}).status_code == 422
+    r = client.post("/api/run", json={**body, "priority": MAX_PRIORITY})
+    assert r.status_code == 202 and r.json()["priority"] == MAX_PRIORITY
+    _wait(q.get(r.json()["job_id"]))
+
+    gate = threading.Event()
+    q.submit(gate.wait)
+    while q._pending:
+        time.sleep(0.01)
+    q.submit(gate.wait)
+    r = client.post("/api/run", json=body)
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) >= 1
+    gate.set()
@@ -0,0 +1,191 @@
+"""
+Logistic Regression 核心演算法單元測試
+"""
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from backend.methods.logistic_regression.regularization import (
+    standardize, fit_path, regularization_path
+)
+
+
+def _simulate(n=2000, p=8, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, p)) * rng.uniform(0.5, 5, size=p)
+    eta = X[:, :3] @ np.array([0.8, -0.4, 0.2]) - 0.5
+    y = (rng.random(n) < 1 / (1 + np.exp(-eta))).astype(int)
+    return X, y
+
+
+def test_fit_path_matches_sklearn_l1():
+    """暖啟動路徑上每個 C 的解應與 sklearn 單獨配適相同"""
+    X, y = _simulate()
+    Xs, _, _ = standardize(X)
+    Cs = np.logspace(-3, 0, 5)
+    coefs, intercepts, _ = fit_path(Xs, y, Cs, penalty="l1", tol=1e-10)
+
+    for i in (1, 4):
+        ref = LogisticRegression(penalty="l1", C=Cs[i], solver="liblinear", tol=1e-10,
+                                 intercept_scaling=1e4, max_iter=10000).fit(Xs, y)
+        assert np.allclose(coefs[i], ref.coef_[0], atol=1e-4)
+
+
+def test_fit_path_zero_weights_match_row_subset():
+    """CV 折以 0/1 觀測權重在共用設計矩陣上配適，結果應與複製訓練列後配適相同"""
+    X, y = _simulate(n=1500)
+    Xs, _, _ = standardize(X)
+    Cs = np.logspace(-2, 0, 4)
+    train = np.arange(len(y)) % 5 != 0
+
+    for penalty in ("l1", "l2"):
+        ref = fit_path(Xs[train], y[train], Cs, penalty=penalty, tol=1e-10)
+        masked = fit_path(Xs, y, Cs, penalty=penalty, tol=1e-10, sample_weight=train.astype(float))
+        assert np.allclose(masked[0], ref[0], atol=1e-8)
+        assert np.allclose(masked[1], ref[1], atol=1e-8)
+
+
+def test_regularization_path_selects_sparse_model():
+    """CV 應選出包含真實變數的模型，且係數換回原始尺度"""
+    X, y = _simulate(n=3000)
+    path = regularization_path(X, y, penalty="l1", n_Cs=15, cv=4, n_jobs=2)
+
+    assert path["coef_path"].shape == (15, X.shape[1])
+    assert path["n_nonzero"][0] == 0
+    assert np.all(path["coef"][:3] != 0)
+    # 暖啟動下每個 C 平均只需少數 Newton 步
+    assert path["newton_steps"] <= 4 * len(path["Cs"])
+
+    eta = X @ path["coef"] + path["intercept"]
+    Xs, mean, scale = standardize(X)
+    coefs, intercepts, _ = fit_path(Xs, y, path["Cs"][:path["best_index"] + 1], penalty="l1")
+    assert np.allclose(eta, Xs @ coefs[-1] + intercepts[-1])
+
+
+def test_coefficient_inference_matches_statsmodels():
+    """Fisher 資訊與 sandwich 標準誤應與 statsmodels 相同；寬設計的分塊路徑結果一致"""
+    import statsmodels.api as sm
+    from backend.methods.logistic_regression.inference import coefficient_inference
+
+    X, y = _simulate(n=3000, p=5)
+    ref = sm.Logit(y, sm.add_constant(X)).fit(disp=0)
+    ref_robust = sm.Logit(y, sm.add_constant(X)).fit(disp=0, cov_type="HC0")
+
+    inf = coefficient_inference(X, y, ref.params[1:], ref.params[0], block_size=500)
+    assert np.allclose(inf["se"], ref.bse, rtol=1e-6)
+    assert np.allclose(inf["p"], ref.pvalues, rtol=1e-5, atol=1e-12)
+
+    robust = coefficient_inference(X, y, ref.params[1:], ref.params[0], robust=True)
+    assert np.allclose(robust["se"], ref_robust.bse, rtol=1e-6)
+
+    wide = coefficient_inference(X, y, ref.params[1:], ref.params[0], robust=True, wide_threshold=2)
+    assert wide["vcov"] is None
+    assert np.allclose(wide["se"], robust["se"])
+
+
+def test_path_inference_uses_penalty_on_original_scale():
+    """路徑在標準化欄位上懲罰：原始尺度的 Hessian 應為 X'WX + diag(scale²) / C，欄位尺度懸殊時亦同"""
+    from scipy.special import expit
+    from backend.methods.logistic_regression.inference import coefficient_inference
+
+    X, y = _simulate(n=1500, p=3)
+    X = X * np.array([0.01, 1.0, 100.0])
+    path = regularization_path(X, y, penalty="l2", Cs=[1e-3], cv=2, n_jobs=1, tol=1e-12)
+    C, coef, intercept = path["best_C"], path["coef"], path["intercept"]
+
+    # 最適解滿足原始尺度目標函數 C * Σ loss + ½ Σ (scale_j b_j)² 的一階條件
+    Z = np.column_stack([np.ones(len(y)), X])
+    prob = expit(Z @ np.concatenate([[intercept], coef]))
+    penalty = np.concatenate([[0.0], X.std(axis=0) ** 2])
+    grad = C * Z.T @ (prob - y) + penalty * np.concatenate([[0.0], coef])
+    assert np.allclose(grad / np.abs(C * Z.T @ y), 0, atol=1e-6)
+
+    H = Z.T @ (Z * (prob * (1 - prob))[:, None]) + np.diag(penalty) / C
+    inf = coefficient_inference(X, y, coef, intercept, l2_penalty=path["scale"] ** 2 / C)
+    assert np.allclose(inf["se"], np.sqrt(np.diag(np.linalg.inv(H))), rtol=1e-8)
+
+
+def test_threshold_sweep_matches_pointwise_metrics():
+    """單次排序的閾值掃描應與逐一閾值計算的指標相同"""
+    from sklearn.metrics import average_precision_score, f1_score
+    from backend.methods.logistic_regression.core import (
+        threshold_sweep, optimal_thresholds, average_precision, calculate_metrics
+    )
+
+    rng = np.random.default_rng(4)
+    y = rng.integers(0, 2, 3000)
+    proba = np.round(np.clip(0.3 * y + 0.7 * rng.random(3000), 0, 1), 2)  # 含大量同分
+    sweep = threshold_sweep(y, proba, cost_fp=1.0, cost_fn=3.0)
+
+    assert len(sweep["threshold"]) == len(np.unique(proba)) + 1
+    for i in (5, 30, 70):
+        t = sweep["threshold"][i]
+        ref = calculate_metrics(y, proba, threshold=t)
+        assert sweep["tp"][i] == ref["true_positives"]
+        assert sweep["fp"][i] == ref["false_positives"]
+        assert np.isclose(sweep["f1"][i], f1_score(y, (proba >= t).astype(int)))
+
+    assert np.isclose(average_precision(sweep), average_precision_score(y, proba))
+    best = optimal_thresholds(sweep)
+    assert np.isclose(best["f1"]["f1"], sweep["f1"].max())
+    assert np.isclose(best["cost"]["cost"], sweep["cost"][1:].min())
+
+
+def test_delong_matches_pairwise_definition():
+    """中位秩 DeLong 變異數應與逐對比較的結構成分公式相同"""
+    from sklearn.metrics import roc_auc_score
+    from backend.methods.logistic_regression.core import delong_auc
+
+    rng = np.random.default_rng(5)
+    y = rng.integers(0, 2, 400)
+    proba = np.round(0.2 * y + rng.random(400), 1)
+    result = delong_auc(y, proba)
+
+    pos, neg = proba[y == 1], proba[y == 0]
+    psi = (pos[:, None] > neg[None, :]) + 0.5 * (pos[:, None] == neg[None, :])
+    v10, v01 = psi.mean(axis=1), psi.mean(axis=0)
+    var = np.var(v10, ddof=1) / len(pos) + np.var(v01, ddof=1) / len(neg)
+
+    assert np.isclose(result["auc"], roc_auc_score(y, proba))
+    assert np.isclose(result["se"], np.sqrt(var))
+
+
+def test_calibration_diagnostics_bins():
+    """校準分箱的觀測數應加總為 n，校準良好的資料 HL 檢定不顯著"""
+    from backend.methods.logistic_regression.core import calibration_diagnostics
+
+    rng = np.random.default_rng(6)
+    proba = rng.random(5000)
+    y = (rng.random(5000) < proba).astype(int)
+    cal = calibration_diagnostics(y, proba, n_bins=10)
+
+    assert cal["bin_counts"].sum() == 5000
+    assert len(cal["bin_counts"]) == 10
+    assert np.isclose(cal["brier_score"], np.mean((proba - y) ** 2))
+    assert cal["hosmer_lemeshow_p"] > 0.001
+    assert np.allclose(cal["mean_predicted"], cal["observed_rate"], atol=0.06)
+
+
+def test_local_case_control_recovers_full_fit():
+    """局部個案對照抽樣加回先導係數後應接近全資料估計"""
+    from backend.methods.logistic_regression.subsampling import local_case_control_fit
+
+    rng = np.random.default_rng(7)
+    n = 200000
+    X = rng.normal(size=(n, 4))
+    beta = np.array([1.0, -0.5, 0.25, 0.0])
+    y = (rng.random(n) < 1 / (1 + np.exp(-(X @ beta - 4)))).astype(int)
+
+    result = local_case_control_fit(X, y, pilot_size=4000, random_state=1)
+    assert len(result["subsample"]) < 0.15 * n
+    assert np.allclose(result["coef"], beta, atol=0.06)
+    assert abs(result["intercept"] + 4) < 0.1
+    assert np.isinf(result["model"].C)
+
+    # 縮小保留率仍不偏；大於 1 會截斷保留率而產生偏誤，故拒絕
+    half = local_case_control_fit(X, y, pilot_size=4000, scale=0.5, random_state=1)
+    assert len(half["subsample"]) < 0.6 * len(result["subsample"])
+    assert np.allclose(half["coef"], beta, atol=0.1)
+    with pytest.raises(ValueError):
+        local_case_control_fit(X, y, pilot_size=4000, scale=2.0)
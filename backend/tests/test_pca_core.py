@@ -0,0 +1,73 @@
+"""
+隨機化 PCA 核心演算法單元測試
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.decomposition import PCA
+
+from backend.methods.pca.core import randomized_pca
+from backend.methods.pca.method import RandomizedPCAMethod, _draw_scores
+
+
+def _low_rank(n=500, p=80, rank=5, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, rank)) @ rng.normal(size=(rank, p)) * 3 + rng.normal(size=(n, p)) + 5
+
+
+def test_matches_exact_pca():
+    """前 k 個主成分應與 sklearn 完整 SVD 的 PCA 一致（符號除外）"""
+    X = _low_rank()
+    ours = randomized_pca(X, n_components=5)
+    ref = PCA(n_components=5, svd_solver="full").fit(X)
+    np.testing.assert_allclose(ours["explained_variance"], ref.explained_variance_, rtol=1e-8)
+    np.testing.assert_allclose(ours["explained_variance_ratio"], ref.explained_variance_ratio_, rtol=1e-8)
+    np.testing.assert_allclose(np.abs(ours["components"]), np.abs(ref.components_), atol=1e-8)
+    np.testing.assert_allclose(np.abs(ours["scores"]), np.abs(ref.transform(X)), atol=1e-6)
+
+
+def test_sparse_and_memmap_match_dense(tmp_path):
+    """稀疏（隱式中心化）與記憶體映射輸入應得到與密集矩陣相同的結果"""
+    rng = np.random.default_rng(1)
+    X = sp.random(400, 60, density=0.05, random_state=1, data_rvs=rng.standard_normal).toarray()
+    dense = randomized_pca(X, n_components=4, standardize=True)
+    sparse = randomized_pca(sp.csr_matrix(X), n_components=4, standardize=True)
+    mm = np.lib.format.open_memmap(tmp_path / "X.npy", mode="w+", shape=X.shape)
+    mm[:] = X
+    mapped = randomized_pca(mm, n_components=4, standardize=True, block_size=64)
+    for other in (sparse, mapped):
+        np.testing.assert_allclose(other["singular_values"], dense["singular_values"], rtol=1e-10)
+        np.testing.assert_allclose(other["scores"], dense["scores"], atol=1e-8)
+
+
+def test_method_run_outputs(tmp_path):
+    """方法執行應輸出分數檔、陡坡圖與解釋變異指標"""
+    X = _low_rank(n=200, p=12)
+    df = pd.DataFrame(X, columns=[f"x{j}" for j in range(12)])
+    df["y"] = X[:, 0]
+    res = RandomizedPCAMethod().run(df, {"y": "y"}, {"n_components": 4}, str(tmp_path))
+    assert res["metrics"]["num_variables"] == 12
+    assert len(res["metrics"]["explained_variance_ratio"]) == 4
+    assert (tmp_path / "pca_scores.csv").exists()
+    assert len(res["figures"]) == 3
+
+
+def test_categorical_without_colour(tmp_path):
+    """類別欄位應編碼為虛擬變數且不轉密集；無數值 y 時分數圖不應產生警告"""
+    X = _low_rank(n=200, p=6)
+    df = pd.DataFrame(X, columns=[f"x{j}" for j in range(6)])
+    df["grp"] = np.where(X[:, 0] > 0, "a", "b")
+    df["y"] = "label"
+    res = RandomizedPCAMethod().run(df, {"y": "y"}, {"n_components": 3}, str(tmp_path))
+    assert res["metrics"]["num_variables"] == 7
+
+    import matplotlib.pyplot as plt
+    fig = plt.figure()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        _draw_scores(fig, {"pc1": [0.1, -0.2], "pc2": [0.3, 0.0], "colour": None,
+                           "colour_label": "y", "ratio": [0.5, 0.2]})
+    plt.close(fig)
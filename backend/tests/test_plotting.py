@@ -0,0 +1,116 @@
+"""
+圖表繪製子系統單元測試
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from backend.methods.base import BaseMethod, METHODS_REGISTRY
+from backend.methods import plotting
+from backend.methods.oga_hdic.method import _draw_coefficients
+from backend.methods.plotting import (
+    SCREEN_DPI, THUMB_WIDTH, PLOTS_DIR, FIGURES_DIR,
+    deferred_figures, render_variant, save_figure, spec_etag, variant_name
+)
+from backend.routers import figures as figures_router
+from backend.services import run_cache
+from backend.services.runner import run_method
+
+
+class _BarFigureMethod(BaseMethod):
+    id = "_test_bar_figure"
+    name = "Bar figure"
+
+    def run(self, df, roles, params, out_dir):
+        path = save_figure(os.path.join(out_dir, "bars.png"), _draw_coefficients,
+                           {"names": ["a", "b", "c"], "values": df["y"].to_numpy()}, figsize=(4, 3))
+        return {"metrics": {"n": len(df)}, "figures": [path], "summary_md": ""}
+
+
+def test_save_figure_defers_to_plot_data(tmp_path):
+    """範圍外立即輸出 PNG；範圍內只寫入繪圖資料（NaN 轉為 null），不接受巢狀繪圖函式"""
+    now = save_figure(str(tmp_path / "now.png"), _draw_coefficients, {"names": ["a", "b"], "values": [1, -2]},
+                      figsize=(4, 3))
+    assert Image.open(now).size == (4 * SCREEN_DPI, 3 * SCREEN_DPI)
+
+    with deferred_figures():
+        later = save_figure(str(tmp_path / "later.png"), _draw_coefficients,
+                            {"names": ["a", "b", "c"], "values": np.array([1.0, np.nan, 3.0])}, figsize=(4, 3))
+    assert not os.path.exists(later)
+    spec = json.load(open(tmp_path / PLOTS_DIR / "later.json"))
+    assert spec["data"] == {"names": ["a", "b", "c"], "values": [1.0, None, 3.0]} and spec["figsize"] == [4, 3]
+    assert spec["renderer"] == "backend.methods.oga_hdic.method:_draw_coefficients"
+
+    with pytest.raises(ValueError):
+        save_figure(str(tmp_path / "bad.png"), lambda fig, d: None, {})
+
+
+def test_render_variant_cached_per_size_and_format(tmp_path):
+    """各解析度與格式首次請求時繪製並快取（dpi 取最接近的允許值）；ETag 依變體不同、內容不變時穩定"""
+    with deferred_figures():
+        save_figure(str(tmp_path / "bars.png"), _draw_coefficients, {"names": ["a", "b"], "values": [3, -1]},
+                    figsize=(4, 3))
+
+    screen = render_variant(str(tmp_path), "bars")
+    assert Image.open(screen).size == (4 * SCREEN_DPI, 3 * SCREEN_DPI)
+    mtime = os.path.getmtime(screen)
+    assert render_variant(str(tmp_path), "bars") == screen and os.path.getmtime(screen) == mtime
+
+    assert Image.open(render_variant(str(tmp_path), "bars", dpi=200)).size == (800, 600)
+    assert render_variant(str(tmp_path), "bars", dpi=180) == render_variant(str(tmp_path), "bars", dpi=200)
+    assert spec_etag(str(tmp_path), "bars", variant_name("png", 230)) == spec_etag(str(tmp_path), "bars", "png@200")
+    assert Image.open(render_variant(str(tmp_path), "bars", "webp")).size[0] == THUMB_WIDTH
+    assert open(render_variant(str(tmp_path), "bars", "svg"), "rb").read().lstrip().startswith(b"<?xml")
+    assert len(plotting._variant_locks) == 0  # 每個變體的鎖在繪製後即移除
+    assert sorted(os.listdir(tmp_path / FIGURES_DIR)) == ["bars.svg", "bars.thumb.webp", "bars@100.png", "bars@200.png"]
+
+    assert spec_etag(str(tmp_path), "bars", "png@100") == spec_etag(str(tmp_path), "bars", "png@100")
+    assert spec_etag(str(tmp_path), "bars", "png@100") != spec_etag(str(tmp_path), "bars", "svg")
+    with pytest.raises(ValueError):
+        render_variant(str(tmp_path), "bars", dpi=5000)
+    with pytest.raises(FileNotFoundError):
+        render_variant(str(tmp_path), "missing")
+
+
+def test_runner_and_endpoints_render_on_demand(tmp_path, monkeypatch):
+    """執行分析不繪圖，只回傳圖表網址；端點首次請求時繪製並計入快取大小，ETag 相符回傳 304，並提供 JSON 繪圖資料"""
+    monkeypatch.setattr(run_cache, "RUNS_DIR", str(tmp_path / "runs"))
+    monkeypatch.setitem(METHODS_REGISTRY, _BarFigureMethod.id, _BarFigureMethod)
+    csv = tmp_path / "data.csv"
+    pd.DataFrame({"y": [1.0, 3.0, 2.0]}).to_csv(csv, index=False)
+
+    payload = run_method(_BarFigureMethod.id, str(csv), {}, {})
+    run_dir = os.path.join(run_cache.RUNS_DIR, payload["run_id"])
+    assert payload["figures"] == [f"/api/runs/{payload['run_id']}/figures/bars.png"]
+    assert not os.path.exists(os.path.join(run_dir, FIGURES_DIR))
+
+    app = FastAPI()
+    app.include_router(figures_router.router, prefix="/api")
+    client = TestClient(app)
+    plot = payload["plots"][0]
+
+    def cached_size():
+        return next(e["size"] for e in run_cache._load_index().values() if e["run_id"] == payload["run_id"])
+
+    before = cached_size()
+    r = client.get(plot["figure"])
+    assert r.status_code == 200 and r.headers["content-type"] == "image/png"
+    assert cached_size() == run_cache._dir_size(run_dir) > before
+    assert client.get(plot["figure"], headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+    assert client.get(plot["figure"] + "?dpi=200").headers["etag"] != r.headers["etag"]
+    assert client.get(plot["figure"] + "?dpi=240").headers["etag"] == client.get(plot["figure"] + "?dpi=200").headers["etag"]
+    assert client.get(plot["thumbnail"]).headers["content-type"] == "image/webp"
+    assert client.get(plot["svg"]).headers["content-type"].startswith("image/svg+xml")
+    assert client.get(plot["data"]).json()["data"]["values"] == [1.0, 3.0, 2.0]
+
+    assert client.get(plot["figure"] + "?dpi=5000").status_code == 422
+    assert client.get(f"/api/runs/{payload['run_id']}/figures/bars.gif").status_code == 404
+    assert client.get(f"/api/runs/{payload['run_id']}/figures/missing.png").status_code == 404
+    assert run_method(_BarFigureMethod.id, str(csv), {}, {})["figures"] == payload["figures"]
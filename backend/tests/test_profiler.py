@@ -0,0 +1,61 @@
+"""
+有上限樣本資料剖析單元測試
+"""
+
+import numpy as np
+import pandas as pd
+
+from backend.services.profiler import read_sample, profile_frame, exact_profile, profile_csv
+
+
+def _csv(tmp_path, n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "row": np.arange(n),
+        "treat": rng.integers(0, 2, n),
+        "rare": (rng.random(n) < 0.001).astype(int),
+        "grade": rng.choice(list("ABCD"), n),
+        "income": np.where(rng.random(n) < 0.2, np.nan, rng.normal(50, 10, n))
+    })
+    path = tmp_path / f"data_{n}.csv"
+    df.to_csv(path, index=False)
+    return df, str(path)
+
+
+def test_sample_is_bounded_and_spans_file(tmp_path):
+    """大檔只抽有上限的列數且涵蓋整個檔案；小檔則完整讀取"""
+    df, path = _csv(tmp_path, 50000)
+    sample, complete = read_sample(path, n_rows=2000, head_rows=200)
+    assert not complete
+    assert 1900 < len(sample) <= 2000
+    assert sample["row"].is_unique
+    assert (sample["row"] > 40000).sum() > 100  # rows from the end of the file
+
+    small, complete = read_sample(_csv(tmp_path, 300)[1], n_rows=2000, head_rows=200)
+    assert complete and len(small) == 300
+
+
+def test_profile_flags_and_confidence(tmp_path):
+    """樣本推斷二元性、基數與缺值比例；稀有類別的二元判斷標為低信心"""
+    df, path = _csv(tmp_path, 50000)
+    prof = profile_csv(path)
+    cols = prof["columns"]
+    assert not prof["n_rows_exact"] and prof["sampled_rows"] <= 5000
+    assert cols["treat"]["binary01"] and cols["treat"]["confidence"] == "high"
+    assert cols["grade"]["cardinality"] == "low" and cols["grade"]["values"] == ["A", "B", "C", "D"]
+    assert abs(cols["income"]["missing_rate"] - 0.2) < 0.03
+    assert cols["rare"]["confidence"] == "low"
+    assert cols["row"]["cardinality"] == "unique" and cols["row"]["confidence"] == "medium"
+
+
+def test_exact_pass_matches_full_data(tmp_path):
+    """串流精確統計應等於以完整資料計算的剖析結果"""
+    df, path = _csv(tmp_path, 5000)
+    exact = exact_profile(path, chunksize=700)
+    full = profile_frame(pd.read_csv(path), complete=True)
+    assert exact["n_rows"] == 5000
+    for c in ["treat", "rare", "grade"]:
+        assert exact["columns"][c] == full[c]
+    assert exact["columns"]["income"]["missing_rate"] == full["income"]["missing_rate"]
+    assert exact["columns"]["row"]["n_unique"] is None  # over the distinct cap
+    assert profile_csv(path, exact=True)["n_rows_exact"]
@@ -0,0 +1,132 @@
+"""
+分析結果快取單元測試
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from backend.methods.base import BaseMethod, METHODS_REGISTRY, RunCancelled
+from backend.services import run_cache
+from backend.services.runner import run_method
+
+
+class _CountingMethod(BaseMethod):
+    id = "_test_counting"
+    name = "Counting"
+    calls = 0
+
+    def run(self, df, roles, params, out_dir):
+        type(self).calls += 1
+        with open(os.path.join(out_dir, "artifact.bin"), "wb") as f:
+            f.write(b"x" * 4000)
+        return {"metrics": {"n": len(df), "k": params.get("k")}, "figures": [], "summary_md": ""}
+
+
+class _CancelledMethod(BaseMethod):
+    id = "_test_cancelled"
+    name = "Cancelled"
+
+    def run(self, df, roles, params, out_dir):
+        with open(os.path.join(out_dir, "partial.bin"), "wb") as f:
+            f.write(b"x")
+        raise RunCancelled()
+
+
+@pytest.fixture
+def cache_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_cache, "RUNS_DIR", str(tmp_path / "runs"))
+    monkeypatch.setattr(run_cache, "_usage", {})
+    monkeypatch.setitem(METHODS_REGISTRY, _CountingMethod.id, _CountingMethod)
+    _CountingMethod.calls = 0
+    csv = tmp_path / "data.csv"
+    pd.DataFrame({"y": [1, 2, 3], "x": [4, 5, 6]}).to_csv(csv, index=False)
+    return str(csv)
+
+
+def test_identical_requests_hit_cache(cache_env, tmp_path):
+    """相同資料內容與正規化後相同的參數應命中快取；參數或資料改變則重新計算"""
+    first = run_method("_test_counting", cache_env, {"y": "y", "treatment": None}, {"k": 1, "a": 2})
+    again = run_method("_test_counting", cache_env, {"y": "y"}, {"a": 2, "k": 1})
+    assert _CountingMethod.calls == 1
+    assert again["cached"] and not first["cached"]
+    assert again["run_id"] == first["run_id"] and again["metrics"] == first["metrics"]
+
+    # Same content under another path is still a hit
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(open(cache_env, "rb").read())
+    assert run_method("_test_counting", str(copy), {"y": "y"}, {"k": 1, "a": 2})["cached"]
+
+    run_method("_test_counting", cache_env, {"y": "y"}, {"k": 2, "a": 2})
+    run_method("_test_counting", cache_env, {"y": "y"}, {"k": 1, "a": 2}, use_cache=False)
+    assert _CountingMethod.calls == 3
+
+
+def test_lru_eviction_by_size(cache_env, monkeypatch):
+    """超過大小上限時淘汰最久未使用的執行目錄"""
+    a = run_method("_test_counting", cache_env, {}, {"k": "a"})
+    size = run_cache._dir_size(os.path.join(run_cache.RUNS_DIR, a["run_id"]))
+    monkeypatch.setattr(run_cache, "MAX_BYTES", int(2.5 * size))  # room for two runs
+    b = run_method("_test_counting", cache_env, {}, {"k": "b"})
+    run_method("_test_counting", cache_env, {}, {"k": "a"})  # touch a
+    c = run_method("_test_counting", cache_env, {}, {"k": "c"})
+
+    runs = os.listdir(run_cache.RUNS_DIR)
+    assert a["run_id"] in runs and c["run_id"] in runs
+    assert b["run_id"] not in runs
+    assert not run_method("_test_counting", cache_env, {}, {"k": "b"})["cached"]
+
+
+def test_hits_do_not_rewrite_index(cache_env, monkeypatch):
+    """命中快取不重寫索引檔，使用紀錄於下次寫入時合併；結果檔被淘汰時視為未命中"""
+    first = run_method("_test_counting", cache_env, {}, {"k": 1})
+    key = next(iter(run_cache._load_index()))
+    save, saves = run_cache._save_index, []
+    monkeypatch.setattr(run_cache, "_save_index", lambda index: (saves.append(1), save(index)))
+    assert run_cache.lookup(key)["run_id"] == first["run_id"]
+    assert run_cache.lookup(key) is not None
+    assert saves == []
+
+    run_cache.update_size(first["run_id"])
+    assert len(saves) == 1 and run_cache._load_index()[key]["hits"] == 2
+
+    os.remove(os.path.join(run_cache.RUNS_DIR, first["run_id"], "result.json"))
+    assert run_cache.lookup(key) is None
+
+
+def test_cancelled_run_leaves_no_directory(cache_env, monkeypatch):
+    """執行中取消時刪除寫到一半的執行目錄，也不寫入快取"""
+    monkeypatch.setitem(METHODS_REGISTRY, _CancelledMethod.id, _CancelledMethod)
+    with pytest.raises(RunCancelled):
+        run_method("_test_cancelled", cache_env, {}, {})
+    assert os.listdir(run_cache.RUNS_DIR) == []
+
+
+
+def test_code_version_covers_shared_modules(monkeypatch):
+    """程式碼版本涵蓋方法遞移匯入的共用模組與 runner；結果格式版本也在鍵中"""
+    from backend.methods.nn_matching.method import NearestNeighborMatching
+
+    files = {p.relative_to(run_cache._ROOT).as_posix() for p in run_cache.code_files(NearestNeighborMatching)}
+    assert {"backend/methods/base.py", "backend/methods/plotting.py", "backend/methods/dr_ate_cbps/core.py",
+            "backend/services/runner.py", "backend/services/reports.py"} <= files
+    assert "backend/methods/__init__.py" not in files
+
+    key = run_cache.cache_key("d", "m", {}, {}, "v")
+    monkeypatch.setattr(run_cache, "SCHEMA_VERSION", run_cache.SCHEMA_VERSION + 1)
+    assert run_cache.cache_key("d", "m", {}, {}, "v") != key
+
+
+def test_locks_and_hash_memo_stay_bounded(cache_env, tmp_path, monkeypatch):
+    """每個鍵的鎖在使用後移除；檔案雜湊的記憶以 LRU 限制數量"""
+    run_method("_test_counting", cache_env, {}, {"k": 1})
+    assert len(run_cache._key_locks) == 0
+
+    monkeypatch.setattr(run_cache, "MAX_FILE_HASHES", 2)
+    monkeypatch.setattr(run_cache, "_file_hashes", run_cache.OrderedDict())
+    for i in range(4):
+        path = tmp_path / f"f{i}.csv"
+        path.write_text(str(i))
+        run_cache.file_hash(str(path))
+    assert len(run_cache._file_hashes) == 2
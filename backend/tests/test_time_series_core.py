@@ -0,0 +1,53 @@
+"""
+時間序列核心演算法單元測試
+"""
+
+import numpy as np
+from statsmodels.tsa.stattools import acf as sm_acf, pacf as sm_pacf
+
+from backend.methods.time_series.core import acf, pacf, lag_matrix, lagged_design, rls_backtest
+
+
+def _ar2(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = np.zeros(n)
+    z = rng.normal(size=n)
+    for t in range(2, n):
+        y[t] = 0.5 * y[t - 1] - 0.2 * y[t - 2] + 0.3 * z[t - 1] + rng.normal()
+    return y, z
+
+
+def test_lag_matrix_is_a_view():
+    """落後項矩陣應為原序列的步幅檢視，不複製資料"""
+    x = np.arange(10.0)
+    L = lag_matrix(x, 3)
+    assert np.shares_memory(L, x)
+    np.testing.assert_array_equal(L[0], [3, 2, 1, 0])
+    assert L.shape == (7, 4)
+
+
+def test_fft_acf_and_pacf_match_statsmodels():
+    """FFT 自相關與 Durbin-Levinson 偏自相關應與 statsmodels 一致"""
+    y, _ = _ar2()
+    rho = acf(y, 20)
+    np.testing.assert_allclose(rho, sm_acf(y, nlags=20, fft=True), atol=1e-12)
+    np.testing.assert_allclose(pacf(rho), sm_pacf(y, nlags=20, method="ldb"), atol=1e-12)
+
+
+def test_rls_backtest_matches_refit():
+    """遞迴最小平方的係數應等於每個視窗重新配適的結果（擴張與固定視窗）"""
+    y, z = _ar2()
+    target, X, _ = lagged_design(y, 2, z[:, None], 1)
+
+    expanding = rls_backtest(target, X, initial=200)
+    for i in (0, 500, len(expanding["origins"]) - 1):
+        t = expanding["origins"][i]
+        beta = np.linalg.lstsq(X[:t], target[:t], rcond=None)[0]
+        np.testing.assert_allclose(expanding["coef_path"][i], beta, atol=1e-10)
+
+    fixed = rls_backtest(target, X, initial=200, window=200, refresh=250)
+    for i in (0, 249, 250, 1777):
+        t = fixed["origins"][i]
+        beta = np.linalg.lstsq(X[t - 200:t], target[t - 200:t], rcond=None)[0]
+        np.testing.assert_allclose(fixed["coef_path"][i], beta, atol=1e-10)
+    np.testing.assert_allclose(fixed["forecast"], np.einsum("ij,ij->i", X[fixed["origins"]], fixed["coef_path"]))
@@ -16,10 +16,36 @@ export async function apiRecommend(payload: any) {
 }
 
 export async function apiRun(payload: any) {
-  const r = await fetch(`${API_BASE}/run`, {
+  let r = await fetch(`${API_BASE}/run`, {
     method: "POST", headers: { "Content-Type": "application/json" },
     body: JSON.stringify(payload)
   });
+  // Queue full: wait as instructed by Retry-After, then resubmit
+  while (r.status === 429) {
+    const wait = Number(r.headers.get("Retry-After") || "5");
+    await new Promise((res) => setTimeout(res, wait * 1000));
+    r = await fetch(`${API_BASE}/run`, {
+      method: "POST", headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(payload)
+    });
+  }
   if (!r.ok) throw new Error("run failed");
+  const { job_id } = await r.json();
+
+  // Poll until the job finishes
+  while (true) {
+    const res = await fetch(`${API_BASE}/run/${job_id}/result`);
+    if (res.status === 202) {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      continue;
+    }
+    if (!res.ok) throw new Error("run failed");
+    return res.json();
+  }
+}
+
+export async function apiCancelRun(jobId: string) {
+  const r = await fetch(`${API_BASE}/run/${jobId}`, { method: "DELETE" });
+  if (!r.ok) throw new Error("cancel failed");
   return r.json();
 }